@@ -0,0 +1,186 @@
+"""Mede o tempo de importação e o tempo até a primeira renderização, com linha de base versionada.
+
+Cada medição roda num processo Python novo (partida a frio), repetida
+`--repeticoes` vezes; o resultado é a mediana, em milissegundos. Os tempos são
+comparados aos de `benchmarks/linha_base_arranque.json`, corrigidos pela
+velocidade da máquina (a importação a frio de um conjunto fixo da biblioteca
+padrão, medida antes de cada caso); o script termina com código 1 se algum
+caso ficar mais lento que o limite também na segunda medição, ou se um módulo
+que a linha de base importa sem Streamlit/Plotly passar a arrastá-los.
+
+Exemplos:
+    python benchmarks/arranque.py
+    python benchmarks/arranque.py --repeticoes 5 --saida arranque.json
+    python benchmarks/arranque.py --gravar-linha-base
+"""
+import argparse
+import functools
+import json
+import platform
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+
+RAIZ = Path(__file__).resolve().parent.parent
+LINHA_BASE = Path(__file__).resolve().parent / 'linha_base_arranque.json'
+LIMITE_PADRAO = 0.3
+FOLGA_MS = 20.0  # diferenças absolutas menores que isso são ruído (ex.: `import utils` leva décimos de ms)
+
+MODULOS = (
+    'utils',
+    'utils.cenarios',
+    'lote',
+    'servidor',
+    'streamlit',
+)
+
+_SCRIPT_IMPORTACAO = """
+import json, sys, time
+inicio = time.perf_counter()
+import {modulo}
+print(json.dumps({{
+    'ms': (time.perf_counter() - inicio) * 1000,
+    'streamlit': 'streamlit' in sys.modules,
+    'plotly': 'plotly' in sys.modules,
+}}))
+"""
+
+_SCRIPT_CALIBRACAO = """
+import json, time
+inicio = time.perf_counter()
+import asyncio, decimal, email.mime.multipart, http.server, json, unittest, xml.dom.minidom
+print(json.dumps({'ms': (time.perf_counter() - inicio) * 1000}))
+"""
+
+_SCRIPT_RENDERIZACAO = """
+import json, sys, time
+inicio = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file('main.py', default_timeout=120)
+app.run()
+print(json.dumps({
+    'ms': (time.perf_counter() - inicio) * 1000,
+    'excecoes': [e.value for e in app.exception],
+    'calculadoras': sorted(
+        nome for nome in sys.modules
+        if nome in ('utils.juros_compostos', 'utils.emprestimos', 'utils.aposentadoria', 'utils.fire')
+    ),
+}))
+"""
+
+
+def _executar(script):
+    """Roda `script` num interpretador novo na raiz do projeto e lê o JSON impresso"""
+    saida = subprocess.run(
+        [sys.executable, '-c', script], cwd=RAIZ, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(saida.strip().splitlines()[-1])
+
+
+def calibrar(repeticoes=5):
+    """Mediana da importação a frio de módulos fixos da biblioteca padrão, usada para comparar máquinas"""
+    return round(statistics.median(_executar(_SCRIPT_CALIBRACAO)['ms'] for _ in range(repeticoes)), 1)
+
+
+def medir_importacao(modulo, repeticoes=5):
+    """Mediana do tempo de `import modulo` a frio e o que ele arrasta junto"""
+    amostras = [_executar(_SCRIPT_IMPORTACAO.format(modulo=modulo)) for _ in range(repeticoes)]
+    return {
+        'ms': round(statistics.median(a['ms'] for a in amostras), 1),
+        'streamlit': amostras[-1]['streamlit'],
+        'plotly': amostras[-1]['plotly'],
+    }
+
+
+def medir_primeira_renderizacao(repeticoes=3):
+    """Mediana do tempo até o `main.py` terminar a primeira execução (aba padrão)"""
+    amostras = [_executar(_SCRIPT_RENDERIZACAO) for _ in range(repeticoes)]
+    if amostras[-1]['excecoes']:
+        raise RuntimeError(f"main.py falhou: {amostras[-1]['excecoes']}")
+    return {
+        'ms': round(statistics.median(a['ms'] for a in amostras), 1),
+        'calculadoras_carregadas': amostras[-1]['calculadoras'],
+    }
+
+
+CASOS = {f'importacao {modulo}': functools.partial(medir_importacao, modulo) for modulo in MODULOS}
+CASOS['primeira renderizacao'] = medir_primeira_renderizacao
+
+
+def executar(nomes, repeticoes=5):
+    """Mede os casos `nomes`; devolve {caso: {'ms', 'calibracao_ms', ...}}"""
+    resultados = {}
+    for nome in nomes:
+        calibracao = calibrar(repeticoes)
+        resultados[nome] = {**CASOS[nome](repeticoes=repeticoes), 'calibracao_ms': calibracao}
+        print(f"{nome:<32} {resultados[nome]['ms']:>10.1f} ms  (calibração {calibracao:.1f} ms)", flush=True)
+    return resultados
+
+
+def comparar(resultados, linha_base, limite):
+    """Casos mais lentos que `limite` em relação à linha de base (corrigida pela calibração) ou que passaram a importar Streamlit/Plotly"""
+    regressoes = []
+    for nome, atual in resultados.items():
+        base = linha_base['casos'].get(nome)
+        if base is None:
+            continue
+        # Máquina mais lenta (calibração maior) -> espera-se tempo proporcionalmente maior
+        escala = atual['calibracao_ms'] / base['calibracao_ms']
+        razao = atual['ms'] / (base['ms'] * escala)
+        arrastados = [pacote for pacote in ('streamlit', 'plotly') if atual.get(pacote) and base.get(pacote) is False]
+        lento = razao > 1 + limite and atual['ms'] - base['ms'] * escala > FOLGA_MS
+        regrediu = lento or bool(arrastados)
+        marca = "REGRESSÃO" if regrediu else "ok"
+        extra = f" (passou a importar {', '.join(arrastados)})" if arrastados else ""
+        print(f"{nome:<32} {razao:>7.2f}x da linha de base  {marca}{extra}")
+        if regrediu:
+            regressoes.append(nome)
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tempo de importação e de primeira renderização a frio.")
+    parser.add_argument('--repeticoes', type=int, default=5, help="Processos novos por medição (padrão: 5)")
+    parser.add_argument('--saida', help="Grava o resultado em JSON neste arquivo")
+    parser.add_argument('--limite', type=float, default=LIMITE_PADRAO,
+                        help="Aumento de tempo tolerado antes de falhar (padrão: 0.3 = 30%%)")
+    parser.add_argument('--linha-base', default=str(LINHA_BASE), help="Arquivo JSON da linha de base")
+    parser.add_argument('--gravar-linha-base', action='store_true', help="Grava os resultados como nova linha de base")
+    args = parser.parse_args(argv)
+
+    resultados = executar(CASOS, args.repeticoes)
+    caminho = Path(args.linha_base)
+
+    if args.saida:
+        texto = json.dumps(resultados, indent=2, ensure_ascii=False, sort_keys=True)
+        Path(args.saida).write_text(texto, encoding='utf-8')
+
+    if args.gravar_linha_base:
+        linha_base = {
+            'python': platform.python_version(),
+            'processador': platform.processor() or platform.machine(),
+            'casos': resultados,
+        }
+        caminho.write_text(json.dumps(linha_base, indent=2, ensure_ascii=False, sort_keys=True), encoding='utf-8')
+        print(f"Linha de base gravada em {caminho}")
+        return 0
+
+    if not caminho.exists():
+        print(f"Sem linha de base em {caminho}; use --gravar-linha-base", file=sys.stderr)
+        return 1
+
+    linha_base = json.loads(caminho.read_text(encoding='utf-8'))
+    regressoes = comparar(resultados, linha_base, args.limite)
+    if regressoes:
+        print(f"Medindo novamente {len(regressoes)} caso(s) acima do limite")
+        regressoes = comparar(executar(regressoes, args.repeticoes), linha_base, args.limite)
+    if regressoes:
+        print(f"{len(regressoes)} caso(s) acima do limite: {', '.join(regressoes)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,352 @@
+"""Benchmarks dos caminhos numéricos das calculadoras, com linha de base versionada.
+
+Cada caso mede uma função ao longo de um eixo de escala (horizonte em meses,
+tamanho do lote, caminhos de Monte Carlo, resolução da grade) e reporta a
+vazão em unidades por segundo. A vazão é comparada à de
+`benchmarks/linha_base.json`, corrigida pela velocidade relativa da máquina
+(medida por um núcleo de calibração fixo, cronometrado logo antes de cada
+caso para acompanhar variações de carga e frequência); o script termina com código 1 se
+algum caso ficar mais lento que o limite também na segunda medição (casos
+abaixo do limite são medidos de novo para descartar ruído da máquina).
+
+Exemplos:
+    python benchmarks/calculos.py
+    python benchmarks/calculos.py --filtro emprestimo --limite 0.3
+    python benchmarks/calculos.py --gravar-linha-base
+"""
+import argparse
+import fnmatch
+import functools
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from utils.motor_aposentadoria import metas_aposentadoria, resumir_aposentadoria, sensibilidade_aposentadoria  # noqa: E402
+from utils.motor_carteira import REBALANCEAMENTO_LIMITE, simular_carteira  # noqa: E402
+from utils.motor_cdi import curva_acumulada, fator_periodo, projetar_cdi  # noqa: E402
+from utils.motor_centavos import amortizar_carteira_centavos  # noqa: E402
+from utils.motor_cet import custo_efetivo_total  # noqa: E402
+from utils.motor_emprestimos import (  # noqa: E402
+    REDUZIR_PARCELA, REDUZIR_PRAZO, SISTEMA_SAC, amortizar_carteira, comparar_estrategias, grade_carteira, resumir_carteira
+)
+from utils.motor_fire import meses_ate_meta_corrigida  # noqa: E402
+from utils.motor_indexado import faixas_indexado, gerar_indices  # noqa: E402
+from utils.motor_ir import projetar_ir  # noqa: E402
+from utils.motor_saques import comparar_politicas_saque  # noqa: E402
+from utils.motor_juros import projetar_juros_compostos, resumir_juros_compostos  # noqa: E402
+from utils.monte_carlo import simular_aposentadoria_monte_carlo  # noqa: E402
+from utils.taxa_saque import buscar_taxa_saque_segura  # noqa: E402
+
+
+LINHA_BASE = Path(__file__).resolve().parent / 'linha_base.json'
+LIMITE_PADRAO = 0.25    # regressão = vazão mais de 25% abaixo da linha de base
+
+CASOS = {}
+
+
+def caso(nome, eixo, valores, unidade):
+    """Registra um benchmark para cada valor do eixo de escala.
+
+    A função decorada recebe o valor do eixo, prepara os dados e devolve
+    `(chamada, unidades)`: a chamada sem argumentos que será cronometrada e
+    quantas unidades ela processa.
+    """
+    def registrar(preparar):
+        for valor in valores:
+            CASOS[f"{nome}[{eixo}={valor}]"] = (functools.partial(preparar, valor), unidade)
+        return preparar
+    return registrar
+
+
+def _carteira(n, semente=0):
+    rng = np.random.default_rng(semente)
+    return {
+        'valor': rng.uniform(1e4, 1e6, n),
+        'taxa': rng.uniform(1, 25, n),
+        'prazo': rng.integers(1, 36, n),
+        'idade': rng.integers(20, 55, n).astype(float),
+        'aporte': rng.uniform(0, 5000, n),
+        'renda': rng.uniform(1000, 20000, n),
+    }
+
+
+# Juros compostos
+
+@caso("juros.projetar_juros_compostos", "meses", (120, 600), "meses")
+def _projecao_juros(meses):
+    return (lambda: projetar_juros_compostos(10000, 500, 10, meses, taxa_inflacao=4)), meses
+
+
+@caso("juros.resumir_juros_compostos", "lote", (1000, 100000), "cenários")
+def _resumo_juros(n):
+    c = _carteira(n)
+    meses = c['prazo'] * 12
+    return (lambda: resumir_juros_compostos(c['valor'], c['aporte'], c['taxa'], meses, "Fim do mês", 4.0)), n
+
+
+@caso("juros._simular_juros_compostos", "anos", (10, 50), "meses")
+def _nucleo_juros(anos):
+    from utils.juros_compostos import _simular_juros_compostos
+    return (lambda: _simular_juros_compostos.__wrapped__(10000, 500, 10, anos, "Início do mês", 4)), anos * 12
+
+
+@caso("juros.projetar_cdi", "anos", (10, 50), "meses")
+def _projecao_cdi(anos):
+    return (lambda: projetar_cdi(10000, 500, 110, anos * 12, '2025-01-02', 10.5, taxa_inflacao=4)), anos * 12
+
+
+@caso("juros.fator_periodo", "janelas", (1000, 100000), "janelas")
+def _janelas_cdi(n):
+    curva = curva_acumulada('2000-01-01', '2050-01-01', 10.5, 110)
+    inicios = np.datetime64('2000-01-01') + np.arange(n) % 10000
+    return (lambda: fator_periodo(curva, inicios, inicios + 365 * 5)), n
+
+
+@caso("juros.projetar_ir", "anos", (10, 50), "meses")
+def _projecao_ir(anos):
+    meses = np.arange(anos * 12 + 1)
+    fatores, aportes = 1.008 ** meses, np.full(meses.shape, 500.0)
+    resgates = np.where((meses > 60) & (meses % 12 == 0), 3000.0, 0.0)
+    return (lambda: projetar_ir(fatores, aportes, resgates)), anos * 12
+
+
+# Empréstimos
+
+@caso("emprestimo.amortizar_carteira", "lote", (1, 1000), "parcelas")
+def _tabelas(n):
+    c = _carteira(n)
+    return (lambda: amortizar_carteira(c['valor'], 0, c['taxa'], 35, SISTEMA_SAC)), n * 420
+
+
+@caso("emprestimo.amortizar_carteira_centavos", "lote", (1, 1000), "parcelas")
+def _tabelas_centavos(n):
+    c = _carteira(n)
+    return (lambda: amortizar_carteira_centavos(c['valor'], 0, c['taxa'], 35, SISTEMA_SAC)), n * 420
+
+
+@caso("emprestimo.resumir_carteira", "lote", (1000, 100000), "contratos")
+def _resumo_carteira(n):
+    c = _carteira(n)
+    return (lambda: resumir_carteira(c['valor'], 0, c['taxa'], c['prazo'])), n
+
+
+@caso("emprestimo.faixas_indexado", "cenarios", (1000, 10000), "parcelas")
+def _indexado(n):
+    indices = gerar_indices(np.random.default_rng(0), n, 420, 4.0, 2.0)
+    return (lambda: faixas_indexado(500000, 100000, 9, 35, SISTEMA_SAC, indices)), n * 420
+
+
+@caso("emprestimo.grade_carteira", "pontos_taxa", (50, 200), "combinações")
+def _grade(pontos):
+    taxas, prazos = np.linspace(1, 30, pontos), np.arange(1, 36)
+    return (lambda: grade_carteira(200000, 0, taxas, prazos)), pontos * 35 * 2
+
+
+@caso("emprestimo.comparar_estrategias", "estrategias", (10, 40), "estratégias")
+def _estrategias(n):
+    estrategias = {
+        f"E{k}": [(12 * j, 2000.0 * k, REDUZIR_PRAZO if k % 2 else REDUZIR_PARCELA) for j in range(1, 20)]
+        for k in range(n)
+    }
+    return (lambda: comparar_estrategias(300000, 0, 10, 30, estrategias=estrategias)), n
+
+
+@caso("emprestimo.custo_efetivo_total", "ofertas", (100, 5000), "ofertas")
+def _cet(n):
+    c = _carteira(n)
+    return (lambda: custo_efetivo_total(c['valor'], 0, c['taxa'], c['prazo'], tac=1000, seguro_mip=0.03)), n
+
+
+@caso("emprestimo._tabela_parcelas", "anos", (5, 35), "parcelas")
+def _nucleo_emprestimo(anos):
+    from utils.emprestimos import _tabela_parcelas
+    return (lambda: _tabela_parcelas.__wrapped__(200000, 0, 9, anos, "PRICE")), anos * 12
+
+
+# Aposentadoria
+
+@caso("aposentadoria.resumir_aposentadoria", "lote", (1000, 100000), "planos")
+def _resumo_aposentadoria(n):
+    c = _carteira(n)
+    return (lambda: resumir_aposentadoria(
+        c['idade'], c['valor'], c['aporte'], c['idade'] + 25, c['renda'], c['idade'] + 50, 8, 5
+    )), n
+
+
+@caso("aposentadoria.metas_aposentadoria", "lote", (1000, 20000), "planos")
+def _metas(n):
+    c = _carteira(n)
+    return (lambda: metas_aposentadoria(
+        c['idade'], c['valor'], c['aporte'], c['idade'] + 25, c['renda'], c['idade'] + 50, 8, 5
+    )), n
+
+
+@caso("aposentadoria.sensibilidade_aposentadoria", "pontos", (50, 100), "células")
+def _sensibilidade(pontos):
+    parametros = dict(idade_atual=30, patrimonio_atual=50000.0, aporte_mensal=1000.0, idade_aposentadoria=60,
+                      renda_mensal_desejada=5000.0, expectativa_vida=85, taxa_acumulacao=8.0, taxa_aposentadoria=5.0)
+    aportes, taxas = np.linspace(0, 3000, pontos), np.linspace(0, 15, pontos)
+    return (lambda: sensibilidade_aposentadoria(parametros, 'aporte_mensal', aportes, 'taxa_acumulacao', taxas)), pontos ** 2
+
+
+@caso("aposentadoria.monte_carlo", "caminhos", (1000, 10000, 30000), "caminhos")
+def _monte_carlo(n):
+    return (lambda: simular_aposentadoria_monte_carlo(
+        50000, 1000, 5000, 30, 60, 85, 8, 15, 5, 8, 4, n_caminhos=n, semente=1
+    )), n
+
+
+@caso("aposentadoria.comparar_politicas_saque", "caminhos", (10000, 50000), "caminhos")
+def _politicas_saque(n):
+    return (lambda: comparar_politicas_saque(1000000, 5000, 30, 5, 8, 4, 1.5, n_caminhos=n, semente=1)), n
+
+
+@caso("aposentadoria._simular_aposentadoria", "anos", (20, 70), "meses")
+def _nucleo_aposentadoria(anos):
+    from utils.aposentadoria import _simular_aposentadoria
+    return (lambda: _simular_aposentadoria.__wrapped__(30, 50000, 1000, 30 + anos // 2, 5000, 30 + anos, 8, 5)), anos * 12
+
+
+# FI/RE
+
+@caso("fire.meses_ate_meta_corrigida", "lote", (1000, 100000), "cenários")
+def _meses_fire(n):
+    c = _carteira(n)
+    return (lambda: meses_ate_meta_corrigida(c['valor'] / 10, c['aporte'], 0.006, c['renda'] * 300, 4.0, 600)), n
+
+
+@caso("fire.simular_carteira", "caminhos", (1000, 10000), "caminhos")
+def _carteira_fire(n):
+    return (lambda: simular_carteira(
+        100000, 3000, [50, 25, 25], [9, 13, 11], [3, 25, 18], 480, 0.3, REBALANCEAMENTO_LIMITE,
+        direcionar_aportes=True, n_caminhos=n, semente=1
+    )), n
+
+
+@caso("fire.buscar_taxa_saque_segura", "caminhos", (5000, 20000), "caminhos")
+def _taxa_saque(n):
+    return (lambda: buscar_taxa_saque_segura(30, n_caminhos=n, semente=1, n_processos=1)), n
+
+
+@caso("fire._simular_fire", "patrimonio", (0, 500000), "simulações")
+def _nucleo_fire(patrimonio):
+    from utils.fire import _simular_fire
+    return (lambda: _simular_fire.__wrapped__(patrimonio, 3000, 30, 8, 4, 5000, 4)), 1
+
+
+def calibrar(repeticoes=5):
+    """Tempo de um núcleo fixo (NumPy + laço Python) usado para comparar máquinas"""
+    rng = np.random.default_rng(0)
+    dados = rng.random((200, 2000))
+
+    def nucleo():
+        total = 0.0
+        for linha in dados:
+            total += float(np.cumprod(1 + linha * 1e-3)[-1])
+        return total
+
+    return medir(nucleo, repeticoes)
+
+
+def medir(chamada, repeticoes=5, tempo_minimo=0.2):
+    """Menor tempo por chamada em `repeticoes` rodadas de pelo menos `tempo_minimo` segundos"""
+    chamada()  # aquecimento: imports, caches de NumPy
+    melhores = []
+    for _ in range(repeticoes):
+        chamadas, inicio = 0, time.perf_counter()
+        while True:
+            chamada()
+            chamadas += 1
+            decorrido = time.perf_counter() - inicio
+            if decorrido >= tempo_minimo or chamadas >= 1000:
+                break
+        melhores.append(decorrido / chamadas)
+    return min(melhores)
+
+
+def selecionar(filtro='*'):
+    """Nomes dos casos que casam com o padrão glob ou contêm o trecho `filtro`"""
+    return [nome for nome in CASOS if fnmatch.fnmatch(nome, filtro) or filtro in nome]
+
+
+def executar(nomes, repeticoes=5):
+    """Mede os casos `nomes`; devolve {caso: {'segundos', 'vazao', 'unidade', 'calibracao_s'}}"""
+    resultados = {}
+    for nome in nomes:
+        preparar, unidade = CASOS[nome]
+        chamada, unidades = preparar()
+        calibracao = calibrar(repeticoes)
+        segundos = medir(chamada, repeticoes)
+        resultados[nome] = {
+            'segundos': segundos, 'vazao': unidades / segundos, 'unidade': unidade, 'calibracao_s': calibracao
+        }
+        print(f"{nome:<58} {segundos * 1000:>10.3f} ms {unidades / segundos:>14,.0f} {unidade}/s", flush=True)
+    return resultados
+
+
+def comparar(resultados, linha_base, limite):
+    """Casos cuja vazão, corrigida pela calibração, caiu mais que `limite` em relação à linha de base"""
+    regressoes = []
+    for nome, atual in resultados.items():
+        base = linha_base['casos'].get(nome)
+        if base is None:
+            continue
+        # Máquina mais lenta (calibração maior) -> espera-se vazão proporcionalmente menor
+        escala = base['calibracao_s'] / atual['calibracao_s']
+        razao = atual['vazao'] / (base['vazao'] * escala)
+        marca = "REGRESSÃO" if razao < 1 - limite else "ok"
+        print(f"{nome:<58} {razao:>7.2f}x da linha de base  {marca}")
+        if razao < 1 - limite:
+            regressoes.append(nome)
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks dos cálculos com comparação à linha de base.")
+    parser.add_argument('--filtro', default='*', help="Padrão (glob ou trecho) dos casos a executar")
+    parser.add_argument('--repeticoes', type=int, default=5, help="Rodadas por caso; vale a menor (padrão: 5)")
+    parser.add_argument('--limite', type=float, default=LIMITE_PADRAO,
+                        help="Queda de vazão tolerada antes de falhar (padrão: 0.25 = 25%%)")
+    parser.add_argument('--linha-base', default=str(LINHA_BASE), help="Arquivo JSON da linha de base")
+    parser.add_argument('--gravar-linha-base', action='store_true', help="Grava os resultados como nova linha de base")
+    args = parser.parse_args(argv)
+
+    resultados = executar(selecionar(args.filtro), args.repeticoes)
+    caminho = Path(args.linha_base)
+
+    if args.gravar_linha_base:
+        linha_base = json.loads(caminho.read_text(encoding='utf-8')) if caminho.exists() else {'casos': {}}
+        linha_base.update({
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'processador': platform.processor() or platform.machine(),
+        })
+        linha_base['casos'].update(resultados)
+        caminho.write_text(json.dumps(linha_base, indent=2, ensure_ascii=False, sort_keys=True), encoding='utf-8')
+        print(f"Linha de base gravada em {caminho}")
+        return 0
+
+    if not caminho.exists():
+        print(f"Sem linha de base em {caminho}; use --gravar-linha-base", file=sys.stderr)
+        return 1
+
+    linha_base = json.loads(caminho.read_text(encoding='utf-8'))
+    regressoes = comparar(resultados, linha_base, args.limite)
+    if regressoes:
+        print(f"Medindo novamente {len(regressoes)} caso(s) abaixo do limite")
+        regressoes = comparar(executar(regressoes, args.repeticoes), linha_base, args.limite)
+    if regressoes:
+        print(f"{len(regressoes)} caso(s) abaixo do limite: {', '.join(regressoes)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,143 @@
+"""Processamento em lote de cenários, sem a interface Streamlit.
+
+Exemplos:
+    python lote.py emprestimo contratos.parquet resumo.parquet
+    python lote.py fire clientes.csv resultado.csv --tamanho-lote 100000 --processos 0
+    python lote.py parcelas contratos.parquet parcelas.parquet --arredondamento "meio para cima"
+"""
+import argparse
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from utils.cenarios import CALCULADORAS, calcular_cenarios, preparar_colunas
+from utils.exportacao import blocos_parcelas, exportar
+from utils.motor_centavos import MODOS_ARREDONDAMENTO
+
+
+def ler_em_lotes(caminho, tamanho_lote):
+    """Lê um CSV ou Parquet em pedaços de até `tamanho_lote` linhas"""
+    caminho = Path(caminho)
+    if caminho.suffix.lower() == '.parquet':
+        import pyarrow.parquet as pq
+
+        arquivo = pq.ParquetFile(caminho)
+        for lote in arquivo.iter_batches(batch_size=tamanho_lote):
+            yield lote.to_pandas()
+    else:
+        yield from pd.read_csv(caminho, chunksize=tamanho_lote)
+
+
+class EscritorResultados:
+    """Grava os lotes de resultado em sequência num CSV ou Parquet"""
+
+    def __init__(self, caminho):
+        self.caminho = Path(caminho)
+        self.parquet = self.caminho.suffix.lower() == '.parquet'
+        self._escritor = None
+        self._primeiro = True
+
+    def escrever(self, df):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            tabela = pa.Table.from_pandas(df, preserve_index=False)
+            if self._escritor is None:
+                self._escritor = pq.ParquetWriter(self.caminho, tabela.schema)
+            self._escritor.write_table(tabela)
+        else:
+            df.to_csv(self.caminho, mode='w' if self._primeiro else 'a', header=self._primeiro, index=False)
+        self._primeiro = False
+
+    def fechar(self):
+        if self._escritor is not None:
+            self._escritor.close()
+
+
+def processar(tipo, entrada, saida, tamanho_lote=50000, processos=1):
+    """Lê, calcula e grava os cenários lote a lote; retorna o total de linhas.
+
+    Com `processos` > 1 os lotes são calculados em paralelo, mas no máximo
+    dois lotes por processo ficam em memória ao mesmo tempo e a saída mantém
+    a ordem da entrada.
+    """
+    escritor = EscritorResultados(saida)
+    total = 0
+    try:
+        if processos <= 1:
+            for df in ler_em_lotes(entrada, tamanho_lote):
+                escritor.escrever(calcular_cenarios(tipo, df))
+                total += len(df)
+        else:
+            with ProcessPoolExecutor(max_workers=processos) as executor:
+                pendentes = deque()
+                for df in ler_em_lotes(entrada, tamanho_lote):
+                    pendentes.append(executor.submit(calcular_cenarios, tipo, df))
+                    if len(pendentes) >= 2 * processos:
+                        resultado = pendentes.popleft().result()
+                        escritor.escrever(resultado)
+                        total += len(resultado)
+                while pendentes:
+                    resultado = pendentes.popleft().result()
+                    escritor.escrever(resultado)
+                    total += len(resultado)
+    finally:
+        escritor.fechar()
+    return total
+
+
+def exportar_parcelas(entrada, saida, tamanho_lote=50000, arredondamento=None):
+    """Grava a tabela completa de parcelas de cada contrato (colunas de 'emprestimo'), uma linha por parcela.
+
+    Os contratos são lidos e as tabelas calculadas e gravadas aos poucos, então
+    a memória não depende do tamanho da carteira. Retorna o total de contratos.
+    """
+    contratos = 0
+
+    def blocos():
+        nonlocal contratos
+        for df in ler_em_lotes(entrada, tamanho_lote):
+            p = preparar_colunas('emprestimo', df)
+            yield from blocos_parcelas(
+                p['valor_emprestimo'], p['entrada'], p['taxa_juros_anual'], p['prazo_anos'], p['sistema'].astype(str),
+                arredondamento=arredondamento, primeiro_contrato=contratos
+            )
+            contratos += len(df)
+
+    exportar(blocos(), saida)
+    return contratos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calcula cenários financeiros em lote a partir de arquivos CSV ou Parquet.")
+    parser.add_argument('tipo', choices=sorted(CALCULADORAS) + ['parcelas'],
+                        help="Calculadora a usar; 'parcelas' grava a tabela completa de cada empréstimo")
+    parser.add_argument('entrada', help="Arquivo de cenários (.csv ou .parquet)")
+    parser.add_argument('saida', help="Arquivo de resultados (.csv ou .parquet; .xlsx também para 'parcelas')")
+    parser.add_argument('--tamanho-lote', type=int, default=50000, help="Linhas lidas por vez (padrão: 50000)")
+    parser.add_argument('--processos', type=int, default=1, help="Processos em paralelo; 0 usa todos os núcleos (padrão: 1)")
+    parser.add_argument('--arredondamento', choices=MODOS_ARREDONDAMENTO,
+                        help="Em 'parcelas': gera as tabelas em centavos exatos com este arredondamento")
+    args = parser.parse_args(argv)
+
+    processos = args.processos or os.cpu_count() or 1
+    try:
+        if args.tipo == 'parcelas':
+            total = exportar_parcelas(args.entrada, args.saida, args.tamanho_lote, args.arredondamento)
+        else:
+            total = processar(args.tipo, args.entrada, args.saida, args.tamanho_lote, processos)
+    except (ValueError, FileNotFoundError, ImportError) as erro:
+        print(f"Erro: {erro}", file=sys.stderr)
+        return 1
+
+    print(f"{total} cenários de '{args.tipo}' gravados em {args.saida}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
@@ -1,13 +1,23 @@
+import importlib
+import os
+
 import streamlit as st
 import streamlit_antd_components as sac
 
-from utils import (
-    calcular_juros_compostos,
-    calcular_emprestimo,
-    calcular_aposentadoria,
-    calcular_fire
+from utils.armazenamento import armazenamento_padrao
+from utils.cache import estatisticas_cache, limpar_caches
+from utils.instrumentacao import (
+    finalizar_execucao, iniciar_execucao, limpar_metricas, texto_jsonl, texto_prometheus, totais_por_fase
 )
 
+# Aba -> (módulo, função); só o módulo da aba selecionada é importado
+CALCULADORAS = {
+    "Juros Compostos": ("utils.juros_compostos", "calcular_juros_compostos"),
+    "Empréstimos e Financiamentos": ("utils.emprestimos", "calcular_emprestimo"),
+    "Planejamento de Aposentadoria": ("utils.aposentadoria", "calcular_aposentadoria"),
+    "Calculadora FI/RE": ("utils.fire", "calcular_fire"),
+}
+
 # Configuração da página
 st.set_page_config(
     page_title="Calculadora Financeira Completa",
@@ -38,22 +48,57 @@ st.markdown("""
 # Título principal
 st.markdown('<h1 class="main-header">💰 Calculadora Financeira Completa</h1>', unsafe_allow_html=True)
 
-calculadora = sac.tabs([
-    sac.TabsItem(label='Juros Compostos'),
-    sac.TabsItem(label='Empréstimos e Financiamentos'),
-    sac.TabsItem(label='Planejamento de Aposentadoria'),
-    sac.TabsItem(label='Calculadora FI/RE'),
-], align='center')
+calculadora = sac.tabs([sac.TabsItem(label=aba) for aba in CALCULADORAS], align='center')
+
+if calculadora in CALCULADORAS:
+    modulo, funcao = CALCULADORAS[calculadora]
+    iniciar_execucao(calculadora)
+    try:
+        getattr(importlib.import_module(modulo), funcao)()
+    finally:
+        execucao = finalizar_execucao()
 
-match calculadora:
-    case "Juros Compostos":
-        calcular_juros_compostos()
-    case "Empréstimos e Financiamentos":
-        calcular_emprestimo()
-    case "Planejamento de Aposentadoria":
-        calcular_aposentadoria()
-    case "Calculadora FI/RE":
-        calcular_fire()
+# Estatísticas do cache dos cálculos
+with st.sidebar.expander("⚙️ Cache de Cálculos"):
+    if st.button("Limpar cache"):
+        limpar_caches()
+    st.dataframe([
+        {
+            'Função': nome.rsplit('.', 1)[-1],
+            'Acertos': info['acertos'],
+            'Faltas': info['faltas'],
+            'Entradas': f"{info['entradas']}/{info['tamanho_maximo']}",
+        }
+        for nome, info in estatisticas_cache().items()
+    ], hide_index=True, use_container_width=True)
+    armazenamento = armazenamento_padrao()
+    if st.button("Limpar resultados em disco"):
+        armazenamento.limpar()
+    disco = armazenamento.estatisticas()
+    st.caption(f"Em disco: {disco['entradas']} resultados, "
+               f"{disco['bytes'] / 2 ** 20:,.1f} de {disco['limite_bytes'] / 2 ** 20:,.0f} MB")
+
+# Tempos por fase da última execução e acumulados (?debug=1 ou CALCULADORA_DEBUG=1)
+if calculadora in CALCULADORAS and (st.query_params.get("debug") == "1" or os.environ.get("CALCULADORA_DEBUG") == "1"):
+    with st.sidebar.expander("⏱️ Tempos por Fase", expanded=True):
+        st.caption(f"Última execução: {execucao['total'] * 1000:,.1f} ms")
+        totais = totais_por_fase()
+        st.dataframe([
+            {
+                'Fase': fase,
+                'Última (ms)': round(segundos * 1000, 1),
+                'Média (ms)': round(totais[(calculadora, fase)]['segundos'] / totais[(calculadora, fase)]['execucoes'] * 1000, 1),
+                'Máx. (ms)': round(totais[(calculadora, fase)]['maximo'] * 1000, 1),
+            }
+            for fase, segundos in execucao['fases'].items()
+        ], hide_index=True, use_container_width=True)
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("JSON lines", texto_jsonl(), file_name="tempos.jsonl", mime="application/x-ndjson")
+        with col2:
+            st.download_button("Prometheus", texto_prometheus(), file_name="tempos.prom", mime="text/plain")
+        if st.button("Zerar tempos"):
+            limpar_metricas()
 
 # Footer
 st.markdown("---")
@@ -61,4 +106,4 @@ st.markdown("""
     <div style='text-align: center; color: #666; padding: 2rem 0;'>
         <p style='font-size: 1.1rem;'>⚠️ Esta ferramenta é apenas para fins educacionais. Consulte um profissional certificado para decisões financeiras importantes. ⚠️</p>
     </div>
-""", unsafe_allow_html=True)
+""", unsafe_allow_html=True)
\ No newline at end of file
@@ -0,0 +1,205 @@
+"""Serviço HTTP/JSON local com os cálculos das calculadoras.
+
+Exemplos:
+    python servidor.py --porta 8600 --processos 4 --fila 32
+    curl -X POST localhost:8600/emprestimo -d '{"valor_emprestimo": 200000, "taxa_juros_anual": 9, "prazo_anos": 20}'
+    curl -X POST localhost:8600/lote -d '{"tipo": "fire", "cenarios": [{...}, {...}]}'
+    curl localhost:8600/metricas
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from utils.cenarios import CALCULADORAS, calcular_cenarios
+from utils.motor_emprestimos import amortizar_carteira
+
+
+AMOSTRAS_LATENCIA = 2000
+ENDPOINT_DESCONHECIDO = "desconhecido"  # caminhos inexistentes dividem uma única entrada nas métricas
+TAMANHO_MAXIMO_CORPO = 50 * 1024 * 1024
+
+
+def _somar_meses(inicio, meses):
+    """Data (AAAA-MM) `meses` meses após `inicio`"""
+    total = inicio.year * 12 + inicio.month - 1 + int(meses)
+    return f"{total // 12:04d}-{total % 12 + 1:02d}"
+
+
+def calcular_lote(tipo, cenarios):
+    """Executado no processo de trabalho: calcula os cenários e devolve JSON"""
+    return calcular_cenarios(tipo, pd.DataFrame(cenarios)).to_json(orient='records', force_ascii=False)
+
+
+def calcular_um(tipo, cenario):
+    """Executado no processo de trabalho: um cenário, com detalhes extras por tipo"""
+    resultado = json.loads(calcular_lote(tipo, [cenario]))[0]
+
+    if tipo == 'fire' and resultado['meses_fire'] is not None:
+        resultado['data_fire'] = _somar_meses(date.today(), resultado['meses_fire'])
+
+    if tipo == 'emprestimo' and cenario.get('tabela'):
+        tabela = amortizar_carteira(
+            cenario['valor_emprestimo'], cenario.get('entrada', 0.0), cenario['taxa_juros_anual'],
+            cenario['prazo_anos'], cenario.get('sistema', 'PRICE')
+        )
+        resultado['tabela'] = {
+            coluna: np.round(tabela[coluna][0], 2).tolist()
+            for coluna in ('Valor Parcela', 'Juros', 'Amortização', 'Saldo Devedor')
+        }
+
+    return json.dumps(resultado, ensure_ascii=False)
+
+
+class Metricas:
+    """Latências recentes e contadores por endpoint"""
+
+    def __init__(self):
+        self._trava = threading.Lock()
+        self._latencias = defaultdict(lambda: deque(maxlen=AMOSTRAS_LATENCIA))
+        self._contadores = defaultdict(lambda: defaultdict(int))
+
+    def registrar(self, endpoint, segundos, status):
+        with self._trava:
+            self._latencias[endpoint].append(segundos * 1000)
+            self._contadores[endpoint][str(status)] += 1
+
+    def resumo(self):
+        with self._trava:
+            resumo = {}
+            for endpoint, latencias in self._latencias.items():
+                amostras = np.fromiter(latencias, dtype=float)
+                resumo[endpoint] = {
+                    'requisicoes': dict(self._contadores[endpoint]),
+                    'p50_ms': round(float(np.percentile(amostras, 50)), 3),
+                    'p99_ms': round(float(np.percentile(amostras, 99)), 3),
+                }
+            return resumo
+
+
+class ServidorCalculos(ThreadingHTTPServer):
+    """Servidor HTTP com pool de processos limitado e fila de espera com teto"""
+
+    daemon_threads = True
+
+    def __init__(self, endereco, processos, fila, espera_fila):
+        super().__init__(endereco, ManipuladorCalculos)
+        self.executor = ProcessPoolExecutor(max_workers=processos)
+        # Vagas = processos ocupados + requisições aguardando; além disso, 503
+        self.vagas = threading.BoundedSemaphore(processos + fila)
+        self.espera_fila = espera_fila
+        self.metricas = Metricas()
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(cancel_futures=True)
+
+
+class ManipuladorCalculos(BaseHTTPRequestHandler):
+    server_version = "CalculadoraFinanceira/1.0"
+
+    def log_message(self, formato, *args):
+        pass
+
+    def _responder(self, status, corpo, cabecalhos=None):
+        dados = corpo.encode('utf-8') if isinstance(corpo, str) else json.dumps(corpo, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(dados)))
+        for nome, valor in (cabecalhos or {}).items():
+            self.send_header(nome, valor)
+        self.end_headers()
+        self.wfile.write(dados)
+        return status
+
+    def do_GET(self):
+        inicio = time.perf_counter()
+        if self.path == '/metricas':
+            status = self._responder(200, self.server.metricas.resumo())
+        elif self.path == '/saude':
+            status = self._responder(200, {'status': 'ok', 'endpoints': sorted(CALCULADORAS) + ['lote']})
+        else:
+            status = self._responder(404, {'erro': f"Endpoint desconhecido: {self.path}"})
+        nome = f"GET {self.path}" if self.path in ('/metricas', '/saude') else ENDPOINT_DESCONHECIDO
+        self.server.metricas.registrar(nome, time.perf_counter() - inicio, status)
+
+    def do_POST(self):
+        inicio = time.perf_counter()
+        endpoint = self.path.strip('/')
+        status = self._processar(endpoint)
+        nome = f"POST /{endpoint}" if endpoint in CALCULADORAS or endpoint == 'lote' else ENDPOINT_DESCONHECIDO
+        self.server.metricas.registrar(nome, time.perf_counter() - inicio, status)
+
+    def _processar(self, endpoint):
+        if endpoint not in CALCULADORAS and endpoint != 'lote':
+            return self._responder(404, {'erro': f"Endpoint desconhecido: /{endpoint}"})
+
+        try:
+            tamanho = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            tamanho = -1
+        if tamanho < 0:
+            return self._responder(400, {'erro': "Content-Length inválido"})
+        if tamanho > TAMANHO_MAXIMO_CORPO:
+            return self._responder(413, {'erro': "Corpo da requisição muito grande"})
+        try:
+            corpo = json.loads(self.rfile.read(tamanho) or b'{}')
+        except json.JSONDecodeError as erro:
+            return self._responder(400, {'erro': f"JSON inválido: {erro}"})
+
+        if endpoint == 'lote':
+            if not isinstance(corpo, dict) or corpo.get('tipo') not in CALCULADORAS or not isinstance(corpo.get('cenarios'), list):
+                return self._responder(400, {'erro': "Use {\"tipo\": <calculadora>, \"cenarios\": [...]}"})
+            tarefa = (calcular_lote, corpo['tipo'], corpo['cenarios'])
+        else:
+            if not isinstance(corpo, dict):
+                return self._responder(400, {'erro': "O corpo deve ser um objeto JSON com um cenário"})
+            tarefa = (calcular_um, endpoint, corpo)
+
+        # Contrapressão: sem vaga no pool nem na fila dentro do prazo, recusa
+        if not self.server.vagas.acquire(timeout=self.server.espera_fila):
+            return self._responder(503, {'erro': "Servidor ocupado, tente novamente"}, {'Retry-After': '1'})
+        try:
+            resultado = self.server.executor.submit(*tarefa).result()
+        except (ValueError, KeyError, TypeError) as erro:
+            return self._responder(400, {'erro': str(erro)})
+        except Exception as erro:
+            return self._responder(500, {'erro': f"Falha no cálculo: {erro}"})
+        finally:
+            self.server.vagas.release()
+
+        if endpoint == 'lote':
+            resultado = f'{{"resultados": {resultado}}}'
+        return self._responder(200, resultado)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serviço HTTP local com os cálculos da Calculadora Financeira.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8600)
+    parser.add_argument('--processos', type=int, default=0, help="Processos de cálculo; 0 usa todos os núcleos (padrão: 0)")
+    parser.add_argument('--fila', type=int, default=32, help="Requisições que podem aguardar um processo livre (padrão: 32)")
+    parser.add_argument('--espera-fila', type=float, default=0.5, help="Segundos aguardando vaga antes de responder 503 (padrão: 0.5)")
+    args = parser.parse_args(argv)
+
+    processos = args.processos or os.cpu_count() or 1
+    servidor = ServidorCalculos((args.host, args.porta), processos, args.fila, args.espera_fila)
+    print(f"Servindo em http://{args.host}:{args.porta} com {processos} processos")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
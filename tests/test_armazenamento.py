@@ -0,0 +1,24 @@
+import numpy as np
+
+from utils.armazenamento import LIMITE_PADRAO_MB, ArmazenamentoResultados, limite_configurado_mb, persistir
+
+
+def test_chamada_sem_semente_nao_e_gravada(tmp_path):
+    armazenamento = ArmazenamentoResultados(tmp_path)
+
+    @persistir(armazenamento)
+    def sortear(n, semente=None):
+        return np.random.default_rng(semente).random(n)
+
+    assert not np.array_equal(sortear(5), sortear(5))
+    assert armazenamento.entradas() == []
+
+    np.testing.assert_array_equal(sortear(5, semente=3), sortear(5, 3))
+    assert len(armazenamento.entradas()) == 1
+
+
+def test_limite_invalido_usa_o_padrao(monkeypatch):
+    monkeypatch.setenv("CALCULADORA_ARMAZENAMENTO_MB", "muito")
+    assert limite_configurado_mb() == LIMITE_PADRAO_MB
+    monkeypatch.setenv("CALCULADORA_ARMAZENAMENTO_MB", "2")
+    assert ArmazenamentoResultados().limite_bytes == 2 * 2 ** 20
\ No newline at end of file
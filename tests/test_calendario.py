@@ -0,0 +1,25 @@
+import numpy as np
+
+from utils.calendario import contar_dias_uteis, feriados_nacionais, pascoa
+
+
+def test_pascoa_datas_conhecidas():
+    anos = [1900, 1954, 2000, 2001, 2008, 2011, 2019, 2021, 2024, 2025, 2038, 2045, 2100]
+    esperado = np.array([
+        '1900-04-15', '1954-04-18', '2000-04-23', '2001-04-15', '2008-03-23', '2011-04-24', '2019-04-21',
+        '2021-04-04', '2024-03-31', '2025-04-20', '2038-04-25', '2045-04-09', '2100-03-28',
+    ], dtype='datetime64[D]')
+    np.testing.assert_array_equal(pascoa(anos), esperado)
+
+
+def test_feriados_nacionais_2025():
+    esperado = np.array([
+        '2025-01-01', '2025-03-03', '2025-03-04', '2025-04-18', '2025-04-21', '2025-05-01', '2025-06-19',
+        '2025-09-07', '2025-10-12', '2025-11-02', '2025-11-15', '2025-11-20', '2025-12-25',
+    ], dtype='datetime64[D]')
+    np.testing.assert_array_equal(feriados_nacionais(2025, 2025), esperado)
+
+
+def test_dias_uteis_2025():
+    # 261 dias de semana menos os 9 feriados que caem em dia útil
+    assert contar_dias_uteis('2025-01-01', '2026-01-01') == 252
\ No newline at end of file
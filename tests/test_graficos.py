@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from utils.graficos import PONTOS_POR_GRAFICO, reduzir
+
+
+@pytest.mark.parametrize("n_series", [1, 2, 5, 6])
+def test_reduzir_respeita_o_orcamento_da_uniao(n_series):
+    rng = np.random.default_rng(n_series)
+    x = np.arange(5000)
+    series = [np.cumsum(rng.standard_normal(len(x))) for _ in range(n_series)]
+    x_reduzido, *reduzidas = reduzir(x, *series)
+    assert len(x_reduzido) <= PONTOS_POR_GRAFICO
+    assert x_reduzido[0] == 0 and x_reduzido[-1] == len(x) - 1
+    for serie, reduzida in zip(series, reduzidas):
+        np.testing.assert_array_equal(reduzida, serie[x_reduzido])
+
+
+def test_reduzir_preserva_series_curtas():
+    x = np.arange(PONTOS_POR_GRAFICO)
+    x_reduzido, y = reduzir(x, x * 2.0)
+    np.testing.assert_array_equal(x_reduzido, x)
\ No newline at end of file
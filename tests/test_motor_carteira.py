@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from utils.motor_carteira import correlacao_minima, gerar_retornos_ativos, matriz_correlacao
+
+
+@pytest.mark.parametrize("correlacao, n_ativos", [(-0.5, 4), (-0.4, 4), (-0.6, 3), (1.5, 2)])
+def test_correlacao_unica_fora_do_intervalo(correlacao, n_ativos):
+    with pytest.raises(ValueError):
+        matriz_correlacao(correlacao, n_ativos)
+
+
+def test_matriz_incompativel():
+    with pytest.raises(ValueError):
+        matriz_correlacao([[1, 0.9, -0.9], [0.9, 1, 0.9], [-0.9, 0.9, 1]], 3)
+
+
+@pytest.mark.parametrize("correlacao", [correlacao_minima(3), 1.0])
+def test_matriz_singular_gera_retornos(correlacao):
+    retornos = gerar_retornos_ativos(np.random.default_rng(0), 50000, 1, [5, 5, 5], [10, 10, 10], correlacao)
+    observada = np.corrcoef(retornos[:, 0].T)
+    np.testing.assert_allclose(observada[np.triu_indices(3, 1)], correlacao, atol=0.02)
\ No newline at end of file
@@ -0,0 +1,93 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from utils.motor_centavos import (
+    ARREDONDAR_MEIO_PAR, ARREDONDAR_MEIO_PARA_CIMA, ESCALA_TAXA, MODOS_ARREDONDAMENTO, TRUNCAR,
+    amortizar_carteira_centavos, juros_centavos, para_centavos
+)
+
+
+def _arredondar(fracao, modo):
+    """Referência em inteiros do Python para uma fração não negativa"""
+    quociente, resto = divmod(fracao.numerator, fracao.denominator)
+    dobro = 2 * resto
+    if modo == ARREDONDAR_MEIO_PARA_CIMA:
+        return quociente + (dobro >= fracao.denominator)
+    if modo == ARREDONDAR_MEIO_PAR:
+        return quociente + (dobro > fracao.denominator or (dobro == fracao.denominator and quociente % 2 == 1))
+    return quociente
+
+
+@pytest.mark.parametrize("valor, modo, esperado", [
+    (0.285, ARREDONDAR_MEIO_PARA_CIMA, 29),
+    (0.285, ARREDONDAR_MEIO_PAR, 28),
+    (0.295, ARREDONDAR_MEIO_PAR, 30),
+    (0.289, TRUNCAR, 28),
+    (1234567.005, ARREDONDAR_MEIO_PARA_CIMA, 123456701),
+])
+def test_para_centavos(valor, modo, esperado):
+    assert para_centavos(valor, modo) == esperado
+
+
+@pytest.mark.parametrize("modo", MODOS_ARREDONDAMENTO)
+def test_juros_centavos_perto_do_limite_do_int64(modo):
+    saldos = np.array([1, 12345, 9 * 10 ** 13, 9 * 10 ** 13 - 1], dtype=np.int64)  # até R$ 900 bilhões
+    taxas = np.array([1, 99999, 123456789, 5 * 10 ** 8 + 99999, ESCALA_TAXA - 1], dtype=np.int64)
+    saldo, taxa = np.meshgrid(saldos, taxas)
+    obtido = juros_centavos(saldo, taxa, modo)
+    esperado = [[_arredondar(Fraction(int(s) * int(t), ESCALA_TAXA), modo) for s, t in zip(*linha)]
+                for linha in zip(saldo, taxa)]
+    np.testing.assert_array_equal(obtido, np.array(esperado, dtype=np.int64))
+
+
+@pytest.mark.parametrize("modo", MODOS_ARREDONDAMENTO)
+def test_amortizacao_soma_o_principal(modo):
+    rng = np.random.default_rng(7)
+    n = 500
+    valores = np.round(rng.uniform(1000, 2_000_000, n), 2)
+    entradas = np.round(valores * rng.uniform(0, 0.5, n), 2)
+    taxas = rng.uniform(0, 30, n)
+    prazos = rng.integers(1, 36, n)
+    sistemas = np.where(rng.random(n) < 0.5, "PRICE", "SAC")
+    tabela = amortizar_carteira_centavos(valores, entradas, taxas, prazos, sistemas, modo)
+    principal = para_centavos(valores - entradas, modo)
+    np.testing.assert_array_equal(tabela['Amortização'].sum(axis=1), principal)
+    np.testing.assert_array_equal(tabela['Valor Parcela'], tabela['Juros'] + tabela['Amortização'])
+    ultima = tabela['num_parcelas'] - 1
+    np.testing.assert_array_equal(tabela['Saldo Devedor'][np.arange(n), ultima], 0)
+
+
+@pytest.mark.parametrize("modo", MODOS_ARREDONDAMENTO)
+def test_residuo_price_confere_com_referencia(modo):
+    tabela = amortizar_carteira_centavos(250000, 50000, 13.7, 5, "PRICE", modo)
+    parcela = int(tabela['Valor Parcela'][0, 0])
+    taxa = int(np.rint(13.7 / 12 / 100 * ESCALA_TAXA))
+    saldo = 20000000
+    for _ in range(59):
+        saldo -= parcela - _arredondar(Fraction(saldo * taxa, ESCALA_TAXA), modo)
+    regular = parcela - _arredondar(Fraction(saldo * taxa, ESCALA_TAXA), modo)
+    assert tabela['Resíduo'][0] == saldo - regular
+    assert tabela['Amortização'][0, -1] == saldo
+
+
+@pytest.mark.parametrize("modo, amortizacao, residuo", [
+    (ARREDONDAR_MEIO_PARA_CIMA, 16669, -3),
+    (ARREDONDAR_MEIO_PAR, 16668, 3),
+    (TRUNCAR, 16668, 3),
+])
+def test_residuo_sac_por_modo(modo, amortizacao, residuo):
+    # R$ 1.000,11 em 6 parcelas: 16668,5 centavos de amortização regular
+    tabela = amortizar_carteira_centavos(1000.11, 0, 0, 0.5, "SAC", modo)
+    assert tabela['Amortização'][0, 0] == amortizacao
+    assert tabela['Resíduo'][0] == residuo
+    assert tabela['Amortização'][0, -1] == amortizacao + residuo
+
+
+def test_principal_zero():
+    tabela = amortizar_carteira_centavos([100000, 50000], [100000, 0], 12, [10, 1], ["PRICE", "SAC"])
+    assert tabela['num_parcelas'].tolist() == [120, 12]
+    assert not tabela['Valor Parcela'][0].any()
+    assert tabela['Resíduo'][0] == 0
+    assert tabela['Amortização'][1].sum() == 5000000
\ No newline at end of file
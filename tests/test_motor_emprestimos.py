@@ -0,0 +1,38 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from utils.motor_emprestimos import SISTEMA_PRICE, SISTEMA_SAC, amortizar_carteira, resumir_carteira
+
+
+@pytest.mark.parametrize("sistema", ["SAC", "sac", " Sac ", SISTEMA_SAC])
+def test_sistema_sac_aceita_apelidos(sistema):
+    assert resumir_carteira(120000, 0, 12, 10, sistema)['Primeira Parcela'][0] == pytest.approx(2200.0)
+
+
+@pytest.mark.parametrize("sistema", ["PRICE", "price", SISTEMA_PRICE])
+def test_sistema_price_aceita_apelidos(sistema):
+    assert resumir_carteira(120000, 0, 12, 10, sistema)['Primeira Parcela'][0] == pytest.approx(1721.651381, abs=1e-6)
+
+
+@pytest.mark.parametrize("sistema", ["foo", "", ["PRICE", "SACC"]])
+def test_sistema_desconhecido(sistema):
+    with pytest.raises(ValueError, match="Sistema de amortização desconhecido"):
+        amortizar_carteira([120000, 80000], 0, 12, 10, sistema)
+
+
+def test_parcela_price_contra_calculo_exato():
+    taxas = np.array([1e-9, 1e-6, 0.5, 1.0, 2.5])
+    prazos = np.array([12, 360, 420, 60, 1])
+    parcelas = resumir_carteira(100000, 0, taxas, prazos / 12, "PRICE")['Primeira Parcela']
+    for parcela, taxa, meses in zip(parcelas, taxas, prazos):
+        t = Fraction(float(taxa / 12 / 100))
+        fator = (1 + t) ** int(meses)
+        assert parcela == pytest.approx(float(100000 * t * fator / (fator - 1)), rel=1e-12)
+
+
+def test_tabela_quita_o_valor_financiado():
+    tabela = amortizar_carteira([120000, 300000, 50000], [20000, 0, 0], [12, 9, 0], [10, 30, 2], ["PRICE", "SAC", "PRICE"])
+    np.testing.assert_allclose(tabela['Amortização'].sum(axis=1), [100000, 300000, 50000], rtol=1e-10)
+    np.testing.assert_allclose(tabela['Saldo Devedor'][np.arange(3), tabela['num_parcelas'] - 1], 0.0, atol=1e-6)
\ No newline at end of file
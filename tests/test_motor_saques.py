@@ -0,0 +1,19 @@
+import numpy as np
+
+from utils.motor_saques import _anos_de_caminhos, aplicar_politica, comparar_politicas_saque
+
+
+def test_vpw_nunca_se_esgota():
+    comparacao = comparar_politicas_saque(1e6, 5000, 30, 4, 12, 4, politicas=("VPW",), n_caminhos=20000, semente=1)
+    assert comparacao["VPW"]['probabilidade_sucesso'] == 1.0
+    assert len(comparacao["VPW"]['anos_ruina']) == 0
+
+
+def test_liquidacao_no_ultimo_ano_com_retorno_negativo():
+    # Um ano só, com queda de 2% ao mês: o VPW saca tudo em parcelas de saldo / meses restantes
+    retornos = np.full((1, 12), -0.02)
+    crescimento, descontos, indice_precos = _anos_de_caminhos(retornos, np.zeros((1, 12)))
+    resultado = aplicar_politica("VPW", 120000.0, 120000.0, crescimento, descontos, indice_precos)
+    assert resultado['mes_ruina'][0] == -1
+    assert resultado['patrimonio'][0, -1] == 0.0
+    np.testing.assert_allclose(resultado['saques'][0, 0], 120000.0 * (0.98 ** np.arange(1, 13)).sum() / 12)
\ No newline at end of file
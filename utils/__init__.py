@@ -1,11 +1,60 @@
-from .juros_compostos import calcular_juros_compostos
-from .emprestimos import calcular_emprestimo
-from .aposentadoria import calcular_aposentadoria
-from .fire import calcular_fire
-
-__all__ = [
-    'calcular_juros_compostos',
-    'calcular_emprestimo',
-    'calcular_aposentadoria',
-    'calcular_fire'
-]
\ No newline at end of file
+"""Calculadoras e motores de cálculo.
+
+Os nomes públicos são importados sob demanda: `from utils import resumir_carteira`
+carrega só `utils.motor_emprestimos`, sem Streamlit nem as outras calculadoras.
+"""
+import importlib
+
+
+# Nome público -> submódulo que o define
+_ORIGENS = {
+    'calcular_juros_compostos': 'juros_compostos',
+    'calcular_emprestimo': 'emprestimos',
+    'calcular_aposentadoria': 'aposentadoria',
+    'calcular_fire': 'fire',
+    'projetar_juros_compostos': 'motor_juros',
+    'projetar_cdi': 'motor_cdi',
+    'curva_acumulada': 'motor_cdi',
+    'fator_periodo': 'motor_cdi',
+    'feriados_nacionais': 'calendario',
+    'dias_uteis': 'calendario',
+    'projetar_ir': 'motor_ir',
+    'amortizar_carteira': 'motor_emprestimos',
+    'resumir_carteira': 'motor_emprestimos',
+    'amortizar_com_eventos': 'motor_emprestimos',
+    'comparar_estrategias': 'motor_emprestimos',
+    'grade_carteira': 'motor_emprestimos',
+    'amortizar_carteira_centavos': 'motor_centavos',
+    'amortizar_indexado': 'motor_indexado',
+    'faixas_indexado': 'motor_indexado',
+    'custo_efetivo_total': 'motor_cet',
+    'taxa_interna_retorno': 'motor_cet',
+    'sensibilidade_aposentadoria': 'motor_aposentadoria',
+    'idade_minima_aposentadoria': 'motor_aposentadoria',
+    'taxa_acumulacao_necessaria': 'motor_aposentadoria',
+    'metas_aposentadoria': 'motor_aposentadoria',
+    'meses_ate_meta': 'motor_fire',
+    'meses_ate_meta_corrigida': 'motor_fire',
+    'evoluir_carteira': 'motor_carteira',
+    'simular_carteira': 'motor_carteira',
+    'simular_aposentadoria_monte_carlo': 'monte_carlo',
+    'aplicar_politica': 'motor_saques',
+    'comparar_politicas_saque': 'motor_saques',
+    'buscar_taxa_saque_segura': 'taxa_saque',
+    'exportar': 'exportacao',
+    'blocos_parcelas': 'exportacao',
+}
+
+__all__ = list(_ORIGENS)
+
+
+def __getattr__(nome):
+    if nome not in _ORIGENS:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    valor = getattr(importlib.import_module(f".{_ORIGENS[nome]}", __name__), nome)
+    globals()[nome] = valor
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
@@ -1,38 +1,29 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 
+from .armazenamento import persistir
+from .cache import memorizar
+from .exportacao import FORMATOS, exportar_bytes, formatos_disponiveis
+from .graficos import faixas_percentis, figura, mapa_calor, reduzir, traco
+from .instrumentacao import marcar
+from .monte_carlo import simular_aposentadoria_monte_carlo
+from .motor_aposentadoria import metas_aposentadoria, sensibilidade_aposentadoria
+from .motor_saques import POLITICAS_SAQUE, comparar_politicas_saque
 
-def calcular_aposentadoria():
-    """Calculadora de Planejamento de Aposentadoria"""
-    st.header("👴 Planejamento de Aposentadoria")
-    st.markdown("Calcule quanto você precisa acumular para se aposentar confortavelmente")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.subheader("Situação Atual")
-        idade_atual = st.number_input("Idade Atual", min_value=18, max_value=80, value=30)
-        patrimonio_atual = st.number_input("Patrimônio Atual (R$)", min_value=0.0, value=50000.0, step=1000.0)
-        aporte_mensal = st.number_input("Aporte Mensal (R$)", min_value=0.0, value=1000.0, step=100.0)
-        
-    with col2:
-        st.subheader("Metas")
-        idade_aposentadoria = st.number_input("Idade de Aposentadoria Desejada", min_value=idade_atual+1, max_value=100, value=60)
-        renda_mensal_desejada = st.number_input("Renda Mensal Desejada (R$)", min_value=0.0, value=5000.0, step=500.0)
-        expectativa_vida = st.number_input("Expectativa de Vida", min_value=idade_aposentadoria+1, max_value=120, value=85)
-    
-    st.subheader("Parâmetros Econômicos")
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        taxa_acumulacao = st.number_input("Taxa de Retorno na Acumulação (%/ano)", min_value=0.0, value=8.0, step=0.1)
-    with col2:
-        taxa_aposentadoria = st.number_input("Taxa de Retorno Aposentado (%/ano)", min_value=0.0, value=5.0, step=0.1)
-    with col3:
-        taxa_inflacao = st.number_input("Inflação Estimada (%/ano)", min_value=0.0, value=4.0, step=0.1)
-    
-    # Cálculos
+
+# Os caminhos ficam em disco (mapeados em memória) e sobrevivem a reinícios da aplicação
+_simular_monte_carlo = memorizar(tamanho_maximo=8)(persistir()(simular_aposentadoria_monte_carlo))
+CAMINHOS_EXIBIDOS = 30
+_comparar_politicas_saque = memorizar(tamanho_maximo=8)(comparar_politicas_saque)
+CORES_POLITICAS = ['#7f7f7f', '#1f77b4', '#2ca02c', '#ff7f0e', '#9467bd', '#8c564b']
+
+
+@memorizar()
+def _simular_aposentadoria(idade_atual, patrimonio_atual, aporte_mensal, idade_aposentadoria,
+                           renda_mensal_desejada, expectativa_vida, taxa_acumulacao, taxa_aposentadoria):
+    """Núcleo numérico da calculadora: fases de acumulação e usufruto"""
     anos_ate_aposentadoria = idade_aposentadoria - idade_atual
     anos_aposentado = expectativa_vida - idade_aposentadoria
     
@@ -61,19 +52,130 @@ def calcular_aposentadoria():
     
     # Simular aposentadoria com patrimônio acumulado
     patrimonio_aposentado = patrimonio_aposentadoria
-    renda_possivel = []
     saldo_apos = []
     
     for mes in range(meses_aposentado):
-        if taxa_mensal_apos > 0 and mes == 0:
-            # Calcular renda sustentável
-            renda_sustentavel = patrimonio_aposentado * (taxa_mensal_apos * (1 + taxa_mensal_apos) ** meses_aposentado) / ((1 + taxa_mensal_apos) ** meses_aposentado - 1)
-        elif mes == 0:
-            renda_sustentavel = patrimonio_aposentado / meses_aposentado
-        
         patrimonio_aposentado = patrimonio_aposentado * (1 + taxa_mensal_apos) - renda_mensal_desejada
         saldo_apos.append(max(0, patrimonio_aposentado))
-        renda_possivel.append(renda_mensal_desejada if patrimonio_aposentado > 0 else 0)
+    
+    # Renda sustentável com o patrimônio acumulado
+    if taxa_mensal_apos > 0:
+        renda_sustentavel = patrimonio_aposentadoria * (taxa_mensal_apos * (1 + taxa_mensal_apos) ** meses_aposentado) / ((1 + taxa_mensal_apos) ** meses_aposentado - 1)
+    else:
+        renda_sustentavel = patrimonio_aposentadoria / meses_aposentado
+    
+    # Aporte necessário para atingir o patrimônio necessário
+    if taxa_mensal_acum > 0:
+        aporte_necessario = (patrimonio_necessario - patrimonio_atual * (1 + taxa_mensal_acum) ** meses_acumulacao) / (((1 + taxa_mensal_acum) ** meses_acumulacao - 1) / taxa_mensal_acum)
+    else:
+        aporte_necessario = (patrimonio_necessario - patrimonio_atual) / meses_acumulacao
+    
+    marcar('calculo')
+    
+    anos_lista = list(range(len(evolucao_patrimonio)))
+    df_evolucao = pd.DataFrame({
+        'Mês': anos_lista,
+        'Ano': [m/12 + idade_atual for m in anos_lista],
+        'Patrimônio': evolucao_patrimonio
+    })
+    marcar('tabelas')
+    
+    return {
+        'patrimonio_aposentadoria': patrimonio_aposentadoria,
+        'patrimonio_necessario': patrimonio_necessario,
+        'renda_sustentavel': renda_sustentavel,
+        'aporte_necessario': aporte_necessario,
+        'df_evolucao': df_evolucao,
+        'saldo_apos': saldo_apos
+    }
+
+
+@memorizar(tamanho_maximo=8)
+def _arquivo_evolucao(formato, *argumentos):
+    """Evolução do patrimônio de `_simular_aposentadoria(*argumentos)` exportada em `formato`"""
+    return exportar_bytes(_simular_aposentadoria(*argumentos)['df_evolucao'], formato)
+
+
+# Rótulo na interface -> chave de `resumir_aposentadoria`
+METRICAS_SENSIBILIDADE = {
+    "Diferença (superávit/déficit)": 'diferenca',
+    "Renda Mensal Sustentável": 'renda_sustentavel',
+}
+PARAMETROS_INTEIROS = ('idade_aposentadoria', 'expectativa_vida')
+
+
+def _anos_e_meses(meses):
+    """Período em meses por extenso: '3 anos e 4 meses'"""
+    anos, meses = divmod(int(round(meses)), 12)
+    partes = [f"{anos} {'ano' if anos == 1 else 'anos'}"] if anos else []
+    if meses or not partes:
+        partes.append(f"{meses} {'mês' if meses == 1 else 'meses'}")
+    return " e ".join(partes)
+
+
+@memorizar(tamanho_maximo=16)
+def _sensibilidade(parametros, nome_x, faixa_x, nome_y, faixa_y, pontos):
+    """Grade de dois parâmetros e a fronteira onde o patrimônio projetado iguala o necessário"""
+    eixos = []
+    for nome, (inicio, fim) in ((nome_x, faixa_x), (nome_y, faixa_y)):
+        valores = np.linspace(inicio, fim, pontos)
+        eixos.append(np.unique(np.round(valores)) if nome in PARAMETROS_INTEIROS else valores)
+    valores_x, valores_y = eixos
+    superficies = sensibilidade_aposentadoria(dict(parametros), nome_x, valores_x, nome_y, valores_y)
+    
+    # Fronteira: em cada coluna, primeira troca de sinal da diferença (interpolada entre as linhas)
+    diferenca = superficies['diferenca']
+    troca = (np.signbit(diferenca[:-1]) != np.signbit(diferenca[1:])) & np.isfinite(diferenca[:-1]) & np.isfinite(diferenca[1:])
+    colunas = np.flatnonzero(troca.any(axis=0))
+    linhas = troca[:, colunas].argmax(axis=0)
+    antes, depois = diferenca[linhas, colunas], diferenca[linhas + 1, colunas]
+    fronteira_y = valores_y[linhas] + (valores_y[linhas + 1] - valores_y[linhas]) * antes / (antes - depois)
+    
+    return valores_x, valores_y, superficies, (valores_x[colunas], fronteira_y)
+
+
+def calcular_aposentadoria():
+    """Calculadora de Planejamento de Aposentadoria"""
+    st.header("👴 Planejamento de Aposentadoria")
+    st.markdown("Calcule quanto você precisa acumular para se aposentar confortavelmente")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Situação Atual")
+        idade_atual = st.number_input("Idade Atual", min_value=18, max_value=80, value=30)
+        patrimonio_atual = st.number_input("Patrimônio Atual (R$)", min_value=0.0, value=50000.0, step=1000.0)
+        aporte_mensal = st.number_input("Aporte Mensal (R$)", min_value=0.0, value=1000.0, step=100.0)
+        
+    with col2:
+        st.subheader("Metas")
+        idade_aposentadoria = st.number_input("Idade de Aposentadoria Desejada", min_value=idade_atual+1, max_value=100, value=60)
+        renda_mensal_desejada = st.number_input("Renda Mensal Desejada (R$)", min_value=0.0, value=5000.0, step=500.0)
+        expectativa_vida = st.number_input("Expectativa de Vida", min_value=idade_aposentadoria+1, max_value=120, value=85)
+    
+    st.subheader("Parâmetros Econômicos")
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        taxa_acumulacao = st.number_input("Taxa de Retorno na Acumulação (%/ano)", min_value=0.0, value=8.0, step=0.1)
+    with col2:
+        taxa_aposentadoria = st.number_input("Taxa de Retorno Aposentado (%/ano)", min_value=0.0, value=5.0, step=0.1)
+    with col3:
+        taxa_inflacao = st.number_input("Inflação Estimada (%/ano)", min_value=0.0, value=4.0, step=0.1)
+    
+    marcar('renderizacao')
+    
+    # Cálculos
+    resultado = _simular_aposentadoria(
+        idade_atual, patrimonio_atual, aporte_mensal, idade_aposentadoria,
+        renda_mensal_desejada, expectativa_vida, taxa_acumulacao, taxa_aposentadoria
+    )
+    patrimonio_aposentadoria = resultado['patrimonio_aposentadoria']
+    patrimonio_necessario = resultado['patrimonio_necessario']
+    renda_sustentavel = resultado['renda_sustentavel']
+    df_evolucao = resultado['df_evolucao']
+    saldo_apos = resultado['saldo_apos']
+    marcar('calculo')
     
     # Métricas
     st.subheader("📊 Resultados da Simulação")
@@ -88,12 +190,6 @@ def calcular_aposentadoria():
         diferenca = patrimonio_aposentadoria - patrimonio_necessario
         st.metric("Diferença", f"R$ {diferenca:,.2f}", delta=f"{'✅ Suficiente' if diferenca >= 0 else '❌ Insuficiente'}")
     
-    # Calcular renda sustentável
-    if taxa_mensal_apos > 0:
-        renda_sustentavel = patrimonio_aposentadoria * (taxa_mensal_apos * (1 + taxa_mensal_apos) ** meses_aposentado) / ((1 + taxa_mensal_apos) ** meses_aposentado - 1)
-    else:
-        renda_sustentavel = patrimonio_aposentadoria / meses_aposentado
-    
     col1, col2 = st.columns(2)
     with col1:
         st.metric("Renda Mensal Sustentável", f"R$ {renda_sustentavel:,.2f}")
@@ -104,19 +200,13 @@ def calcular_aposentadoria():
         else:
             st.metric("Superávit Mensal", f"R$ {-deficit:,.2f}", delta="Sobra de recursos")
     
-    # Gráfico de acumulação
-    anos_lista = list(range(len(evolucao_patrimonio)))
-    df_evolucao = pd.DataFrame({
-        'Mês': anos_lista,
-        'Ano': [m/12 + idade_atual for m in anos_lista],
-        'Patrimônio': evolucao_patrimonio
-    })
+    marcar('renderizacao')
     
-    fig = go.Figure()
+    # Gráfico de acumulação
+    fig = figura('Evolução do Patrimônio até a Aposentadoria', 'Idade', 'Patrimônio (R$)')
     
-    fig.add_trace(go.Scatter(
-        x=df_evolucao['Ano'],
-        y=df_evolucao['Patrimônio'],
+    fig.add_trace(traco(
+        *reduzir(df_evolucao['Ano'], df_evolucao['Patrimônio']),
         fill='tozeroy',
         name='Patrimônio Acumulado',
         line=dict(color='#2ca02c', width=3)
@@ -124,65 +214,368 @@ def calcular_aposentadoria():
     
     fig.add_hline(y=patrimonio_necessario, line_dash="dash", line_color="red", 
                   annotation_text="Meta Necessária", annotation_position="right")
-    
-    fig.update_layout(
-        title='Evolução do Patrimônio até a Aposentadoria',
-        xaxis_title='Idade',
-        yaxis_title='Patrimônio (R$)',
-        height=500
-    )
+    marcar('graficos')
     
     st.plotly_chart(fig, use_container_width=True)
+    marcar('renderizacao')
     
     # Gráfico da aposentadoria
-    fig2 = go.Figure()
+    fig2 = figura('Evolução do Patrimônio Durante a Aposentadoria', 'Idade', 'Patrimônio (R$)')
     
-    anos_aposentado_lista = [idade_aposentadoria + m/12 for m in range(len(saldo_apos))]
+    anos_aposentado_lista = idade_aposentadoria + np.arange(len(saldo_apos)) / 12
     
-    fig2.add_trace(go.Scatter(
-        x=anos_aposentado_lista,
-        y=saldo_apos,
+    fig2.add_trace(traco(
+        *reduzir(anos_aposentado_lista, saldo_apos),
         fill='tozeroy',
         name='Saldo Durante Aposentadoria',
         line=dict(color='#ff7f0e', width=3)
     ))
-    
-    fig2.update_layout(
-        title='Evolução do Patrimônio Durante a Aposentadoria',
-        xaxis_title='Idade',
-        yaxis_title='Patrimônio (R$)',
-        height=500
-    )
+    marcar('graficos')
     
     st.plotly_chart(fig2, use_container_width=True)
+    marcar('renderizacao')
+    
+    formatos, ajuda = formatos_disponiveis()
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        formato = st.selectbox("Formato", formatos, help=ajuda, key="formato_evolucao_aposentadoria")
+    with col2:
+        st.download_button(
+            "⬇️ Baixar evolução do patrimônio",
+            _arquivo_evolucao(
+                formato, idade_atual, patrimonio_atual, aporte_mensal, idade_aposentadoria,
+                renda_mensal_desejada, expectativa_vida, taxa_acumulacao, taxa_aposentadoria
+            ),
+            file_name=f"evolucao_aposentadoria.{formato}", mime=FORMATOS[formato]
+        )
+    marcar('tabelas')
     
     # Sugestões
     st.subheader("💡 Recomendações")
     
+    marcar('renderizacao')
+    
+    # Cada variável resolvida exatamente para atingir a meta, com as demais fixas
+    metas = {chave: float(valor) for chave, valor in metas_aposentadoria(
+        idade_atual, patrimonio_atual, aporte_mensal, idade_aposentadoria,
+        renda_mensal_desejada, expectativa_vida, taxa_acumulacao, taxa_aposentadoria
+    ).items()}
+    idade_minima = metas['idade_minima']
+    meses_adiamento = (idade_minima - idade_aposentadoria) * 12
+    taxa_necessaria = metas['taxa_acumulacao_necessaria']
+    marcar('calculo')
+    
     if diferenca < 0:
-        # Calcular quanto precisa aportar a mais
-        if taxa_mensal_acum > 0:
-            aporte_necessario = (patrimonio_necessario - patrimonio_atual * (1 + taxa_mensal_acum) ** meses_acumulacao) / (((1 + taxa_mensal_acum) ** meses_acumulacao - 1) / taxa_mensal_acum)
-        else:
-            aporte_necessario = (patrimonio_necessario - patrimonio_atual) / meses_acumulacao
-        
+        aporte_necessario = metas['aporte_necessario']
         aporte_adicional = aporte_necessario - aporte_mensal
         
+        if np.isnan(idade_minima):
+            opcao_idade = "Adiar a aposentadoria não basta: a meta não é atingida nem às vésperas da expectativa de vida"
+        else:
+            opcao_idade = f"Trabalhar mais {_anos_e_meses(meses_adiamento)}, aposentando-se aos {_anos_e_meses(idade_minima * 12)}"
+        if np.isnan(taxa_necessaria):
+            opcao_taxa = "Buscar investimentos com maior rentabilidade"
+        else:
+            opcao_taxa = f"Obter rentabilidade de {taxa_necessaria:.2f}% ao ano na acumulação (hoje: {taxa_acumulacao:.2f}%)"
+        
         st.warning(f"""
         ⚠️ **Atenção!** Seu patrimônio projetado está abaixo da meta necessária.
         
-        **Opções para atingir sua meta:**
+        **Opções para atingir sua meta (cada uma isoladamente):**
         - Aumentar o aporte mensal em R$ {aporte_adicional:,.2f} (total: R$ {aporte_necessario:,.2f}/mês)
-        - Trabalhar {abs(diferenca) / (renda_sustentavel * 12):.1f} anos a mais
+        - {opcao_idade}
         - Reduzir a renda desejada para R$ {renda_sustentavel:,.2f}/mês
-        - Buscar investimentos com maior rentabilidade
+        - {opcao_taxa}
         """)
     else:
+        if np.isnan(taxa_necessaria):
+            opcao_taxa = "Atingir a meta mesmo com rentabilidade muito baixa na acumulação"
+        else:
+            opcao_taxa = f"Reduzir a rentabilidade exigida para {taxa_necessaria:.2f}% ao ano na acumulação"
+        
         st.success(f"""
         ✅ **Parabéns!** Você está no caminho certo para atingir sua meta de aposentadoria!
         
         Com o plano atual, você terá um excedente de R$ {diferenca:,.2f}, o que permite:
-        - Aposentar-se {(diferenca / (renda_mensal_desejada * 12)):.1f} anos mais cedo
+        - Aposentar-se {_anos_e_meses(-meses_adiamento)} mais cedo, aos {_anos_e_meses(idade_minima * 12)}
         - Aumentar sua renda mensal para R$ {renda_sustentavel:,.2f}
+        - {opcao_taxa}
         - Deixar uma herança de aproximadamente R$ {max(saldo_apos):,.2f}
-        """)
\ No newline at end of file
+        """)
+    
+    # Simulação estocástica
+    st.subheader("🎲 Simulação Monte Carlo")
+    simular = st.checkbox("Simular retornos e inflação aleatórios", help="Estima a probabilidade de o patrimônio durar até a expectativa de vida")
+    
+    if simular:
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            volatilidade_acumulacao = st.number_input("Volatilidade na Acumulação (%/ano)", min_value=0.0, value=15.0, step=0.5)
+            volatilidade_aposentadoria = st.number_input("Volatilidade Aposentado (%/ano)", min_value=0.0, value=8.0, step=0.5)
+        with col2:
+            volatilidade_inflacao = st.number_input("Volatilidade da Inflação (%/ano)", min_value=0.0, value=1.5, step=0.1)
+            n_caminhos = st.selectbox("Número de Simulações", [1000, 5000, 10000, 50000, 100000], index=2)
+        with col3:
+            semente = st.number_input("Semente", min_value=0, value=42, step=1, help="A mesma semente reproduz o mesmo resultado")
+            mostrar_caminhos = st.checkbox("Mostrar caminhos individuais",
+                                           help=f"Sobrepõe {CAMINHOS_EXIBIDOS} caminhos simulados às faixas de percentis")
+        marcar('renderizacao')
+        
+        resultado_mc = _simular_monte_carlo(
+            patrimonio_atual, aporte_mensal, renda_mensal_desejada,
+            idade_atual, idade_aposentadoria, expectativa_vida,
+            taxa_acumulacao, volatilidade_acumulacao,
+            taxa_aposentadoria, volatilidade_aposentadoria,
+            taxa_inflacao, volatilidade_inflacao,
+            n_caminhos=n_caminhos, semente=int(semente), guardar_caminhos=True
+        )
+        
+        idades_mc = resultado_mc['idades']
+        percentis = resultado_mc['percentis']
+        idades_ruina = resultado_mc['idades_ruina']
+        posicao_aposentadoria = idade_aposentadoria - idade_atual
+        marcar('calculo')
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Probabilidade de Sucesso", f"{resultado_mc['probabilidade_sucesso'] * 100:.1f}%")
+        with col2:
+            st.metric("Patrimônio Mediano na Aposentadoria", f"R$ {percentis[50][posicao_aposentadoria]:,.2f}")
+        with col3:
+            if len(idades_ruina):
+                st.metric("Idade Mediana de Esgotamento", f"{np.median(idades_ruina):.1f} anos")
+            else:
+                st.metric("Idade Mediana de Esgotamento", "—")
+        
+        marcar('renderizacao')
+        
+        # Faixas de percentis (valores de hoje)
+        fig3 = figura('Distribuição do Patrimônio (valores de hoje)', 'Idade', 'Patrimônio (R$)', hover_unificado=True)
+        idades_grafico, p5, p25, p50, p75, p95 = reduzir(
+            idades_mc, percentis[5], percentis[25], percentis[50], percentis[75], percentis[95]
+        )
+        
+        if mostrar_caminhos:
+            # Fatia do arquivo mapeado: só as linhas exibidas são lidas do disco
+            caminhos = resultado_mc['patrimonio_anual']
+            for caminho in caminhos[::max(1, len(caminhos) // CAMINHOS_EXIBIDOS)][:CAMINHOS_EXIBIDOS]:
+                fig3.add_trace(traco(
+                    idades_mc, caminho,
+                    line=dict(color='rgba(127, 127, 127, 0.3)', width=1), showlegend=False, hoverinfo='skip'
+                ))
+        
+        fig3.add_trace(traco(
+            idades_grafico, p95,
+            line=dict(width=0), showlegend=False, hoverinfo='skip'
+        ))
+        fig3.add_trace(traco(
+            idades_grafico, p5,
+            name='Percentis 5–95',
+            fill='tonexty',
+            fillcolor='rgba(31, 119, 180, 0.15)',
+            line=dict(width=0)
+        ))
+        fig3.add_trace(traco(
+            idades_grafico, p75,
+            line=dict(width=0), showlegend=False, hoverinfo='skip'
+        ))
+        fig3.add_trace(traco(
+            idades_grafico, p25,
+            name='Percentis 25–75',
+            fill='tonexty',
+            fillcolor='rgba(31, 119, 180, 0.35)',
+            line=dict(width=0)
+        ))
+        fig3.add_trace(traco(
+            idades_grafico, p50,
+            name='Mediana',
+            line=dict(color='#1f77b4', width=3)
+        ))
+        
+        fig3.add_vline(x=idade_aposentadoria, line_dash="dot", line_color="orange",
+                       annotation_text="Aposentadoria", annotation_position="top")
+        marcar('graficos')
+        
+        st.plotly_chart(fig3, use_container_width=True)
+        marcar('renderizacao')
+        
+        if len(idades_ruina):
+            # Contagem por ano feita aqui: envia ~50 barras em vez de uma idade por simulação
+            contagens, bordas = np.histogram(
+                idades_ruina, bins=np.arange(idade_aposentadoria, expectativa_vida + 1)
+            )
+            fig4 = figura('Idade de Esgotamento do Patrimônio (simulações que falharam)', 'Idade',
+                          'Número de Simulações', altura=400)
+            fig4.add_trace(go.Bar(
+                x=bordas[:-1] + 0.5,
+                y=contagens,
+                width=1,
+                marker_color='#d62728'
+            ))
+            marcar('graficos')
+            st.plotly_chart(fig4, use_container_width=True)
+        else:
+            st.success("Em nenhuma simulação o patrimônio se esgotou antes da expectativa de vida.")
+    
+    # Políticas de saque na fase de usufruto
+    st.subheader("🔁 Estratégias de Saque")
+    comparar = st.checkbox("Comparar políticas de saque na aposentadoria",
+                           help="Simula o usufruto a partir do patrimônio projetado com regras de saque que se ajustam ao mercado")
+    
+    if comparar:
+        politicas = st.multiselect("Políticas", list(POLITICAS_SAQUE), default=list(POLITICAS_SAQUE))
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            volatilidade_saques = st.number_input("Volatilidade Aposentado (%/ano)", min_value=0.0, value=8.0, step=0.5,
+                                                  key="volatilidade_saques")
+            volatilidade_inflacao_saques = st.number_input("Volatilidade da Inflação (%/ano)", min_value=0.0, value=1.5,
+                                                           step=0.1, key="volatilidade_inflacao_saques")
+        with col2:
+            retorno_vpw = st.number_input("Retorno Real da Tabela VPW (%/ano)", value=3.0, step=0.5,
+                                          help="O VPW saca a parcela que zeraria o patrimônio nos anos restantes a esse retorno")
+            limite_gk = st.number_input("Guardrail Guyton-Klinger (%)", min_value=1.0, value=20.0, step=5.0,
+                                        help="Desvio da taxa de saque em relação à inicial que dispara um corte ou aumento")
+            ajuste_gk = st.number_input("Ajuste Guyton-Klinger (%)", min_value=1.0, value=10.0, step=5.0)
+        with col3:
+            n_caminhos_saques = st.selectbox("Número de Simulações", [10000, 50000, 100000], index=1,
+                                             key="n_caminhos_saques")
+            semente_saques = st.number_input("Semente", min_value=0, value=42, step=1, key="semente_saques")
+        marcar('renderizacao')
+        
+        if not politicas:
+            st.info("Escolha ao menos uma política de saque")
+        elif patrimonio_aposentadoria <= 0:
+            st.warning("O patrimônio projetado na aposentadoria é zero; não há o que sacar")
+        else:
+            comparacao = _comparar_politicas_saque(
+                patrimonio_aposentadoria, renda_mensal_desejada, expectativa_vida - idade_aposentadoria,
+                taxa_aposentadoria, volatilidade_saques, taxa_inflacao, volatilidade_inflacao_saques,
+                politicas=tuple(politicas),
+                parametros={'retorno_vpw': retorno_vpw, 'limite_gk': limite_gk, 'ajuste_gk': ajuste_gk},
+                n_caminhos=n_caminhos_saques, semente=int(semente_saques)
+            )
+            marcar('calculo')
+            
+            st.caption(f"Saque inicial de R$ {renda_mensal_desejada:,.2f} por mês "
+                       f"({renda_mensal_desejada * 12 / patrimonio_aposentadoria * 100:.2f}% ao ano do patrimônio); "
+                       "valores a preços da data da aposentadoria")
+            df_politicas = pd.DataFrame([
+                {
+                    'Política': politica,
+                    'Sucesso': resultado_politica['probabilidade_sucesso'] * 100,
+                    'Saque Mensal Mediano': np.median(resultado_politica['saque_mensal'][50]),
+                    'Menor Saque Mensal (pior 5%)': resultado_politica['menor_saque_mensal'][5],
+                    'Total Sacado (mediana)': resultado_politica['saque_total'][50],
+                    'Patrimônio Final (mediana)': resultado_politica['patrimonio'][50][-1]
+                }
+                for politica, resultado_politica in comparacao.items()
+            ])
+            st.dataframe(df_politicas.style.format({
+                'Sucesso': '{:.1f}%',
+                'Saque Mensal Mediano': 'R$ {:,.2f}',
+                'Menor Saque Mensal (pior 5%)': 'R$ {:,.2f}',
+                'Total Sacado (mediana)': 'R$ {:,.2f}',
+                'Patrimônio Final (mediana)': 'R$ {:,.2f}'
+            }), hide_index=True, use_container_width=True)
+            marcar('tabelas')
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                fig_saques = figura('Saque Mensal Mediano (valores reais)', 'Idade', 'Saque (R$)', altura=400,
+                                    hover_unificado=True)
+                for i, (politica, resultado_politica) in enumerate(comparacao.items()):
+                    anos_saque = resultado_politica['anos'][:-1]
+                    fig_saques.add_trace(traco(idade_aposentadoria + anos_saque, resultado_politica['saque_mensal'][50],
+                                               name=politica, line=dict(color=CORES_POLITICAS[i % len(CORES_POLITICAS)])))
+                marcar('graficos')
+                st.plotly_chart(fig_saques, use_container_width=True)
+            with col2:
+                fig_patrimonio = figura('Patrimônio Mediano (valores reais)', 'Idade', 'Patrimônio (R$)', altura=400,
+                                        hover_unificado=True)
+                for i, (politica, resultado_politica) in enumerate(comparacao.items()):
+                    fig_patrimonio.add_trace(traco(idade_aposentadoria + resultado_politica['anos'],
+                                                   resultado_politica['patrimonio'][50], name=politica,
+                                                   line=dict(color=CORES_POLITICAS[i % len(CORES_POLITICAS)])))
+                marcar('graficos')
+                st.plotly_chart(fig_patrimonio, use_container_width=True)
+            marcar('renderizacao')
+            
+            detalhada = st.selectbox("Faixas de saque da política", list(comparacao))
+            resultado_politica = comparacao[detalhada]
+            fig_faixas = figura(f'Saque Mensal: {detalhada} (valores reais)', 'Idade', 'Saque (R$)', altura=400,
+                                hover_unificado=True)
+            faixas_percentis(fig_faixas, idade_aposentadoria + resultado_politica['anos'][:-1],
+                             resultado_politica['saque_mensal'])
+            marcar('graficos')
+            st.plotly_chart(fig_faixas, use_container_width=True)
+            marcar('renderizacao')
+    
+    # Sensibilidade a dois parâmetros
+    st.subheader("🗺️ Análise de Sensibilidade")
+    if st.checkbox("Mostrar mapa de sensibilidade", help="Recalcula o plano para cada combinação de dois parâmetros"):
+        valores_atuais = {
+            'idade_atual': idade_atual,
+            'patrimonio_atual': patrimonio_atual,
+            'aporte_mensal': aporte_mensal,
+            'idade_aposentadoria': idade_aposentadoria,
+            'renda_mensal_desejada': renda_mensal_desejada,
+            'expectativa_vida': expectativa_vida,
+            'taxa_acumulacao': taxa_acumulacao,
+            'taxa_aposentadoria': taxa_aposentadoria,
+        }
+        # Rótulo -> (parâmetro, faixa padrão em torno do plano atual)
+        parametros_grade = {
+            "Aporte Mensal (R$)": ('aporte_mensal', (0.0, max(3 * aporte_mensal, 1000.0))),
+            "Taxa de Retorno na Acumulação (%/ano)": ('taxa_acumulacao', (0.0, max(2 * taxa_acumulacao, 15.0))),
+            "Taxa de Retorno Aposentado (%/ano)": ('taxa_aposentadoria', (0.0, max(2 * taxa_aposentadoria, 10.0))),
+            "Idade de Aposentadoria": ('idade_aposentadoria', (idade_atual + 1, expectativa_vida - 1)),
+            "Renda Mensal Desejada (R$)": ('renda_mensal_desejada', (renda_mensal_desejada / 4, max(2 * renda_mensal_desejada, 1000.0))),
+            "Patrimônio Atual (R$)": ('patrimonio_atual', (0.0, max(3 * patrimonio_atual, 100000.0))),
+            "Expectativa de Vida": ('expectativa_vida', (idade_aposentadoria + 1, 110)),
+        }
+        rotulos = list(parametros_grade)
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            rotulo_x = st.selectbox("Eixo X", rotulos, index=0)
+        with col2:
+            rotulo_y = st.selectbox("Eixo Y", rotulos, index=1)
+        with col3:
+            pontos = st.slider("Resolução (pontos por eixo)", min_value=10, max_value=100, value=50)
+        metrica = st.radio("Métrica", list(METRICAS_SENSIBILIDADE), horizontal=True, key="metrica_sensibilidade")
+        
+        if rotulo_x == rotulo_y:
+            st.warning("Escolha dois parâmetros diferentes para os eixos")
+        else:
+            nome_x, faixa_x = parametros_grade[rotulo_x]
+            nome_y, faixa_y = parametros_grade[rotulo_y]
+            marcar('renderizacao')
+            valores_x, valores_y, superficies, fronteira = _sensibilidade(
+                valores_atuais, nome_x, faixa_x, nome_y, faixa_y, pontos
+            )
+            marcar('calculo')
+            
+            chave = METRICAS_SENSIBILIDADE[metrica]
+            escala = dict(colorscale='RdBu', zmid=0) if chave == 'diferenca' else dict(colorscale='Viridis')
+            fig5 = figura(f'{metrica} por {rotulo_x} e {rotulo_y}', rotulo_x, rotulo_y, altura=550)
+            fig5.add_trace(mapa_calor(
+                valores_x, valores_y, superficies[chave],
+                hovertemplate=f'{rotulo_x}: %{{x:,.2f}}<br>{rotulo_y}: %{{y:,.2f}}<br>R$ %{{z:,.2f}}<extra></extra>',
+                **escala
+            ))
+            fig5.add_trace(traco(
+                *fronteira,
+                mode='lines', name='Meta atingida (diferença = 0)',
+                line=dict(color='black', width=2, dash='dash')
+            ))
+            fig5.add_trace(traco(
+                [valores_atuais[nome_x]], [valores_atuais[nome_y]],
+                mode='markers', name='Plano atual',
+                marker=dict(color='orange', size=12, symbol='x')
+            ))
+            fig5.update_layout(legend=dict(orientation='h', y=-0.2))
+            marcar('graficos')
+            
+            st.plotly_chart(fig5, use_container_width=True)
+            st.caption("A linha tracejada separa as combinações em que o patrimônio projetado cobre a renda desejada até a expectativa de vida (diferença positiva) das que não cobrem.")
\ No newline at end of file
@@ -0,0 +1,220 @@
+import functools
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from .cache import normalizar
+
+
+DIRETORIO_PADRAO = Path(
+    os.environ.get("CALCULADORA_ARMAZENAMENTO_DIR") or Path.home() / ".cache" / "calculadora_financeira"
+)
+LIMITE_PADRAO_MB = 1024.0
+IDADE_TEMPORARIOS = 3600  # segundos; gravações interrompidas mais antigas que isso são apagadas
+_METADADOS = 'resultado.json'
+
+
+def limite_configurado_mb():
+    """Limite em MB de `CALCULADORA_ARMAZENAMENTO_MB`, ou `LIMITE_PADRAO_MB` se a variável faltar ou for inválida"""
+    try:
+        return float(os.environ.get("CALCULADORA_ARMAZENAMENTO_MB", LIMITE_PADRAO_MB))
+    except ValueError:
+        return LIMITE_PADRAO_MB
+
+
+def chave_entrada(*partes):
+    """Hash SHA-256 estável das entradas, normalizadas como as chaves de `memorizar`"""
+    return hashlib.sha256(repr(normalizar(partes)).encode('utf-8')).hexdigest()
+
+
+def _achatar(valor, caminho=()):
+    """Percorre dicionários aninhados produzindo (caminho de chaves, valor folha)"""
+    if isinstance(valor, dict):
+        for chave, item in valor.items():
+            yield from _achatar(item, caminho + (chave,))
+    else:
+        yield caminho, valor
+
+
+def _montar(folhas):
+    """Inverso de `_achatar`: reconstrói os dicionários a partir de (caminho, valor)"""
+    raiz = {}
+    for caminho, valor in folhas:
+        if not caminho:
+            return valor
+        destino = raiz
+        for chave in caminho[:-1]:
+            destino = destino.setdefault(chave, {})
+        destino[caminho[-1]] = valor
+    return raiz
+
+
+class ArmazenamentoResultados:
+    """Resultados de simulações em disco, um diretório de arquivos .npy por chave.
+
+    Cada array do resultado vira um .npy lido de volta com `mmap_mode='r'`:
+    leituras, fatias para gráficos e exportações acessam o arquivo sem copiá-lo
+    para a memória. Escalares e textos ficam no JSON de metadados. Quando o
+    total passa de `limite_mb`, as entradas usadas há mais tempo são apagadas.
+    """
+
+    def __init__(self, diretorio=None, limite_mb=None):
+        self.diretorio = Path(diretorio or DIRETORIO_PADRAO)
+        self.limite_bytes = int((limite_mb if limite_mb is not None else limite_configurado_mb()) * 2 ** 20)
+        self._trava = threading.Lock()
+
+    def _entrada(self, chave):
+        return self.diretorio / chave
+
+    def obter(self, chave):
+        """Resultado gravado sob `chave` (arrays mapeados em memória) ou None"""
+        entrada = self._entrada(chave)
+        try:
+            metadados = json.loads((entrada / _METADADOS).read_text(encoding='utf-8'))
+            folhas = [
+                (tuple(caminho), np.load(entrada / arquivo, mmap_mode='r') if arquivo else valor)
+                for caminho, arquivo, valor in metadados['folhas']
+            ]
+            # O horário de modificação marca o último uso, usado no descarte
+            os.utime(entrada)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return _montar(folhas)
+
+    def gravar(self, chave, resultado):
+        """Grava `resultado` (array, escalar ou dicionários aninhados deles) e devolve a versão mapeada"""
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        temporario = self.diretorio / f".{chave}.{os.getpid()}.{threading.get_ident()}.tmp"
+        temporario.mkdir()
+        try:
+            folhas = []
+            for indice, (caminho, valor) in enumerate(_achatar(resultado)):
+                if isinstance(valor, np.ndarray):
+                    if valor.dtype.hasobject:
+                        raise TypeError(f"Array de objetos não pode ser mapeado em memória: {caminho}")
+                    arquivo = f"{indice}.npy"
+                    np.save(temporario / arquivo, valor, allow_pickle=False)
+                    folhas.append((list(caminho), arquivo, None))
+                else:
+                    folhas.append((list(caminho), None, valor.item() if isinstance(valor, np.generic) else valor))
+            (temporario / _METADADOS).write_text(
+                json.dumps({'criado': time.time(), 'folhas': folhas}, ensure_ascii=False), encoding='utf-8'
+            )
+            try:
+                os.replace(temporario, self._entrada(chave))
+            except OSError:
+                # Outro processo gravou a mesma chave primeiro; o conteúdo é o mesmo
+                shutil.rmtree(temporario, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(temporario, ignore_errors=True)
+            raise
+        self.descartar_excedente()
+        gravado = self.obter(chave)
+        # Um resultado maior que o limite é descartado logo após gravado
+        return resultado if gravado is None else gravado
+
+    def entradas(self):
+        """Lista de (chave, bytes, último uso) das entradas gravadas"""
+        if not self.diretorio.exists():
+            return []
+        resultado = []
+        for entrada in self.diretorio.iterdir():
+            if entrada.name.startswith('.') or not entrada.is_dir():
+                continue
+            try:
+                tamanho = sum(arquivo.stat().st_size for arquivo in entrada.iterdir())
+                resultado.append((entrada.name, tamanho, entrada.stat().st_mtime))
+            except FileNotFoundError:
+                continue
+        return resultado
+
+    def tamanho(self):
+        """Total em bytes ocupado pelas entradas"""
+        return sum(tamanho for _, tamanho, _ in self.entradas())
+
+    def remover(self, chave):
+        shutil.rmtree(self._entrada(chave), ignore_errors=True)
+
+    def descartar_excedente(self):
+        """Apaga as entradas usadas há mais tempo até o total caber no limite; devolve quantas apagou"""
+        with self._trava:
+            for temporario in self.diretorio.glob('.*.tmp'):
+                try:
+                    if time.time() - temporario.stat().st_mtime > IDADE_TEMPORARIOS:
+                        shutil.rmtree(temporario, ignore_errors=True)
+                except FileNotFoundError:
+                    continue
+            entradas = sorted(self.entradas(), key=lambda entrada: entrada[2])
+            total = sum(tamanho for _, tamanho, _ in entradas)
+            descartadas = 0
+            for chave, tamanho, _ in entradas:
+                if total <= self.limite_bytes:
+                    break
+                self.remover(chave)
+                total -= tamanho
+                descartadas += 1
+            return descartadas
+
+    def limpar(self):
+        """Apaga todas as entradas"""
+        for chave, _, _ in self.entradas():
+            self.remover(chave)
+
+    def estatisticas(self):
+        entradas = self.entradas()
+        return {
+            'entradas': len(entradas),
+            'bytes': sum(tamanho for _, tamanho, _ in entradas),
+            'limite_bytes': self.limite_bytes,
+            'diretorio': str(self.diretorio),
+        }
+
+
+_padrao = None
+
+
+def armazenamento_padrao():
+    """Armazenamento compartilhado em `CALCULADORA_ARMAZENAMENTO_DIR` com limite `CALCULADORA_ARMAZENAMENTO_MB`"""
+    global _padrao
+    if _padrao is None:
+        _padrao = ArmazenamentoResultados()
+    return _padrao
+
+
+def persistir(armazenamento=None, versao=1, semente='semente'):
+    """Decorador que grava o resultado da função em disco, indexado pelo hash das entradas.
+
+    Chamadas repetidas, inclusive em outro processo ou após reiniciar a
+    aplicação, leem o resultado mapeado em memória em vez de recalcular.
+    Aumente `versao` quando a função mudar de forma incompatível com os
+    resultados já gravados. Se a função tem o parâmetro `semente` e ele vem
+    None, o resultado é aleatório e a chamada não passa pelo disco.
+    """
+    def decorador(funcao):
+        nome = f"{funcao.__module__}.{funcao.__qualname__}"
+        assinatura = inspect.signature(funcao)
+
+        @functools.wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            # Argumentos nomeados, com os padrões: f(1, semente=2) e f(1, 2) têm a mesma chave
+            argumentos = assinatura.bind(*args, **kwargs)
+            argumentos.apply_defaults()
+            if semente in argumentos.arguments and argumentos.arguments[semente] is None:
+                return funcao(*args, **kwargs)
+            destino = armazenamento or armazenamento_padrao()
+            chave = chave_entrada(nome, versao, dict(argumentos.arguments))
+            resultado = destino.obter(chave)
+            if resultado is None:
+                resultado = destino.gravar(chave, funcao(*args, **kwargs))
+            return resultado
+
+        return envoltorio
+
+    return decorador
\ No newline at end of file
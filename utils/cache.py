@@ -0,0 +1,111 @@
+import functools
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+TAMANHO_PADRAO = int(os.environ.get("CALCULADORA_CACHE_TAMANHO", 64))
+TTL_PADRAO = float(os.environ.get("CALCULADORA_CACHE_TTL", 0)) or None  # segundos; 0 = sem expiração
+
+_caches = {}
+
+
+def normalizar(valor):
+    """Converte um valor em uma chave hashable e estável.
+
+    Escalares NumPy viram tipos Python, inteiros e floats iguais geram a mesma
+    chave, listas/tuplas/dicionários são percorridos e arrays são representados
+    por formato, dtype e conteúdo.
+    """
+    if isinstance(valor, np.ndarray):
+        return ('ndarray', valor.shape, valor.dtype.str, valor.tobytes())
+    if isinstance(valor, np.generic):
+        valor = valor.item()
+    if isinstance(valor, bool) or valor is None or isinstance(valor, str):
+        return valor
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    if isinstance(valor, dict):
+        return tuple(sorted((chave, normalizar(v)) for chave, v in valor.items()))
+    if isinstance(valor, (list, tuple)):
+        return tuple(normalizar(v) for v in valor)
+    return valor
+
+
+def memorizar(tamanho_maximo=None, ttl=None):
+    """Decorador de cache LRU com limite de entradas e expiração opcional.
+
+    As chaves são os argumentos normalizados por `normalizar`. Entradas além
+    de `tamanho_maximo` são descartadas da menos usada para a mais usada, e
+    entradas mais antigas que `ttl` segundos são recalculadas. A função
+    decorada ganha `estatisticas()` e `limpar()`.
+    """
+    tamanho_maximo = tamanho_maximo or TAMANHO_PADRAO
+    ttl = ttl if ttl is not None else TTL_PADRAO
+
+    def decorador(funcao):
+        entradas = OrderedDict()
+        contadores = {'acertos': 0, 'faltas': 0, 'descartes': 0}
+        trava = threading.Lock()
+
+        @functools.wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            chave = (normalizar(args), normalizar(kwargs))
+            agora = time.monotonic()
+
+            with trava:
+                if chave in entradas:
+                    instante, resultado = entradas[chave]
+                    if ttl is None or agora - instante <= ttl:
+                        entradas.move_to_end(chave)
+                        contadores['acertos'] += 1
+                        return resultado
+                    del entradas[chave]
+                    contadores['descartes'] += 1
+                contadores['faltas'] += 1
+
+            resultado = funcao(*args, **kwargs)
+
+            with trava:
+                entradas[chave] = (agora, resultado)
+                entradas.move_to_end(chave)
+                while len(entradas) > tamanho_maximo:
+                    entradas.popitem(last=False)
+                    contadores['descartes'] += 1
+            return resultado
+
+        def estatisticas():
+            with trava:
+                return {
+                    **contadores,
+                    'entradas': len(entradas),
+                    'tamanho_maximo': tamanho_maximo,
+                    'ttl': ttl,
+                }
+
+        def limpar():
+            with trava:
+                entradas.clear()
+                for nome in contadores:
+                    contadores[nome] = 0
+
+        envoltorio.estatisticas = estatisticas
+        envoltorio.limpar = limpar
+        _caches[f"{funcao.__module__}.{funcao.__qualname__}"] = envoltorio
+        return envoltorio
+
+    return decorador
+
+
+def estatisticas_cache():
+    """Estatísticas de todos os caches registrados, por função"""
+    return {nome: funcao.estatisticas() for nome, funcao in _caches.items()}
+
+
+def limpar_caches():
+    """Esvazia todos os caches registrados"""
+    for funcao in _caches.values():
+        funcao.limpar()
\ No newline at end of file
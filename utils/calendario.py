@@ -0,0 +1,119 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .cache import memorizar
+
+
+DIRETORIO_DADOS = Path(os.environ.get("CALCULADORA_DADOS_DIR") or Path(__file__).resolve().parent.parent / "dados")
+ARQUIVO_FERIADOS = "feriados.csv"  # feriados adicionais (estaduais, municipais, pontes), uma data por linha
+DIAS_UTEIS_ANO = 252
+
+# (mês, dia, primeiro ano em vigor)
+FERIADOS_FIXOS = (
+    (1, 1, None),     # Confraternização Universal
+    (4, 21, None),    # Tiradentes
+    (5, 1, None),     # Dia do Trabalho
+    (9, 7, None),     # Independência
+    (10, 12, None),   # Nossa Senhora Aparecida
+    (11, 2, None),    # Finados
+    (11, 15, None),   # Proclamação da República
+    (11, 20, 2024),   # Dia Nacional de Zumbi e da Consciência Negra (Lei 14.759/2023)
+    (12, 25, None),   # Natal
+)
+# Dias em relação ao domingo de Páscoa
+FERIADOS_MOVEIS = (
+    -48,  # Carnaval (segunda-feira)
+    -47,  # Carnaval (terça-feira)
+    -2,   # Sexta-feira Santa
+    60,   # Corpus Christi
+)
+
+
+def pascoa(anos):
+    """Domingo de Páscoa de cada ano (calendário gregoriano, algoritmo de Meeus/Jones/Butcher)"""
+    a = np.asarray(anos, dtype=np.int64)
+    g, s, t = a % 19, a // 100, a % 100
+    e = (19 * g + s - s // 4 - (s - (s + 8) // 25 + 1) // 3 + 15) % 30
+    f = (32 + 2 * (s % 4) + 2 * (t // 4) - e - t % 4) % 7
+    m = (g + 11 * e + 22 * f) // 451
+    mes = (e + f - 7 * m + 114) // 31
+    dia = (e + f - 7 * m + 114) % 31 + 1
+    return _data(a, mes, dia)
+
+
+def _data(ano, mes, dia):
+    """Datas datetime64[D] a partir de arrays de ano, mês e dia"""
+    meses = (np.asarray(ano) - 1970) * 12 + np.asarray(mes) - 1
+    return meses.astype('datetime64[M]').astype('datetime64[D]') + (np.asarray(dia) - 1)
+
+
+def feriados_nacionais(ano_inicial, ano_final):
+    """Feriados nacionais que fecham o mercado (calendário da B3/ANBIMA) entre os anos, ordenados"""
+    anos = np.arange(int(ano_inicial), int(ano_final) + 1)
+    datas = [
+        _data(anos[anos >= (desde or anos[0])], mes, dia)
+        for mes, dia, desde in FERIADOS_FIXOS
+    ]
+    domingos = pascoa(anos)
+    datas += [domingos + deslocamento for deslocamento in FERIADOS_MOVEIS]
+    return np.unique(np.concatenate(datas))
+
+
+def carregar_feriados(caminho=None):
+    """Datas do arquivo de feriados adicionais (primeira coluna), ou vazio se ele não existir"""
+    caminho = Path(caminho) if caminho else DIRETORIO_DADOS / ARQUIVO_FERIADOS
+    if not caminho.exists():
+        return np.array([], dtype='datetime64[D]')
+    valores = pd.read_csv(caminho, sep=r'[;,]', engine='python', header=None, usecols=[0], dtype=str).iloc[:, 0]
+    datas = converter_datas(valores)
+    return np.unique(datas[~np.isnat(datas)])
+
+
+def converter_datas(valores):
+    """Converte textos 'AAAA-MM-DD' ou 'DD/MM/AAAA' em datetime64[D]; os inválidos (cabeçalhos) viram NaT"""
+    valores = pd.Series(valores, dtype=str).str.strip()
+    formato = '%d/%m/%Y' if valores.str.contains('/').any() else '%Y-%m-%d'
+    return pd.to_datetime(valores, format=formato, errors='coerce').to_numpy().astype('datetime64[D]')
+
+
+@memorizar(tamanho_maximo=16)
+def calendario(ano_inicial, ano_final, arquivo_feriados=None):
+    """`np.busdaycalendar` de segunda a sexta sem os feriados nacionais e os do arquivo local"""
+    feriados = np.union1d(feriados_nacionais(ano_inicial, ano_final), carregar_feriados(arquivo_feriados))
+    return np.busdaycalendar(weekmask='1111100', holidays=feriados)
+
+
+def calendario_periodo(inicio, fim, arquivo_feriados=None):
+    """`calendario` dos anos que cobrem as datas de `inicio` a `fim`"""
+    ano_inicial, ano_final = (int(str(np.datetime64(data, 'Y'))) for data in (inicio, fim))
+    return calendario(ano_inicial, ano_final, arquivo_feriados)
+
+
+def dias_uteis(inicio, fim, calendario_uteis=None):
+    """Dias úteis no intervalo [inicio, fim), como datetime64[D]"""
+    inicio, fim = np.datetime64(inicio, 'D'), np.datetime64(fim, 'D')
+    if calendario_uteis is None:
+        calendario_uteis = calendario_periodo(inicio, fim)
+    datas = np.arange(inicio, max(inicio, fim), dtype='datetime64[D]')
+    return datas[np.is_busday(datas, busdaycal=calendario_uteis)]
+
+
+def contar_dias_uteis(inicio, fim, calendario_uteis=None):
+    """Número de dias úteis em [inicio, fim); aceita arrays de datas (broadcasting)"""
+    inicio = np.asarray(inicio, dtype='datetime64[D]')
+    fim = np.asarray(fim, dtype='datetime64[D]')
+    if calendario_uteis is None:
+        calendario_uteis = calendario_periodo(inicio.min(), fim.max())
+    return np.busday_count(inicio, fim, busdaycal=calendario_uteis)
+
+
+def somar_meses(data, meses):
+    """`data` deslocada de `meses` meses, limitada ao último dia do mês de destino (31/01 + 1 = 28/02 ou 29/02)"""
+    data = np.datetime64(data, 'D')
+    destino = np.datetime64(data, 'M') + np.asarray(meses)
+    dia = (data - np.datetime64(data, 'M').astype('datetime64[D]')).astype(int)
+    ultimo_dia = (destino + 1).astype('datetime64[D]') - 1
+    return np.minimum(destino.astype('datetime64[D]') + dia, ultimo_dia)
\ No newline at end of file
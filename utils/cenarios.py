@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+
+from .motor_aposentadoria import idade_minima_aposentadoria, resumir_aposentadoria, taxa_acumulacao_necessaria
+from .motor_cet import custo_efetivo_total
+from .motor_emprestimos import SISTEMA_PRICE, resumir_carteira
+from .motor_fire import MAX_MESES, meses_ate_meta_corrigida
+from .motor_juros import resumir_juros_compostos, taxa_mensal_equivalente
+
+
+# Colunas esperadas por tipo de cenário; None = obrigatória, caso contrário valor padrão
+COLUNAS = {
+    'juros': {
+        'valor_inicial': None,
+        'aporte_mensal': 0.0,
+        'taxa_juros': None,
+        'anos': None,
+        'tipo_aporte': "Início do mês",
+        'taxa_inflacao': 0.0,
+    },
+    'emprestimo': {
+        'valor_emprestimo': None,
+        'entrada': 0.0,
+        'taxa_juros_anual': None,
+        'prazo_anos': None,
+        'sistema': SISTEMA_PRICE,
+    },
+    'cet': {
+        'valor_emprestimo': None,
+        'entrada': 0.0,
+        'taxa_juros_anual': None,
+        'prazo_anos': None,
+        'sistema': SISTEMA_PRICE,
+        'tac': 0.0,
+        'iof': True,
+        'seguro_mip': 0.0,
+        'seguro_dfi': 0.0,
+        'tarifa_mensal': 0.0,
+        'financiar_tarifas': True,
+    },
+    'aposentadoria': {
+        'idade_atual': None,
+        'patrimonio_atual': 0.0,
+        'aporte_mensal': 0.0,
+        'idade_aposentadoria': None,
+        'renda_mensal_desejada': None,
+        'expectativa_vida': None,
+        'taxa_acumulacao': None,
+        'taxa_aposentadoria': None,
+    },
+    'fire': {
+        'renda_mensal_liquida': None,
+        'despesas_mensais': None,
+        'patrimonio_atual': 0.0,
+        'idade_atual': None,
+        'taxa_retorno': None,
+        'taxa_saque': 4.0,
+        'despesas_fire': None,  # padrão: despesas_mensais
+        'taxa_inflacao': 0.0,
+    },
+}
+
+
+def preparar_colunas(tipo, df):
+    """Valida as colunas do lote e preenche as opcionais com o valor padrão"""
+    colunas = COLUNAS[tipo]
+    faltando = [nome for nome, padrao in colunas.items() if padrao is None and nome not in df.columns]
+    if tipo == 'fire' and 'despesas_fire' in faltando:
+        faltando.remove('despesas_fire')
+    if faltando:
+        raise ValueError(f"Colunas obrigatórias ausentes para '{tipo}': {', '.join(faltando)}")
+
+    parametros = {}
+    for nome, padrao in colunas.items():
+        if nome in df.columns:
+            parametros[nome] = df[nome].to_numpy()
+        elif padrao is not None:
+            parametros[nome] = np.full(len(df), padrao, dtype=object if isinstance(padrao, str) else float)
+    if tipo == 'fire' and 'despesas_fire' not in parametros:
+        parametros['despesas_fire'] = parametros['despesas_mensais']
+    return parametros
+
+
+def calcular_cenarios_juros(df):
+    """Valores finais de cada cenário de juros compostos"""
+    p = preparar_colunas('juros', df)
+    resultado = resumir_juros_compostos(
+        p['valor_inicial'], p['aporte_mensal'], p['taxa_juros'], p['anos'] * 12,
+        p['tipo_aporte'].astype(str), p['taxa_inflacao']
+    )
+    return pd.DataFrame({
+        'valor_final': resultado['saldo'],
+        'total_investido': resultado['investido'],
+        'juros_ganhos': resultado['juros'],
+        'valor_final_real': resultado['saldo_real'],
+    }, index=df.index)
+
+
+def calcular_cenarios_emprestimo(df):
+    """Primeira/última parcela e totais de cada empréstimo"""
+    p = preparar_colunas('emprestimo', df)
+    resultado = resumir_carteira(
+        p['valor_emprestimo'], p['entrada'], p['taxa_juros_anual'], p['prazo_anos'], p['sistema'].astype(str)
+    )
+    return pd.DataFrame({
+        'primeira_parcela': resultado['Primeira Parcela'],
+        'ultima_parcela': resultado['Última Parcela'],
+        'total_pago': resultado['Total Pago'],
+        'total_juros': resultado['Total Juros'],
+    }, index=df.index)
+
+
+def calcular_cenarios_cet(df):
+    """Custo Efetivo Total de cada oferta de empréstimo, com tarifas, IOF e seguros"""
+    p = preparar_colunas('cet', df)
+    resultado = custo_efetivo_total(
+        p['valor_emprestimo'], p['entrada'], p['taxa_juros_anual'], p['prazo_anos'], p['sistema'].astype(str),
+        tac=p['tac'], iof=p['iof'].astype(bool), seguro_mip=p['seguro_mip'], seguro_dfi=p['seguro_dfi'],
+        tarifa_mensal=p['tarifa_mensal'], financiar_tarifas=p['financiar_tarifas'].astype(bool)
+    )
+    return pd.DataFrame({
+        'cet_mensal': resultado['CET Mensal'],
+        'cet_anual': resultado['CET Anual'],
+        'valor_iof': resultado['IOF'],
+        'valor_liberado': resultado['Valor Liberado'],
+        'primeira_prestacao': resultado['Primeira Prestação'],
+        'total_pago': resultado['Total Pago'],
+    }, index=df.index)
+
+
+def calcular_cenarios_aposentadoria(df):
+    """Patrimônio projetado, necessário, renda sustentável e metas exatas de cada plano"""
+    p = preparar_colunas('aposentadoria', df)
+    resultado = resumir_aposentadoria(
+        p['idade_atual'], p['patrimonio_atual'], p['aporte_mensal'], p['idade_aposentadoria'],
+        p['renda_mensal_desejada'], p['expectativa_vida'], p['taxa_acumulacao'], p['taxa_aposentadoria']
+    )
+    resultado['idade_minima_aposentadoria'] = idade_minima_aposentadoria(
+        p['idade_atual'], p['patrimonio_atual'], p['aporte_mensal'], p['renda_mensal_desejada'],
+        p['expectativa_vida'], p['taxa_acumulacao'], p['taxa_aposentadoria']
+    )
+    resultado['taxa_acumulacao_necessaria'] = taxa_acumulacao_necessaria(
+        p['idade_atual'], p['patrimonio_atual'], p['aporte_mensal'], p['idade_aposentadoria'],
+        p['renda_mensal_desejada'], p['expectativa_vida'], p['taxa_aposentadoria']
+    )
+    return pd.DataFrame(resultado, index=df.index)
+
+
+def calcular_cenarios_fire(df):
+    """Número FI/RE e tempo até a independência financeira de cada cenário"""
+    p = preparar_colunas('fire', df)
+    renda = p['renda_mensal_liquida'].astype(float)
+    poupanca_mensal = renda - p['despesas_mensais']
+    numero_fire = p['despesas_fire'] * 12 / (p['taxa_saque'] / 100)
+    meses_fire = meses_ate_meta_corrigida(
+        p['patrimonio_atual'], poupanca_mensal, taxa_mensal_equivalente(p['taxa_retorno']),
+        numero_fire, p['taxa_inflacao'], MAX_MESES
+    )
+    return pd.DataFrame({
+        'poupanca_mensal': poupanca_mensal,
+        'taxa_poupanca': np.divide(poupanca_mensal * 100, renda, out=np.zeros_like(renda), where=renda > 0),
+        'numero_fire': numero_fire,
+        'meses_fire': meses_fire,
+        'idade_fire': p['idade_atual'] + meses_fire / 12,
+    }, index=df.index)
+
+
+CALCULADORAS = {
+    'juros': calcular_cenarios_juros,
+    'emprestimo': calcular_cenarios_emprestimo,
+    'cet': calcular_cenarios_cet,
+    'aposentadoria': calcular_cenarios_aposentadoria,
+    'fire': calcular_cenarios_fire,
+}
+
+
+def calcular_cenarios(tipo, df):
+    """Calcula um lote de cenários do `tipo` indicado e devolve entrada + resultados"""
+    if tipo not in CALCULADORAS:
+        raise ValueError(f"Tipo de cenário desconhecido: '{tipo}'. Use um de: {', '.join(CALCULADORAS)}")
+    return pd.concat([df, CALCULADORAS[tipo](df)], axis=1)
\ No newline at end of file
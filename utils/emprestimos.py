@@ -1,6 +1,157 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
+
+from .cache import memorizar
+from .exportacao import FORMATOS, exportar_bytes, formatos_disponiveis
+from .graficos import faixas_percentis, figura, mapa_calor, reduzir, traco
+from .instrumentacao import marcar
+from .motor_centavos import MODOS_ARREDONDAMENTO, amortizar_carteira_centavos
+from .motor_cdi import carregar_serie, versao_serie
+from .motor_cet import custo_efetivo_total
+from .motor_indexado import (
+    INDEXADOR_IPCA, INDEXADOR_TR, INDEXADORES, faixas_indexado, gerar_indices, reamostrar_indices, variacoes_mensais
+)
+from .motor_emprestimos import (
+    REDUZIR_PARCELA,
+    REDUZIR_PRAZO,
+    SISTEMA_PRICE,
+    SISTEMA_SAC,
+    amortizar_carteira,
+    amortizar_com_eventos,
+    comparar_estrategias,
+    grade_carteira,
+)
+
+
+@memorizar()
+def _tabela_parcelas(valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema, arredondamento=None):
+    """Núcleo numérico da calculadora: tabela de parcelas PRICE/SAC.
+    
+    Com `arredondamento` (um de `MODOS_ARREDONDAMENTO`), a tabela é gerada em
+    centavos exatos e o resíduo da parcela final fica em `df.attrs['residuo']`.
+    """
+    if arredondamento is None:
+        tabela = amortizar_carteira(valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema)
+        escala = 1
+    else:
+        tabela = amortizar_carteira_centavos(
+            valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema, arredondamento
+        )
+        escala = 100
+    num_parcelas = int(tabela['num_parcelas'][0])
+    marcar('calculo')
+    
+    df = pd.DataFrame({
+        'Parcela': np.arange(1, num_parcelas + 1),
+        'Valor Parcela': tabela['Valor Parcela'][0, :num_parcelas] / escala,
+        'Juros': tabela['Juros'][0, :num_parcelas] / escala,
+        'Amortização': tabela['Amortização'][0, :num_parcelas] / escala,
+        'Saldo Devedor': tabela['Saldo Devedor'][0, :num_parcelas] / escala
+    })
+    if arredondamento is not None:
+        df.attrs['residuo'] = int(tabela['Resíduo'][0]) / escala
+    marcar('tabelas')
+    return df
+
+
+@memorizar(tamanho_maximo=8)
+def _arquivo_parcelas(formato, *argumentos):
+    """Tabela completa de `_tabela_parcelas(*argumentos)` exportada em `formato`"""
+    return exportar_bytes(_tabela_parcelas(*argumentos), formato)
+
+
+# Indexador -> (média % a.a., volatilidade p.p. a.a., piso % a.a.) sugeridos para a simulação
+PREMISSAS_INDEXADOR = {
+    INDEXADOR_TR: (1.0, 1.0, 0.0),
+    INDEXADOR_IPCA: (4.0, 2.0, None),
+}
+FONTE_SIMULADA = "Simulação com reversão à média"
+FONTE_HISTORICA = "Histórico reamostrado"
+ESTRATEGIA_INFORMADA = "Como informado"
+
+
+@memorizar(tamanho_maximo=8)
+def _simular_indexado(valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema,
+                      indexador, fonte, media_anual, volatilidade_anual, n_cenarios, semente, versao_historico=None):
+    """Faixas de percentis de parcelas, saldo e totais sobre `n_cenarios` trajetórias do indexador.
+
+    `versao_historico` (de `versao_serie`) só entra na chave do cache, para
+    recalcular quando a série local do indexador muda.
+    """
+    rng = np.random.default_rng(semente)
+    meses = prazo_anos * 12
+    if fonte == FONTE_HISTORICA:
+        indices = reamostrar_indices(rng, variacoes_mensais(carregar_serie(indexador)), n_cenarios, meses)
+    else:
+        piso = PREMISSAS_INDEXADOR[indexador][2]
+        indices = gerar_indices(rng, n_cenarios, meses, media_anual, volatilidade_anual, piso_anual=piso)
+    return faixas_indexado(valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema, indices)
+
+
+# Rótulo na interface -> chave de `resumir_carteira`
+METRICAS_GRADE = {
+    "Total de Juros": 'Total Juros',
+    "Primeira Parcela": 'Primeira Parcela',
+    "Última Parcela": 'Última Parcela',
+    "Total Pago": 'Total Pago',
+}
+SISTEMAS = (SISTEMA_PRICE, SISTEMA_SAC)
+
+
+@memorizar(tamanho_maximo=16)
+def _grade_emprestimos(valor_emprestimo, entrada, faixa_taxas, faixa_prazos, pontos_taxa):
+    """Totais da grade taxa × prazo × sistema (PRICE e SAC) em uma única chamada"""
+    taxas = np.linspace(faixa_taxas[0], faixa_taxas[1], pontos_taxa)
+    prazos = np.arange(faixa_prazos[0], faixa_prazos[1] + 1)
+    return taxas, prazos, grade_carteira(valor_emprestimo, entrada, taxas, prazos, SISTEMAS)
+
+
+@memorizar()
+def _simular_amortizacoes(valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema, eventos):
+    """Tabela com as amortizações extras e comparação entre estratégias"""
+    tabela = amortizar_com_eventos(valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema, eventos)
+    comparacao = comparar_estrategias(valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema, {
+        ESTRATEGIA_INFORMADA: eventos,
+        "Tudo reduzindo o prazo": [(mes, valor, REDUZIR_PRAZO) for mes, valor, _ in eventos],
+        "Tudo reduzindo a parcela": [(mes, valor, REDUZIR_PARCELA) for mes, valor, _ in eventos],
+    })
+    marcar('calculo')
+    
+    df_eventos = pd.DataFrame({
+        'Parcela': np.arange(1, tabela['num_parcelas'] + 1),
+        'Valor Parcela': tabela['Valor Parcela'],
+        'Amortização Extra': tabela['Amortização Extra'],
+        'Saldo Devedor': tabela['Saldo Devedor']
+    })
+    df_comparacao = pd.DataFrame(comparacao)
+    marcar('tabelas')
+    return df_eventos, df_comparacao
+
+
+@memorizar()
+def _comparar_ofertas(valor_emprestimo, entrada, prazo_anos, sistema, cobrar_iof, financiar_tarifas, ofertas):
+    """CET de cada oferta (nome, taxa anual, TAC, tarifa mensal, MIP, DFI), ordenado do menor para o maior"""
+    nomes, taxas, tacs, tarifas, mips, dfis = (np.array(coluna) for coluna in zip(*ofertas))
+    cet = custo_efetivo_total(
+        valor_emprestimo, entrada, taxas.astype(float), prazo_anos, sistema,
+        tac=tacs.astype(float), iof=cobrar_iof, seguro_mip=mips.astype(float), seguro_dfi=dfis.astype(float),
+        tarifa_mensal=tarifas.astype(float), financiar_tarifas=financiar_tarifas
+    )
+    marcar('calculo')
+    df_ofertas = pd.DataFrame({
+        'Oferta': nomes,
+        'Taxa Nominal (% a.a.)': taxas.astype(float),
+        'CET (% a.m.)': cet['CET Mensal'],
+        'CET (% a.a.)': cet['CET Anual'],
+        'IOF': cet['IOF'],
+        'Valor Liberado': cet['Valor Liberado'],
+        'Primeira Prestação': cet['Primeira Prestação'],
+        'Total Pago': cet['Total Pago']
+    })
+    df_ofertas = df_ofertas.sort_values('CET (% a.a.)', kind='stable').reset_index(drop=True)
+    marcar('tabelas')
+    return df_ofertas
 
 
 def calcular_emprestimo():
@@ -18,56 +169,17 @@ def calcular_emprestimo():
         
     with col2:
         st.subheader("Opções")
-        sistema = st.radio("Sistema de Amortização", ["PRICE (Parcelas Fixas)", "SAC (Amortização Constante)"])
+        sistema = st.radio("Sistema de Amortização", [SISTEMA_PRICE, SISTEMA_SAC])
         entrada = st.number_input("Entrada (R$)", min_value=0.0, value=0.0, step=1000.0)
+        centavos_exatos = st.checkbox("Centavos exatos", help="Arredonda juros e parcelas para o centavo a cada mês, "
+                                      "como no extrato do banco; a parcela final absorve o resíduo")
+        arredondamento = st.selectbox("Arredondamento", MODOS_ARREDONDAMENTO) if centavos_exatos else None
         
+    marcar('renderizacao')
+    
     # Cálculos
-    valor_financiado = valor_emprestimo - entrada
-    taxa_mensal = taxa_juros_anual / 12 / 100
-    num_parcelas = prazo_anos * 12
-    
-    parcelas_data = []
-    
-    if sistema == "PRICE (Parcelas Fixas)":
-        # Sistema PRICE
-        if taxa_mensal > 0:
-            parcela = valor_financiado * (taxa_mensal * (1 + taxa_mensal) ** num_parcelas) / ((1 + taxa_mensal) ** num_parcelas - 1)
-        else:
-            parcela = valor_financiado / num_parcelas
-        
-        saldo_devedor = valor_financiado
-        
-        for i in range(1, int(num_parcelas) + 1):
-            juros = saldo_devedor * taxa_mensal
-            amortizacao = parcela - juros
-            saldo_devedor -= amortizacao
-            
-            parcelas_data.append({
-                'Parcela': i,
-                'Valor Parcela': parcela,
-                'Juros': juros,
-                'Amortização': amortizacao,
-                'Saldo Devedor': max(0, saldo_devedor)
-            })
-    
-    else:  # SAC
-        amortizacao = valor_financiado / num_parcelas
-        saldo_devedor = valor_financiado
-        
-        for i in range(1, int(num_parcelas) + 1):
-            juros = saldo_devedor * taxa_mensal
-            parcela = amortizacao + juros
-            saldo_devedor -= amortizacao
-            
-            parcelas_data.append({
-                'Parcela': i,
-                'Valor Parcela': parcela,
-                'Juros': juros,
-                'Amortização': amortizacao,
-                'Saldo Devedor': max(0, saldo_devedor)
-            })
-    
-    df_parcelas = pd.DataFrame(parcelas_data)
+    df_parcelas = _tabela_parcelas(valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema, arredondamento)
+    marcar('calculo')
     
     # Métricas
     st.subheader("📊 Resumo do Financiamento")
@@ -83,61 +195,101 @@ def calcular_emprestimo():
     with col4:
         total_juros = df_parcelas['Juros'].sum()
         st.metric("Total de Juros", f"R$ {total_juros:,.2f}")
+    if centavos_exatos:
+        st.caption(f"Valores em centavos exatos; resíduo absorvido pela parcela final: "
+                   f"R$ {df_parcelas.attrs['residuo']:+,.2f}")
+    
+    marcar('renderizacao')
     
     # Gráfico de evolução das parcelas
-    fig = go.Figure()
+    fig = figura('Composição das Parcelas ao Longo do Tempo', 'Número da Parcela', 'Valor (R$)', hover_unificado=True)
+    parcelas, valor_parcela, juros, amortizacao = reduzir(
+        df_parcelas['Parcela'], df_parcelas['Valor Parcela'], df_parcelas['Juros'], df_parcelas['Amortização']
+    )
     
-    fig.add_trace(go.Scatter(
-        x=df_parcelas['Parcela'],
-        y=df_parcelas['Valor Parcela'],
+    fig.add_trace(traco(
+        parcelas,
+        valor_parcela,
         name='Valor da Parcela',
         line=dict(color='#1f77b4', width=2)
     ))
     
-    fig.add_trace(go.Scatter(
-        x=df_parcelas['Parcela'],
-        y=df_parcelas['Juros'],
+    fig.add_trace(traco(
+        parcelas,
+        juros,
         name='Juros',
         fill='tonexty',
         line=dict(color='#d62728')
     ))
     
-    fig.add_trace(go.Scatter(
-        x=df_parcelas['Parcela'],
-        y=df_parcelas['Amortização'],
+    fig.add_trace(traco(
+        parcelas,
+        amortizacao,
         name='Amortização',
         fill='tozeroy',
         line=dict(color='#2ca02c')
     ))
-    
-    fig.update_layout(
-        title='Composição das Parcelas ao Longo do Tempo',
-        xaxis_title='Número da Parcela',
-        yaxis_title='Valor (R$)',
-        hovermode='x unified',
-        height=500
-    )
+    marcar('graficos')
     
     st.plotly_chart(fig, use_container_width=True)
+    marcar('renderizacao')
     
     # Gráfico de saldo devedor
-    fig2 = go.Figure()
+    fig2 = figura('Evolução do Saldo Devedor', 'Número da Parcela', 'Saldo Devedor (R$)', altura=400)
     
-    fig2.add_trace(go.Scatter(
-        x=df_parcelas['Parcela'],
-        y=df_parcelas['Saldo Devedor'],
+    fig2.add_trace(traco(
+        *reduzir(df_parcelas['Parcela'], df_parcelas['Saldo Devedor']),
         fill='tozeroy',
         line=dict(color='#ff7f0e', width=3)
     ))
-    
-    fig2.update_layout(
-        title='Evolução do Saldo Devedor',
-        xaxis_title='Número da Parcela',
-        yaxis_title='Saldo Devedor (R$)',
-        height=400
-    )
+    marcar('graficos')
     
     st.plotly_chart(fig2, use_container_width=True)
+    marcar('renderizacao')
+    
+    # Comparação em grade: todas as combinações de taxa, prazo e sistema
+    if st.checkbox("🔀 Comparar grade de taxas × prazos × sistemas",
+                   help="Calcula PRICE e SAC para cada combinação de taxa e prazo"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            faixa_taxas = st.slider("Faixa de Taxas (% a.a.)", min_value=0.0, max_value=30.0, value=(5.0, 15.0), step=0.5)
+        with col2:
+            faixa_prazos = st.slider("Faixa de Prazos (anos)", min_value=1, max_value=35, value=(1, 35))
+        with col3:
+            pontos_taxa = st.slider("Resolução (taxas na grade)", min_value=5, max_value=200, value=41)
+        metrica = st.radio("Métrica", list(METRICAS_GRADE), horizontal=True)
+        marcar('renderizacao')
+        
+        taxas, prazos, grade = _grade_emprestimos(valor_emprestimo, entrada, faixa_taxas, faixa_prazos, pontos_taxa)
+        marcar('calculo')
+        valores = grade[METRICAS_GRADE[metrica]]
+        # Mesma escala de cores nos dois sistemas para permitir a comparação
+        escala = dict(zmin=float(valores.min()), zmax=float(valores.max()), colorscale='Viridis')
+        
+        colunas = st.columns(len(SISTEMAS))
+        for s, (coluna, nome_sistema) in enumerate(zip(colunas, SISTEMAS)):
+            with coluna:
+                fig_grade = figura(f'{metrica} — {nome_sistema.split()[0]}', 'Prazo (anos)', 'Taxa (% a.a.)', altura=450)
+                fig_grade.add_trace(mapa_calor(
+                    prazos, taxas, valores[:, :, s],
+                    hovertemplate='Prazo: %{x} anos<br>Taxa: %{y:.2f}%<br>R$ %{z:,.2f}<extra></extra>',
+                    showscale=s == len(SISTEMAS) - 1,
+                    **escala
+                ))
+                fig_grade.add_trace(traco(
+                    [prazo_anos], [taxa_juros_anual],
+                    mode='markers', name='Simulação atual', showlegend=False,
+                    marker=dict(color='red', size=10, symbol='x')
+                ))
+                marcar('graficos')
+                st.plotly_chart(fig_grade, use_container_width=True)
+                marcar('renderizacao')
+        
+        economia_sac = grade['Total Juros'][:, :, 0] - grade['Total Juros'][:, :, 1]
+        st.info(f"Na grade, o SAC economiza entre R$ {economia_sac.min():,.2f} e R$ {economia_sac.max():,.2f} "
+                f"em juros em relação ao PRICE ({valores[:, :, 0].size} combinações por sistema).")
+    
+    marcar('renderizacao')
     
     # Tabela de parcelas (primeiras e últimas)
     st.subheader("📋 Detalhamento das Parcelas")
@@ -159,4 +311,221 @@ def calcular_emprestimo():
             'Juros': 'R$ {:,.2f}',
             'Amortização': 'R$ {:,.2f}',
             'Saldo Devedor': 'R$ {:,.2f}'
-        }), hide_index=True, use_container_width=True)
\ No newline at end of file
+        }), hide_index=True, use_container_width=True)
+    
+    formatos, ajuda = formatos_disponiveis()
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        formato = st.selectbox("Formato", formatos, help=ajuda, key="formato_parcelas")
+    with col2:
+        st.download_button(
+            f"⬇️ Baixar as {len(df_parcelas)} parcelas",
+            _arquivo_parcelas(formato, valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema, arredondamento),
+            file_name=f"parcelas.{formato}", mime=FORMATOS[formato]
+        )
+    marcar('tabelas')
+    
+    # Custo Efetivo Total: juros + tarifas + IOF + seguros
+    st.subheader("🧾 Custo Efetivo Total (CET)")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        tac = st.number_input("Tarifa de Abertura de Crédito - TAC (R$)", min_value=0.0, value=0.0, step=100.0)
+        tarifa_mensal = st.number_input("Tarifa Mensal de Administração (R$)", min_value=0.0, value=0.0, step=5.0)
+    with col2:
+        seguro_mip = st.number_input("Seguro MIP (% a.m. sobre o saldo)", min_value=0.0, value=0.0,
+                                     step=0.005, format="%.4f")
+        seguro_dfi = st.number_input("Seguro DFI (% a.m. sobre o valor do bem)", min_value=0.0, value=0.0,
+                                     step=0.001, format="%.4f")
+    with col3:
+        cobrar_iof = st.checkbox("Cobrar IOF", value=True, help="O financiamento habitacional é isento de IOF")
+        financiar_tarifas = st.checkbox("Financiar TAC e IOF", value=True,
+                                        help="Se desmarcado, TAC e IOF são descontados do valor liberado")
+    
+    st.markdown("Compare com outras ofertas (taxa menor com tarifa maior, por exemplo):")
+    df_entrada_ofertas = st.data_editor(
+        pd.DataFrame({
+            'Oferta': ["Outra oferta"],
+            'Taxa Anual (%)': [8.5],
+            'TAC (R$)': [2000.0],
+            'Tarifa Mensal (R$)': [25.0],
+            'MIP (% a.m.)': [0.0],
+            'DFI (% a.m.)': [0.0],
+        }),
+        num_rows="dynamic",
+        hide_index=True,
+        use_container_width=True,
+        key="ofertas_cet"
+    )
+    ofertas = (("Esta simulação", taxa_juros_anual, tac, tarifa_mensal, seguro_mip, seguro_dfi),) + tuple(
+        (str(nome), float(taxa), float(tac_oferta), float(tarifa), float(mip), float(dfi))
+        for nome, taxa, tac_oferta, tarifa, mip, dfi in df_entrada_ofertas.dropna().itertuples(index=False)
+    )
+    marcar('renderizacao')
+    
+    if valor_emprestimo - entrada <= 0:
+        st.info("Sem valor financiado (entrada igual ou maior que o valor do empréstimo), não há CET a calcular")
+    else:
+        df_ofertas = _comparar_ofertas(
+            valor_emprestimo, entrada, prazo_anos, sistema, cobrar_iof, financiar_tarifas, ofertas
+        )
+        marcar('calculo')
+        simulacao = df_ofertas[df_ofertas['Oferta'] == "Esta simulação"].iloc[0]
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("CET Mensal", f"{simulacao['CET (% a.m.)']:.4f}%")
+        with col2:
+            st.metric("CET Anual", f"{simulacao['CET (% a.a.)']:.2f}%",
+                      delta=f"{simulacao['CET (% a.a.)'] - taxa_juros_anual:+.2f} p.p. vs. taxa nominal",
+                      delta_color="inverse")
+        with col3:
+            st.metric("IOF", f"R$ {simulacao['IOF']:,.2f}")
+        with col4:
+            st.metric("Primeira Prestação com Encargos", f"R$ {simulacao['Primeira Prestação']:,.2f}")
+        marcar('renderizacao')
+        
+        if len(df_ofertas) > 1:
+            st.write("**Ofertas Ordenadas pelo CET**")
+            st.dataframe(df_ofertas.style.format({
+                'Taxa Nominal (% a.a.)': '{:.2f}%',
+                'CET (% a.m.)': '{:.4f}%',
+                'CET (% a.a.)': '{:.2f}%',
+                'IOF': 'R$ {:,.2f}',
+                'Valor Liberado': 'R$ {:,.2f}',
+                'Primeira Prestação': 'R$ {:,.2f}',
+                'Total Pago': 'R$ {:,.2f}'
+            }), hide_index=True, use_container_width=True)
+    marcar('tabelas')
+    
+    # Financiamento indexado: saldo corrigido pela TR ou pelo IPCA
+    st.subheader("📈 Financiamento Indexado (TR / IPCA)")
+    indexado = st.checkbox("Simular correção do saldo por indexador",
+                           help="A taxa de juros informada passa a ser a taxa acima do indexador (ex.: TR + 9% a.a.)")
+    
+    if indexado:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            indexador = st.selectbox("Indexador", INDEXADORES)
+            serie = carregar_serie(indexador)
+            fontes = [FONTE_SIMULADA] + ([FONTE_HISTORICA] if serie is not None and len(serie[0]) else [])
+            fonte = st.radio("Trajetórias", fontes,
+                             help="O histórico reamostrado usa blocos de 12 meses da série local do indexador")
+        media_padrao, volatilidade_padrao, _ = PREMISSAS_INDEXADOR[indexador]
+        with col2:
+            media_indexador = st.number_input("Média do Indexador (%/ano)", value=media_padrao, step=0.5,
+                                              disabled=fonte == FONTE_HISTORICA, key=f"media_{indexador}")
+            volatilidade_indexador = st.number_input("Volatilidade (p.p./ano)", min_value=0.0, value=volatilidade_padrao,
+                                                     step=0.5, disabled=fonte == FONTE_HISTORICA,
+                                                     key=f"volatilidade_{indexador}")
+        with col3:
+            n_cenarios = st.select_slider("Cenários", options=[1000, 2000, 5000, 10000, 20000], value=5000)
+            semente_indexador = st.number_input("Semente", min_value=0, value=42, step=1, key="semente_indexador")
+        marcar('renderizacao')
+        
+        faixas = _simular_indexado(
+            valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema, indexador, fonte,
+            media_indexador, volatilidade_indexador, n_cenarios, int(semente_indexador),
+            versao_serie(indexador) if fonte == FONTE_HISTORICA else None
+        )
+        marcar('calculo')
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Total Pago (mediana)", f"R$ {faixas['Total Pago'][50]:,.2f}",
+                      help=f"90% dos cenários entre R$ {faixas['Total Pago'][5]:,.2f} e R$ {faixas['Total Pago'][95]:,.2f}")
+        with col2:
+            st.metric("Maior Parcela (mediana)", f"R$ {faixas['Maior Parcela'][50]:,.2f}")
+        with col3:
+            st.metric("Maior Parcela (pior 5%)", f"R$ {faixas['Maior Parcela'][95]:,.2f}")
+        with col4:
+            st.metric("Correção Monetária (mediana)", f"R$ {faixas['Correção Total'][50]:,.2f}")
+        marcar('renderizacao')
+        
+        parcelas_indexadas = np.arange(1, len(faixas['Valor Parcela'][50]) + 1)
+        col1, col2 = st.columns(2)
+        with col1:
+            fig_parcela = figura(f'Parcela Corrigida ({indexador})', 'Parcela', 'Valor (R$)', altura=400,
+                                 hover_unificado=True)
+            faixas_percentis(fig_parcela, parcelas_indexadas, faixas['Valor Parcela'])
+            marcar('graficos')
+            st.plotly_chart(fig_parcela, use_container_width=True)
+        with col2:
+            fig_saldo = figura('Saldo Devedor Corrigido', 'Parcela', 'Saldo (R$)', altura=400, hover_unificado=True)
+            faixas_percentis(fig_saldo, parcelas_indexadas, faixas['Saldo Devedor'], rgb='214, 39, 40')
+            marcar('graficos')
+            st.plotly_chart(fig_saldo, use_container_width=True)
+        marcar('renderizacao')
+    
+    # Amortizações extraordinárias
+    st.subheader("💸 Amortizações Extras")
+    st.markdown("Simule o uso do FGTS, de um bônus ou do 13º para abater o saldo devedor, reduzindo o prazo ou a parcela")
+    
+    df_entrada_eventos = st.data_editor(
+        pd.DataFrame({'Mês': [12], 'Valor': [10000.0], 'Modo': [REDUZIR_PRAZO]}),
+        num_rows="dynamic",
+        column_config={
+            'Mês': st.column_config.NumberColumn("Após a Parcela Nº", min_value=1, max_value=prazo_anos * 12, step=1),
+            'Valor': st.column_config.NumberColumn("Valor (R$)", min_value=0.0, step=1000.0, format="R$ %.2f"),
+            'Modo': st.column_config.SelectboxColumn("Modo", options=[REDUZIR_PRAZO, REDUZIR_PARCELA]),
+        },
+        hide_index=True,
+        use_container_width=True,
+        key="amortizacoes_extras"
+    )
+    eventos = tuple(
+        (int(mes), float(valor), modo)
+        for mes, valor, modo in df_entrada_eventos[['Mês', 'Valor', 'Modo']].dropna().itertuples(index=False)
+    )
+    
+    if not eventos:
+        st.info("Adicione uma amortização extra na tabela acima para ver o impacto")
+        return
+    marcar('renderizacao')
+    
+    df_eventos, df_comparacao = _simular_amortizacoes(
+        valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema, eventos
+    )
+    marcar('calculo')
+    informado = df_comparacao[df_comparacao['Estratégia'] == ESTRATEGIA_INFORMADA].iloc[0]
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Economia de Juros", f"R$ {informado['Economia de Juros']:,.2f}")
+    with col2:
+        st.metric("Parcelas a Menos", f"{len(df_parcelas) - informado['Parcelas']}")
+    with col3:
+        st.metric("Parcela Final", f"R$ {informado['Parcela Final']:,.2f}",
+                  delta=f"R$ {informado['Parcela Final'] - df_parcelas['Valor Parcela'].iloc[-1]:,.2f}",
+                  delta_color="inverse")
+    marcar('renderizacao')
+    
+    fig3 = figura('Saldo Devedor com e sem Amortizações Extras', 'Número da Parcela', 'Saldo Devedor (R$)', altura=400)
+    
+    fig3.add_trace(traco(
+        *reduzir(df_parcelas['Parcela'], df_parcelas['Saldo Devedor']),
+        name='Sem amortização extra',
+        line=dict(color='#ff7f0e', width=2, dash='dash')
+    ))
+    
+    fig3.add_trace(traco(
+        *reduzir(df_eventos['Parcela'], df_eventos['Saldo Devedor']),
+        name='Com amortizações extras',
+        fill='tozeroy',
+        line=dict(color='#2ca02c', width=3)
+    ))
+    marcar('graficos')
+    
+    st.plotly_chart(fig3, use_container_width=True)
+    marcar('renderizacao')
+    
+    st.write("**Comparação de Estratégias**")
+    st.dataframe(df_comparacao.style.format({
+        'Primeira Parcela': 'R$ {:,.2f}',
+        'Parcela Final': 'R$ {:,.2f}',
+        'Total Extra': 'R$ {:,.2f}',
+        'Total Pago': 'R$ {:,.2f}',
+        'Total Juros': 'R$ {:,.2f}',
+        'Economia de Juros': 'R$ {:,.2f}'
+    }), hide_index=True, use_container_width=True)
+    marcar('tabelas')
\ No newline at end of file
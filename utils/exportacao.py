@@ -0,0 +1,186 @@
+import io
+from pathlib import Path
+
+import numpy as np
+
+from .motor_centavos import amortizar_carteira_centavos
+from .motor_emprestimos import SISTEMA_PRICE, amortizar_carteira
+
+
+FORMATOS = {
+    'csv': 'text/csv',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'parquet': 'application/vnd.apache.parquet',
+}
+LINHAS_POR_BLOCO = 50000
+LINHAS_POR_PLANILHA = 1048576  # limite do Excel, incluindo o cabeçalho
+
+
+def formato_do_arquivo(caminho):
+    """Formato de exportação pela extensão do arquivo"""
+    formato = Path(caminho).suffix.lower().lstrip('.')
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de exportação desconhecido: '{formato}'. Use um de: {', '.join(FORMATOS)}")
+    return formato
+
+
+def blocos_colunas(colunas, linhas_por_bloco=LINHAS_POR_BLOCO):
+    """Fatias de `linhas_por_bloco` linhas de um dicionário de colunas do mesmo tamanho.
+
+    As fatias são vistas dos arrays originais (inclusive os mapeados em
+    memória), então nada é copiado antes de o bloco ser gravado.
+    """
+    colunas = {nome: np.asarray(valores) for nome, valores in colunas.items()}
+    total = len(next(iter(colunas.values()))) if colunas else 0
+    for inicio in range(0, total, linhas_por_bloco):
+        yield {nome: valores[inicio:inicio + linhas_por_bloco] for nome, valores in colunas.items()}
+
+
+def blocos_parcelas(valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema=SISTEMA_PRICE,
+                    arredondamento=None, contratos_por_bloco=1000, primeiro_contrato=0):
+    """Tabelas de parcelas de uma carteira em formato longo, calculadas `contratos_por_bloco` contratos por vez.
+
+    Cada bloco é um dicionário de colunas 'contrato', 'parcela',
+    'valor_parcela', 'juros', 'amortizacao' e 'saldo_devedor', com uma linha
+    por parcela paga. Com `arredondamento` as tabelas vêm de
+    `amortizar_carteira_centavos` (valores em reais, exatos no centavo).
+    A memória usada depende só de `contratos_por_bloco`, não do tamanho da carteira.
+    """
+    valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema = (
+        np.ravel(coluna) for coluna in np.broadcast_arrays(
+            np.atleast_1d(np.asarray(valor_emprestimo, dtype=float)),
+            np.atleast_1d(np.asarray(entrada, dtype=float)),
+            np.atleast_1d(np.asarray(taxa_juros_anual, dtype=float)),
+            np.atleast_1d(np.asarray(prazo_anos)),
+            np.atleast_1d(np.asarray(sistema, dtype=str)),
+        )
+    )
+    for inicio in range(0, len(valor_emprestimo), contratos_por_bloco):
+        fatia = slice(inicio, inicio + contratos_por_bloco)
+        argumentos = (valor_emprestimo[fatia], entrada[fatia], taxa_juros_anual[fatia], prazo_anos[fatia], sistema[fatia])
+        if arredondamento is None:
+            tabela, escala = amortizar_carteira(*argumentos), 1
+        else:
+            tabela, escala = amortizar_carteira_centavos(*argumentos, arredondamento), 100
+
+        pagas = np.arange(tabela['Valor Parcela'].shape[1]) < tabela['num_parcelas'][:, None]
+        contratos, parcelas = np.nonzero(pagas)
+        yield {
+            'contrato': primeiro_contrato + inicio + contratos,
+            'parcela': parcelas + 1,
+            'valor_parcela': tabela['Valor Parcela'][pagas] / escala,
+            'juros': tabela['Juros'][pagas] / escala,
+            'amortizacao': tabela['Amortização'][pagas] / escala,
+            'saldo_devedor': tabela['Saldo Devedor'][pagas] / escala,
+        }
+
+
+def _gravar_csv(blocos, arquivo):
+    import pyarrow as pa
+    import pyarrow.csv as pcsv
+
+    # O escritor CSV do Arrow formata os números em C, bem mais rápido que DataFrame.to_csv
+    escritor = None
+    try:
+        for bloco in blocos:
+            tabela = pa.table(bloco)
+            if escritor is None:
+                escritor = pcsv.CSVWriter(arquivo, tabela.schema)
+            escritor.write_table(tabela)
+            yield tabela.num_rows
+    finally:
+        if escritor is not None:
+            escritor.close()
+
+
+def _gravar_parquet(blocos, arquivo):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    escritor = None
+    try:
+        for bloco in blocos:
+            tabela = pa.table(bloco)
+            if escritor is None:
+                escritor = pq.ParquetWriter(arquivo, tabela.schema)
+            escritor.write_table(tabela)
+            yield tabela.num_rows
+    finally:
+        if escritor is not None:
+            escritor.close()
+
+
+def _gravar_xlsx(blocos, arquivo):
+    try:
+        import xlsxwriter
+    except ImportError as erro:
+        raise ImportError("A exportação para XLSX requer o pacote opcional XlsxWriter (pip install XlsxWriter)") from erro
+
+    # constant_memory: cada linha vai para o disco assim que a seguinte começa
+    pasta = xlsxwriter.Workbook(arquivo, {
+        'constant_memory': True, 'nan_inf_to_errors': True, 'default_date_format': 'dd/mm/yyyy'
+    })
+    try:
+        planilha, linha = None, LINHAS_POR_PLANILHA
+        for bloco in blocos:
+            nomes = list(bloco)
+            for valores in zip(*(_valores_python(coluna) for coluna in bloco.values())):
+                if linha == LINHAS_POR_PLANILHA:
+                    planilha = pasta.add_worksheet()
+                    planilha.write_row(0, 0, nomes)
+                    linha = 1
+                planilha.write_row(linha, 0, valores)
+                linha += 1
+            yield len(next(iter(bloco.values())))
+    finally:
+        pasta.close()
+
+
+def _valores_python(coluna):
+    """Valores da coluna como tipos Python; datas viram `datetime` em vez de inteiros em nanossegundos"""
+    coluna = np.asarray(coluna)
+    if coluna.dtype.kind == 'M':
+        return coluna.astype('datetime64[us]').tolist()
+    return coluna.tolist()
+
+
+_ESCRITORES = {'csv': _gravar_csv, 'parquet': _gravar_parquet, 'xlsx': _gravar_xlsx}
+
+
+def exportar(blocos, destino, formato=None):
+    """Grava os blocos de colunas em `destino` (caminho ou arquivo binário) à medida que são gerados.
+
+    Só um bloco fica em memória por vez. O formato sai da extensão de
+    `destino` quando não informado. Retorna o total de linhas gravadas.
+    """
+    formato = formato or formato_do_arquivo(destino)
+    if formato not in _ESCRITORES:
+        raise ValueError(f"Formato de exportação desconhecido: '{formato}'. Use um de: {', '.join(FORMATOS)}")
+    if isinstance(destino, (str, Path)):
+        with open(destino, 'wb') as arquivo:
+            return sum(_ESCRITORES[formato](blocos, arquivo))
+    return sum(_ESCRITORES[formato](blocos, destino))
+
+
+def exportar_bytes(colunas, formato):
+    """Conteúdo do arquivo exportado a partir de um dicionário de colunas (para botões de download)"""
+    saida = io.BytesIO()
+    exportar(blocos_colunas(colunas), saida, formato)
+    return saida.getvalue()
+
+
+def xlsx_disponivel():
+    """Se o pacote opcional XlsxWriter está instalado"""
+    try:
+        import xlsxwriter  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def formatos_disponiveis():
+    """Formatos que podem ser exportados neste ambiente e um texto de ajuda sobre os ausentes (ou None)"""
+    if xlsx_disponivel():
+        return tuple(FORMATOS), None
+    return (tuple(formato for formato in FORMATOS if formato != 'xlsx'),
+            "Para exportar em XLSX, instale o pacote opcional XlsxWriter (pip install XlsxWriter)")
\ No newline at end of file
@@ -1,6 +1,181 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
+
+from .armazenamento import persistir
+from .cache import memorizar
+from .exportacao import FORMATOS, exportar_bytes, formatos_disponiveis
+from .graficos import faixas_percentis, figura, reduzir, traco
+from .instrumentacao import marcar
+from .motor_carteira import (
+    REBALANCEAMENTO_CALENDARIO, REBALANCEAMENTO_LIMITE, REBALANCEAMENTOS, correlacao_minima, evoluir_carteira,
+    meses_ate_metas, simular_carteira
+)
+from .motor_fire import MAX_MESES, meses_ate_meta, meses_ate_meta_corrigida, projetar_patrimonio
+from .taxa_saque import buscar_taxa_saque_segura
+
+
+NIVEIS_FI = [
+    {"Nome": "Lean FI", "Multiplicador": 0.5, "Descrição": "Cobre 50% das despesas"},
+    {"Nome": "Flex FI", "Multiplicador": 0.75, "Descrição": "Permite trabalho part-time"},
+    {"Nome": "FI", "Multiplicador": 1.0, "Descrição": "Independência financeira completa"},
+    {"Nome": "Fat FI", "Multiplicador": 1.5, "Descrição": "FI com estilo de vida elevado"},
+    {"Nome": "Obese FI", "Multiplicador": 2.0, "Descrição": "FI com muito conforto"}
+]
+AUMENTOS_POUPANCA = [0, 500, 1000, 2000, 5000]
+REDUCOES_DESPESA = [0, 500, 1000, 2000]
+CLASSES_CARTEIRA = [
+    {"Classe": "Renda Fixa", "Peso (%)": 50.0, "Retorno (%/ano)": 9.0, "Volatilidade (%/ano)": 3.0},
+    {"Classe": "Ações BR", "Peso (%)": 25.0, "Retorno (%/ano)": 13.0, "Volatilidade (%/ano)": 25.0},
+    {"Classe": "Ações Globais", "Peso (%)": 25.0, "Retorno (%/ano)": 11.0, "Volatilidade (%/ano)": 18.0}
+]
+CORES_CLASSES = ['#1f77b4', '#2ca02c', '#ff7f0e', '#9467bd', '#8c564b', '#e377c2']
+
+
+_buscar_taxa_saque_segura = memorizar(tamanho_maximo=8)(persistir()(buscar_taxa_saque_segura))
+
+
+@memorizar()
+def _simular_fire(patrimonio_atual, poupanca_mensal, idade_atual, taxa_retorno, taxa_saque, despesas_fire, taxa_inflacao):
+    """Núcleo numérico da calculadora: caminho até o FI/RE, níveis e sensibilidade"""
+    # Número FI/RE (25x despesas anuais ou usando taxa de saque customizada)
+    numero_fire = despesas_fire * 12 / (taxa_saque / 100)
+    
+    # Calcular tempo até FI/RE
+    taxa_mensal = (1 + taxa_retorno/100) ** (1/12) - 1
+    max_meses = MAX_MESES
+    meta_inicial = numero_fire
+    
+    # Mês em que o patrimônio cruza a meta (corrigida pela inflação a cada ano)
+    meses_fire = meses_ate_meta_corrigida(patrimonio_atual, poupanca_mensal, taxa_mensal, meta_inicial, taxa_inflacao, max_meses)
+    meses_fire = None if np.isnan(meses_fire) else int(meses_fire)
+    meses_simulados = max_meses if meses_fire is None else meses_fire
+    
+    caminho = projetar_patrimonio(patrimonio_atual, poupanca_mensal, taxa_mensal, meses_simulados)
+    meses = np.arange(meses_simulados)
+    metas_caminho = meta_inicial * (1 + taxa_inflacao/100) ** (meses // 12)
+    if meses_simulados > 0:
+        numero_fire = metas_caminho[-1]
+    
+    # Tempo até cada meta (níveis e ambas as análises de sensibilidade) em uma única chamada
+    multiplicadores = np.array([nivel["Multiplicador"] for nivel in NIVEIS_FI])
+    novos_numeros_fire = np.maximum(0, despesas_fire - np.array(REDUCOES_DESPESA)) * 12 / (taxa_saque / 100)
+    metas = np.concatenate([
+        numero_fire * multiplicadores,
+        np.full(len(AUMENTOS_POUPANCA), numero_fire),
+        novos_numeros_fire
+    ])
+    aportes = poupanca_mensal + np.concatenate([
+        np.zeros(len(NIVEIS_FI)),
+        AUMENTOS_POUPANCA,
+        REDUCOES_DESPESA
+    ])
+    tempos = meses_ate_meta(patrimonio_atual, aportes, taxa_mensal, metas, max_meses)
+    meses_niveis, meses_aumentos, meses_reducoes = np.split(
+        tempos, [len(NIVEIS_FI), len(NIVEIS_FI) + len(AUMENTOS_POUPANCA)]
+    )
+    marcar('calculo')
+    
+    df_evolucao = pd.DataFrame({
+        'Mês': meses,
+        'Ano': meses / 12,
+        'Idade': idade_atual + meses / 12,
+        'Patrimônio': caminho[1:],
+        'Meta FI/RE': metas_caminho
+    })
+    
+    niveis_data = []
+    for nivel, meta, m_temp in zip(NIVEIS_FI, metas, meses_niveis):
+        progresso = (patrimonio_atual / meta * 100) if meta > 0 else 0
+        tempo = None if np.isnan(m_temp) else m_temp / 12
+        
+        niveis_data.append({
+            "Nível": nivel["Nome"],
+            "Meta": f"R$ {meta:,.0f}",
+            "Progresso": f"{progresso:.1f}%",
+            "Tempo": f"{tempo:.1f} anos" if tempo else "> 50 anos",
+            "Descrição": nivel["Descrição"]
+        })
+    
+    aumentos_data = []
+    for aumento, m_temp in zip(AUMENTOS_POUPANCA, meses_aumentos):
+        if not np.isnan(m_temp):
+            aumentos_data.append({
+                "Aumento": f"+R$ {aumento}",
+                "Tempo": f"{m_temp/12:.1f} anos",
+                "Redução": f"{(meses_fire - m_temp)/12:.1f} anos" if meses_fire else "N/A"
+            })
+    
+    reducoes_data = []
+    for reducao, novo_numero_fire, m_temp in zip(REDUCOES_DESPESA, novos_numeros_fire, meses_reducoes):
+        if not np.isnan(m_temp):
+            reducoes_data.append({
+                "Redução": f"-R$ {reducao}",
+                "Nova Meta": f"R$ {novo_numero_fire:,.0f}",
+                "Tempo": f"{m_temp/12:.1f} anos"
+            })
+    
+    resultado = {
+        'numero_fire': numero_fire,
+        'meses_fire': meses_fire,
+        'patrimonio': caminho[-1],
+        'df_evolucao': df_evolucao,
+        'df_niveis': pd.DataFrame(niveis_data),
+        'df_aumentos': pd.DataFrame(aumentos_data),
+        'df_reducoes': pd.DataFrame(reducoes_data)
+    }
+    marcar('tabelas')
+    return resultado
+
+
+@memorizar(tamanho_maximo=8)
+def _simular_carteira(patrimonio_atual, poupanca_mensal, idade_atual, classes, correlacao, rebalanceamento,
+                      periodo_meses, limite_desvio, direcionar_aportes, meta_inicial, taxa_inflacao, anos,
+                      n_caminhos, semente):
+    """Carteira esperada ativo a ativo e faixas de patrimônio e de tempo até o FI/RE sobre `n_caminhos` caminhos"""
+    nomes, pesos, retornos, volatilidades = zip(*classes)
+    pesos = np.array(pesos) / sum(pesos)
+    meses = anos * 12
+    # Meta do mês k: a do ano em que o aporte k cai, como em `_simular_fire`
+    metas = meta_inicial * (1 + taxa_inflacao / 100) ** (np.maximum(np.arange(meses + 1) - 1, 0) // 12)
+    regra = (rebalanceamento, periodo_meses, limite_desvio, direcionar_aportes)
+    
+    # Carteira esperada: cada classe rende a taxa mensal equivalente ao seu retorno, sem volatilidade
+    taxas_mensais = (1 + np.array(retornos) / 100) ** (1 / 12) - 1
+    esperada = evoluir_carteira(patrimonio_atual * pesos, np.broadcast_to(taxas_mensais, (1, meses, len(pesos))),
+                                poupanca_mensal, pesos, *regra, guardar_ativos=True)
+    meses_esperado = meses_ate_metas(esperada['patrimonio'], metas)[0]
+    simulacao = simular_carteira(patrimonio_atual, poupanca_mensal, pesos, retornos, volatilidades, meses,
+                                 correlacao, *regra, metas=metas, n_caminhos=n_caminhos, semente=semente)
+    marcar('calculo')
+    
+    df_ativos = pd.DataFrame(esperada['saldos'][0], columns=list(nomes))
+    df_ativos.insert(0, 'Idade', idade_atual + np.arange(meses + 1) / 12)
+    df_ativos['Meta FI/RE'] = metas
+    df_pesos = pd.DataFrame({
+        'Classe': nomes,
+        'Peso Alvo': pesos * 100,
+        'Peso Final (esperada)': esperada['saldos_finais'][0] / esperada['saldos_finais'][0].sum() * 100,
+        'Peso Final (média)': simulacao['pesos_finais'] * 100
+    })
+    marcar('tabelas')
+    return {
+        'meses_esperado': None if np.isnan(meses_esperado) else int(meses_esperado),
+        'df_ativos': df_ativos,
+        'df_pesos': df_pesos,
+        'idades': idade_atual + simulacao['anos'],
+        'metas_anuais': metas[::12],
+        'percentis': simulacao['percentis'],
+        'meses_fire': simulacao['meses_meta'],
+        'rebalanceamentos': simulacao['rebalanceamentos'],
+        'rebalanceamentos_esperada': int(esperada['rebalanceamentos'][0])
+    }
+
+
+@memorizar(tamanho_maximo=8)
+def _arquivo_evolucao(formato, *argumentos):
+    """Evolução do patrimônio de `_simular_fire(*argumentos)` exportada em `formato`"""
+    return exportar_bytes(_simular_fire(*argumentos)['df_evolucao'], formato)
 
 
 def calcular_fire():
@@ -39,49 +214,26 @@ def calcular_fire():
         else:
             taxa_inflacao = 0.0
     
+    marcar('renderizacao')
+    
     # Cálculos
     poupanca_mensal = renda_mensal_liquida - despesas_mensais
     taxa_poupanca = (poupanca_mensal / renda_mensal_liquida * 100) if renda_mensal_liquida > 0 else 0
     
-    # Número FI/RE (25x despesas anuais ou usando taxa de saque customizada)
     despesas_anuais = despesas_fire * 12
-    numero_fire = despesas_anuais / (taxa_saque / 100)
     
-    # Calcular tempo até FI/RE
-    taxa_mensal = (1 + taxa_retorno/100) ** (1/12) - 1
-    taxa_inflacao_mensal = (1 + taxa_inflacao/100) ** (1/12) - 1
-    
-    patrimonio = patrimonio_atual
-    mes = 0
-    evolucao = []
-    meses_fire = None
-    
-    max_meses = 50 * 12  # Limite de 50 anos
-    
-    while patrimonio < numero_fire and mes < max_meses:
-        patrimonio = patrimonio * (1 + taxa_mensal) + poupanca_mensal
-        
-        # Ajustar despesas pela inflação
-        if incluir_inflacao and mes % 12 == 0 and mes > 0:
-            despesas_fire_ajustado = despesas_fire * ((1 + taxa_inflacao/100) ** (mes/12))
-            numero_fire = despesas_fire_ajustado * 12 / (taxa_saque / 100)
-        
-        evolucao.append({
-            'Mês': mes,
-            'Ano': mes / 12,
-            'Idade': idade_atual + mes / 12,
-            'Patrimônio': patrimonio,
-            'Meta FI/RE': numero_fire
-        })
-        
-        mes += 1
+    resultado = _simular_fire(
+        patrimonio_atual, poupanca_mensal, idade_atual, taxa_retorno, taxa_saque, despesas_fire, taxa_inflacao
+    )
+    numero_fire = resultado['numero_fire']
+    meses_fire = resultado['meses_fire']
+    patrimonio = resultado['patrimonio']
+    df_evolucao = resultado['df_evolucao']
     
-    if patrimonio >= numero_fire:
-        meses_fire = mes
-        anos_fire = mes / 12
+    if meses_fire is not None:
+        anos_fire = meses_fire / 12
         idade_fire = idade_atual + anos_fire
-    
-    df_evolucao = pd.DataFrame(evolucao)
+    marcar('calculo')
     
     # Métricas principais
     st.subheader("📊 Análise FI/RE")
@@ -127,21 +279,24 @@ def calcular_fire():
         - Aumentar sua renda
         """)
     
+    marcar('renderizacao')
+    
     # Gráfico de evolução
     if not df_evolucao.empty:
-        fig = go.Figure()
+        fig = figura('Caminho para Independência Financeira', 'Idade', 'Patrimônio (R$)', hover_unificado=True)
+        idades_grafico, patrimonio_grafico, metas_grafico = reduzir(df_evolucao['Idade'], df_evolucao['Patrimônio'], df_evolucao['Meta FI/RE'])
         
-        fig.add_trace(go.Scatter(
-            x=df_evolucao['Idade'],
-            y=df_evolucao['Patrimônio'],
+        fig.add_trace(traco(
+            idades_grafico,
+            patrimonio_grafico,
             name='Patrimônio',
             fill='tozeroy',
             line=dict(color='#2ca02c', width=3)
         ))
         
-        fig.add_trace(go.Scatter(
-            x=df_evolucao['Idade'],
-            y=df_evolucao['Meta FI/RE'],
+        fig.add_trace(traco(
+            idades_grafico,
+            metas_grafico,
             name='Meta FI/RE',
             line=dict(color='#d62728', width=2, dash='dash')
         ))
@@ -150,51 +305,30 @@ def calcular_fire():
             fig.add_vline(x=idade_fire, line_dash="dot", line_color="orange",
                           annotation_text=f"FI/RE aos {idade_fire:.0f} anos",
                           annotation_position="top")
-        
-        fig.update_layout(
-            title='Caminho para Independência Financeira',
-            xaxis_title='Idade',
-            yaxis_title='Patrimônio (R$)',
-            hovermode='x unified',
-            height=500
-        )
+        marcar('graficos')
         
         st.plotly_chart(fig, use_container_width=True)
+        marcar('renderizacao')
+    
+    formatos, ajuda = formatos_disponiveis()
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        formato = st.selectbox("Formato", formatos, help=ajuda, key="formato_evolucao_fire")
+    with col2:
+        st.download_button(
+            "⬇️ Baixar evolução do patrimônio",
+            _arquivo_evolucao(
+                formato, patrimonio_atual, poupanca_mensal, idade_atual, taxa_retorno, taxa_saque,
+                despesas_fire, taxa_inflacao
+            ),
+            file_name=f"evolucao_fire.{formato}", mime=FORMATOS[formato]
+        )
+    marcar('tabelas')
     
     # Níveis de FI/RE
     st.subheader("📈 Níveis de Independência Financeira")
     
-    niveis = [
-        {"Nome": "Lean FI", "Multiplicador": 0.5, "Descrição": "Cobre 50% das despesas"},
-        {"Nome": "Flex FI", "Multiplicador": 0.75, "Descrição": "Permite trabalho part-time"},
-        {"Nome": "FI", "Multiplicador": 1.0, "Descrição": "Independência financeira completa"},
-        {"Nome": "Fat FI", "Multiplicador": 1.5, "Descrição": "FI com estilo de vida elevado"},
-        {"Nome": "Obese FI", "Multiplicador": 2.0, "Descrição": "FI com muito conforto"}
-    ]
-    
-    niveis_data = []
-    for nivel in niveis:
-        meta = numero_fire * nivel["Multiplicador"]
-        progresso = (patrimonio_atual / meta * 100) if meta > 0 else 0
-        
-        # Calcular tempo para cada nível
-        p_temp = patrimonio_atual
-        m_temp = 0
-        while p_temp < meta and m_temp < max_meses:
-            p_temp = p_temp * (1 + taxa_mensal) + poupanca_mensal
-            m_temp += 1
-        
-        tempo = m_temp / 12 if p_temp >= meta else None
-        
-        niveis_data.append({
-            "Nível": nivel["Nome"],
-            "Meta": f"R$ {meta:,.0f}",
-            "Progresso": f"{progresso:.1f}%",
-            "Tempo": f"{tempo:.1f} anos" if tempo else "> 50 anos",
-            "Descrição": nivel["Descrição"]
-        })
-    
-    st.dataframe(pd.DataFrame(niveis_data), hide_index=True, use_container_width=True)
+    st.dataframe(resultado['df_niveis'], hide_index=True, use_container_width=True)
     
     # Análise de sensibilidade
     st.subheader("🔬 Análise de Sensibilidade")
@@ -203,50 +337,185 @@ def calcular_fire():
     
     with col1:
         st.write("**Impacto de aumentar poupança mensal:**")
-        aumentos_poupanca = [0, 500, 1000, 2000, 5000]
-        resultados = []
-        
-        for aumento in aumentos_poupanca:
-            nova_poupanca = poupanca_mensal + aumento
-            p_temp = patrimonio_atual
-            m_temp = 0
-            
-            while p_temp < numero_fire and m_temp < max_meses:
-                p_temp = p_temp * (1 + taxa_mensal) + nova_poupanca
-                m_temp += 1
-            
-            if p_temp >= numero_fire:
-                resultados.append({
-                    "Aumento": f"+R$ {aumento}",
-                    "Tempo": f"{m_temp/12:.1f} anos",
-                    "Redução": f"{(meses_fire - m_temp)/12:.1f} anos" if meses_fire else "N/A"
-                })
+        resultados = resultado['df_aumentos']
         
-        if resultados:
-            st.dataframe(pd.DataFrame(resultados), hide_index=True, use_container_width=True)
+        if not resultados.empty:
+            st.dataframe(resultados, hide_index=True, use_container_width=True)
     
     with col2:
         st.write("**Impacto de reduzir despesas mensais:**")
-        reducoes_despesa = [0, 500, 1000, 2000]
-        resultados = []
+        resultados = resultado['df_reducoes']
+        
+        if not resultados.empty:
+            st.dataframe(resultados, hide_index=True, use_container_width=True)
+    marcar('tabelas')
+    
+    # Carteira com várias classes de ativos
+    st.subheader("🧺 Carteira Multiativos")
+    carteira = st.checkbox("Projetar com uma carteira de várias classes de ativos",
+                           help="Cada classe rende com o seu retorno e volatilidade; aportes e rebalanceamento "
+                                "buscam os pesos-alvo. Substitui a taxa de retorno única nesta seção")
+    
+    if carteira:
+        df_classes = st.data_editor(
+            pd.DataFrame(CLASSES_CARTEIRA),
+            num_rows="dynamic",
+            column_config={
+                'Peso (%)': st.column_config.NumberColumn("Peso Alvo (%)", min_value=0.0, max_value=100.0, step=5.0),
+                'Retorno (%/ano)': st.column_config.NumberColumn("Retorno (%/ano)", step=0.5),
+                'Volatilidade (%/ano)': st.column_config.NumberColumn("Volatilidade (%/ano)", min_value=0.0, step=1.0),
+            },
+            hide_index=True,
+            use_container_width=True,
+            key="classes_carteira"
+        )
+        classes = tuple(
+            (str(nome), float(peso), float(retorno), float(volatilidade))
+            for nome, peso, retorno, volatilidade in df_classes[list(CLASSES_CARTEIRA[0])].dropna().itertuples(index=False)
+            if peso > 0
+        )
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            rebalanceamento = st.radio("Rebalanceamento", REBALANCEAMENTOS, index=2)
+            periodo_meses = st.selectbox("A cada (meses)", [3, 6, 12, 24], index=2,
+                                         disabled=rebalanceamento != REBALANCEAMENTO_CALENDARIO)
+            limite_desvio = st.number_input("Desvio Máximo (p.p.)", min_value=0.5, value=5.0, step=0.5,
+                                            disabled=rebalanceamento != REBALANCEAMENTO_LIMITE,
+                                            help="Rebalanceia quando o peso de alguma classe se afasta do alvo mais que isso")
+        with col2:
+            direcionar_aportes = st.checkbox("Direcionar aportes às classes abaixo do alvo", value=True)
+            # Acima de -1 / (classes - 1), no passo do slider: abaixo disso a matriz de correlação não existe
+            correlacao_piso = max(-0.5, float(np.floor(correlacao_minima(len(classes)) * 20 + 1) / 20))
+            correlacao = st.slider("Correlação entre as Classes", min_value=correlacao_piso, max_value=1.0, value=0.3,
+                                   step=0.05, help=f"Com {len(classes)} classes, a partir de {correlacao_piso:.2f}")
+            horizonte_carteira = st.slider("Horizonte (anos)", min_value=5, max_value=MAX_MESES // 12, value=40,
+                                           key="horizonte_carteira")
+        with col3:
+            n_caminhos_carteira = st.select_slider("Caminhos", options=[1000, 2000, 5000, 10000, 20000], value=5000)
+            semente_carteira = st.number_input("Semente", min_value=0, value=42, step=1, key="semente_carteira")
+        marcar('renderizacao')
         
-        for reducao in reducoes_despesa:
-            novas_despesas = max(0, despesas_fire - reducao)
-            novo_numero_fire = novas_despesas * 12 / (taxa_saque / 100)
+        resultado_carteira = None
+        if not classes:
+            st.info("Informe ao menos uma classe com peso positivo na tabela acima")
+        else:
+            soma_pesos = sum(peso for _, peso, _, _ in classes)
+            if abs(soma_pesos - 100) > 1e-6:
+                st.caption(f"Os pesos somam {soma_pesos:.1f}% e foram normalizados para 100%")
+            
+            try:
+                resultado_carteira = _simular_carteira(
+                    patrimonio_atual, poupanca_mensal, idade_atual, classes, correlacao, rebalanceamento,
+                    periodo_meses, limite_desvio, direcionar_aportes, despesas_anuais / (taxa_saque / 100),
+                    taxa_inflacao, horizonte_carteira, n_caminhos_carteira, int(semente_carteira)
+                )
+            except ValueError as erro:
+                st.error(f"⚠️ {erro}")
+        
+        if resultado_carteira is not None:
+            meses_carteira = resultado_carteira['meses_fire']
+            alcancados = meses_carteira[~np.isnan(meses_carteira)]
+            marcar('calculo')
             
-            p_temp = patrimonio_atual
-            m_temp = 0
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                meses_esperado = resultado_carteira['meses_esperado']
+                st.metric("FI/RE na Carteira Esperada",
+                          f"{idade_atual + meses_esperado / 12:.1f} anos" if meses_esperado is not None
+                          else f"> {horizonte_carteira} anos",
+                          help="Idade em que a carteira alcança a meta com cada classe rendendo o retorno esperado")
+            with col2:
+                if len(alcancados) * 2 >= len(meses_carteira):
+                    mediana = np.percentile(np.where(np.isnan(meses_carteira), np.inf, meses_carteira), 50)
+                    st.metric("Idade FI/RE (mediana)", f"{idade_atual + mediana / 12:.1f} anos")
+                else:
+                    st.metric("Idade FI/RE (mediana)", f"> {idade_atual + horizonte_carteira} anos")
+            with col3:
+                st.metric(f"Chance de FI/RE em {horizonte_carteira} anos",
+                          f"{len(alcancados) / len(meses_carteira) * 100:.1f}%")
+            with col4:
+                st.metric("Rebalanceamentos (mediana)", f"{np.median(resultado_carteira['rebalanceamentos']):.0f}",
+                          help=f"Carteira esperada: {resultado_carteira['rebalanceamentos_esperada']}")
+            marcar('renderizacao')
             
-            while p_temp < novo_numero_fire and m_temp < max_meses:
-                p_temp = p_temp * (1 + taxa_mensal) + (poupanca_mensal + reducao)
-                m_temp += 1
+            col1, col2 = st.columns(2)
+            with col1:
+                df_ativos = resultado_carteira['df_ativos']
+                nomes_classes = [nome for nome, _, _, _ in classes]
+                fig_classes = figura('Carteira Esperada por Classe', 'Idade', 'Patrimônio (R$)', altura=400,
+                                     hover_unificado=True)
+                idades_classes, *series_classes = reduzir(df_ativos['Idade'], *(df_ativos[nome] for nome in nomes_classes))
+                for i, (nome, serie) in enumerate(zip(nomes_classes, series_classes)):
+                    fig_classes.add_trace(traco(idades_classes, serie, name=nome, stackgroup='classes',
+                                                line=dict(color=CORES_CLASSES[i % len(CORES_CLASSES)], width=1)))
+                fig_classes.add_trace(traco(*reduzir(df_ativos['Idade'], df_ativos['Meta FI/RE']), name='Meta FI/RE',
+                                            line=dict(color='#d62728', width=2, dash='dash')))
+                marcar('graficos')
+                st.plotly_chart(fig_classes, use_container_width=True)
+            with col2:
+                fig_faixas = figura(f'Patrimônio em {n_caminhos_carteira:,} Caminhos', 'Idade', 'Patrimônio (R$)',
+                                    altura=400, hover_unificado=True)
+                faixas_percentis(fig_faixas, resultado_carteira['idades'], resultado_carteira['percentis'],
+                                 rgb='44, 160, 44')
+                fig_faixas.add_trace(traco(resultado_carteira['idades'], resultado_carteira['metas_anuais'],
+                                           name='Meta FI/RE', line=dict(color='#d62728', width=2, dash='dash')))
+                marcar('graficos')
+                st.plotly_chart(fig_faixas, use_container_width=True)
+            marcar('renderizacao')
             
-            if p_temp >= novo_numero_fire:
-                resultados.append({
-                    "Redução": f"-R$ {reducao}",
-                    "Nova Meta": f"R$ {novo_numero_fire:,.0f}",
-                    "Tempo": f"{m_temp/12:.1f} anos"
-                })
+            st.dataframe(resultado_carteira['df_pesos'].style.format({
+                'Peso Alvo': '{:.1f}%',
+                'Peso Final (esperada)': '{:.1f}%',
+                'Peso Final (média)': '{:.1f}%'
+            }), hide_index=True, use_container_width=True)
+            marcar('tabelas')
+    
+    # Taxa de saque segura
+    st.subheader("🛡️ Taxa de Saque Segura")
+    
+    with st.expander("Buscar a maior taxa de saque sustentável"):
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            horizonte = st.slider("Horizonte (anos)", min_value=10, max_value=60, value=30)
+            probabilidade = st.slider("Probabilidade de Sucesso (%)", min_value=50, max_value=99, value=95)
+        with col2:
+            retorno_real = st.number_input("Retorno Real Esperado (%/ano)", value=max(0.0, round(taxa_retorno - taxa_inflacao, 1)), step=0.1)
+            volatilidade = st.number_input("Volatilidade (%/ano)", min_value=0.0, value=12.0, step=0.5)
+        with col3:
+            n_caminhos = st.selectbox("Número de Simulações", [10000, 50000, 100000, 200000], index=1)
+            semente = st.number_input("Semente", min_value=0, value=42, step=1)
         
-        if resultados:
-            st.dataframe(pd.DataFrame(resultados), hide_index=True, use_container_width=True)
\ No newline at end of file
+        if st.button("Calcular Taxa Segura"):
+            marcar('renderizacao')
+            resultado_saque = _buscar_taxa_saque_segura(
+                horizonte, probabilidade / 100, retorno_real, volatilidade,
+                n_caminhos=n_caminhos, semente=int(semente)
+            )
+            taxa_segura = resultado_saque['taxa_segura']
+            marcar('calculo')
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("Taxa de Saque Segura", f"{taxa_segura:.2f}% ao ano",
+                          delta=f"{taxa_segura - taxa_saque:+.2f} p.p. vs. taxa escolhida")
+            with col2:
+                st.metric("Número FI/RE com Taxa Segura", f"R$ {despesas_anuais / (taxa_segura / 100):,.2f}")
+            
+            marcar('renderizacao')
+            fig_saque = figura(f'Probabilidade de Sucesso em {horizonte} anos por Taxa de Saque',
+                               'Taxa de Saque Anual (%)', 'Sucesso (%)', altura=400)
+            
+            fig_saque.add_trace(traco(
+                *reduzir(resultado_saque['taxas'], resultado_saque['sucesso'] * 100),
+                name='Probabilidade de Sucesso',
+                line=dict(color='#1f77b4', width=3)
+            ))
+            
+            fig_saque.add_vline(x=taxa_saque, line_dash="dash", line_color="red",
+                                annotation_text="Taxa escolhida", annotation_position="top")
+            fig_saque.add_hline(y=probabilidade, line_dash="dot", line_color="gray")
+            marcar('graficos')
+            
+            st.plotly_chart(fig_saque, use_container_width=True)
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""Construção dos gráficos: séries reduzidas por LTTB e layouts reaproveitados."""
+import functools
+
+import numpy as np
+import plotly.graph_objects as go
+
+
+PONTOS_POR_GRAFICO = 200    # orçamento de pontos do eixo x compartilhado após a redução
+CASAS_DECIMAIS = 2          # valores em R$ / %: centavos bastam para o gráfico e o hover
+
+
+def indices_lttb(x, y, pontos):
+    """Índices dos `pontos` pontos escolhidos pelo Largest-Triangle-Three-Buckets.
+
+    Mantém o primeiro e o último ponto e, em cada balde intermediário, o ponto
+    que forma o maior triângulo com o ponto escolhido antes e a média do balde
+    seguinte, preservando picos, vales e degraus da série.
+    """
+    n = len(y)
+    if pontos >= n or pontos < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    bordas = np.append(np.linspace(1, n - 1, pontos - 1).astype(np.intp), n)
+
+    # Média de cada balde (o último é só o ponto final), calculada de uma vez
+    tamanhos = np.diff(bordas)
+    medias_x = np.add.reduceat(x, bordas[:-1]) / tamanhos
+    medias_y = np.add.reduceat(y, bordas[:-1]) / tamanhos
+
+    indices = np.empty(pontos, dtype=np.intp)
+    indices[0], indices[-1] = 0, n - 1
+    anterior = 0
+    for i in range(pontos - 2):
+        inicio, fim = bordas[i], bordas[i + 1]
+        xa, ya = x[anterior], y[anterior]
+        areas = np.abs(
+            (xa - medias_x[i + 1]) * (y[inicio:fim] - ya)
+            - (xa - x[inicio:fim]) * (medias_y[i + 1] - ya)
+        )
+        anterior = inicio + int(areas.argmax())
+        indices[i + 1] = anterior
+    return indices
+
+
+def reduzir(x, *series, pontos=PONTOS_POR_GRAFICO):
+    """Reduz séries que compartilham o eixo `x` a no máximo `pontos` pontos.
+
+    O orçamento é dividido entre as séries: cada uma escolhe a sua parte por
+    LTTB e todas usam a união dos índices, de modo que continuam alinhadas
+    (hover unificado e preenchimentos entre traços) e a união cabe em
+    `pontos`. Séries curtas são devolvidas como estão.
+    """
+    x = np.asarray(x)
+    series = [np.asarray(y) for y in series]
+    if len(x) <= pontos:
+        return (x, *series)
+    por_serie = max(3, pontos // max(len(series), 1))
+    indices = np.unique(np.concatenate([indices_lttb(x, y, por_serie) for y in series]))
+    return (x[indices], *(y[indices] for y in series))
+
+
+def _arredondar(valores, casas):
+    valores = np.asarray(valores)
+    return np.round(valores, casas) if np.issubdtype(valores.dtype, np.floating) else valores
+
+
+def traco(x, y, **propriedades):
+    """Traço de linha/área com valores arredondados; as séries longas chegam já reduzidas por `reduzir`"""
+    return go.Scatter(x=_arredondar(x, 4), y=_arredondar(y, CASAS_DECIMAIS), **propriedades)
+
+
+def faixas_percentis(fig, x, percentis, rgb='31, 119, 180', nome='Mediana'):
+    """Desenha em `fig` as faixas 5–95 e 25–75 e a mediana de `percentis` ({percentil: série}), já reduzidas"""
+    x, p5, p25, p50, p75, p95 = reduzir(x, *(percentis[p] for p in (5, 25, 50, 75, 95)))
+    for baixo, alto, rotulo, opacidade in ((p5, p95, 'Percentis 5–95', 0.15), (p25, p75, 'Percentis 25–75', 0.35)):
+        fig.add_trace(traco(x, alto, line=dict(width=0), showlegend=False, hoverinfo='skip'))
+        fig.add_trace(traco(x, baixo, name=rotulo, fill='tonexty', fillcolor=f'rgba({rgb}, {opacidade})',
+                            line=dict(width=0)))
+    fig.add_trace(traco(x, p50, name=nome, line=dict(color=f'rgb({rgb})', width=3)))
+    return fig
+
+
+def mapa_calor(x, y, z, **propriedades):
+    """Mapa de calor com valores arredondados; `z` tem formato (len(y), len(x))"""
+    return go.Heatmap(x=_arredondar(x, 4), y=_arredondar(y, 4), z=_arredondar(z, CASAS_DECIMAIS), **propriedades)
+
+
+@functools.lru_cache(maxsize=None)
+def _layout(altura, hover_unificado):
+    return go.Layout(height=altura, hovermode='x unified' if hover_unificado else None)
+
+
+def figura(titulo, eixo_x, eixo_y, altura=500, hover_unificado=False):
+    """Figura vazia a partir do layout pré-montado para a altura e o modo de hover"""
+    fig = go.Figure(layout=_layout(altura, hover_unificado))
+    fig.update_layout(title=titulo, xaxis_title=eixo_x, yaxis_title=eixo_y)
+    return fig
\ No newline at end of file
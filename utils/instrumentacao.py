@@ -0,0 +1,139 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+
+
+FASES = ('calculo', 'tabelas', 'graficos', 'renderizacao')
+HISTORICO = int(os.environ.get("CALCULADORA_METRICAS_HISTORICO", 200))
+ARQUIVO_PADRAO = os.environ.get("CALCULADORA_METRICAS_ARQUIVO") or None  # .prom = Prometheus; outro = JSON lines
+
+_local = threading.local()
+_trava = threading.Lock()
+_execucoes = deque(maxlen=HISTORICO)
+_totais = defaultdict(lambda: {'execucoes': 0, 'segundos': 0.0, 'maximo': 0.0})
+
+
+def iniciar_execucao(calculadora):
+    """Começa a cronometrar uma execução (rerun) da `calculadora` na thread atual"""
+    agora = time.perf_counter()
+    _local.execucao = {
+        'calculadora': calculadora,
+        'inicio': time.time(),
+        'fases': dict.fromkeys(FASES, 0.0),
+        '_marca': agora,
+        '_comeco': agora,
+    }
+
+
+def marcar(fase):
+    """Atribui a `fase` o tempo decorrido desde a marca anterior da execução atual.
+
+    Chamado logo após cada trecho do código da calculadora, como as voltas de
+    um cronômetro: `marcar('calculo')` depois da simulação,
+    `marcar('graficos')` depois de montar as figuras e assim por diante. Sem
+    execução em andamento (por exemplo, fora do Streamlit) não faz nada.
+    """
+    execucao = getattr(_local, 'execucao', None)
+    if execucao is None:
+        return
+    agora = time.perf_counter()
+    execucao['fases'][fase] = execucao['fases'].get(fase, 0.0) + agora - execucao['_marca']
+    execucao['_marca'] = agora
+
+
+def finalizar_execucao(arquivo=ARQUIVO_PADRAO):
+    """Encerra a execução atual, acumula os tempos e devolve o registro.
+
+    O tempo desde a última marca conta como renderização. Com `arquivo`, o
+    registro também é exportado: `.prom` regrava as métricas em formato
+    Prometheus; qualquer outra extensão acrescenta uma linha JSON.
+    """
+    execucao = getattr(_local, 'execucao', None)
+    if execucao is None:
+        return None
+    marcar('renderizacao')
+    _local.execucao = None
+
+    registro = {
+        'calculadora': execucao['calculadora'],
+        'inicio': execucao['inicio'],
+        'total': execucao['_marca'] - execucao['_comeco'],
+        'fases': execucao['fases'],
+    }
+    with _trava:
+        _execucoes.append(registro)
+        for fase, segundos in registro['fases'].items():
+            total = _totais[(registro['calculadora'], fase)]
+            total['execucoes'] += 1
+            total['segundos'] += segundos
+            total['maximo'] = max(total['maximo'], segundos)
+
+    if arquivo:
+        if Path(arquivo).suffix.lower() == '.prom':
+            exportar_prometheus(arquivo)
+        else:
+            with open(arquivo, 'a', encoding='utf-8') as saida:
+                saida.write(json.dumps(registro, ensure_ascii=False) + '\n')
+    return registro
+
+
+def execucoes_recentes():
+    """Registros das últimas execuções, da mais antiga para a mais recente"""
+    with _trava:
+        return list(_execucoes)
+
+
+def totais_por_fase():
+    """Tempo acumulado por (calculadora, fase): execuções, segundos e máximo"""
+    with _trava:
+        return {chave: dict(valores) for chave, valores in _totais.items()}
+
+
+def limpar_metricas():
+    """Descarta o histórico e os totais acumulados"""
+    with _trava:
+        _execucoes.clear()
+        _totais.clear()
+
+
+def texto_jsonl():
+    """Execuções recentes em JSON lines, uma por linha"""
+    return ''.join(json.dumps(registro, ensure_ascii=False) + '\n' for registro in execucoes_recentes())
+
+
+def _rotulo(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def texto_prometheus():
+    """Totais por calculadora e fase no formato de texto do Prometheus"""
+    linhas = [
+        "# HELP calculadora_fase_segundos Tempo gasto em cada fase das execuções das calculadoras.",
+        "# TYPE calculadora_fase_segundos summary",
+    ]
+    maximos = [
+        "# HELP calculadora_fase_segundos_max Maior tempo observado em cada fase.",
+        "# TYPE calculadora_fase_segundos_max gauge",
+    ]
+    for (calculadora, fase), total in sorted(totais_por_fase().items()):
+        rotulos = f'{{calculadora="{_rotulo(calculadora)}",fase="{_rotulo(fase)}"}}'
+        linhas.append(f"calculadora_fase_segundos_sum{rotulos} {total['segundos']:.6f}")
+        linhas.append(f"calculadora_fase_segundos_count{rotulos} {total['execucoes']}")
+        maximos.append(f"calculadora_fase_segundos_max{rotulos} {total['maximo']:.6f}")
+    return '\n'.join(linhas + maximos) + '\n'
+
+
+def exportar_jsonl(caminho):
+    """Grava as execuções recentes em `caminho` como JSON lines"""
+    Path(caminho).write_text(texto_jsonl(), encoding='utf-8')
+
+
+def exportar_prometheus(caminho):
+    """Regrava `caminho` com as métricas Prometheus; a troca é atômica para coletores que leem o arquivo"""
+    caminho = Path(caminho)
+    temporario = caminho.with_name(f"{caminho.name}.{threading.get_ident()}.tmp")
+    temporario.write_text(texto_prometheus(), encoding='utf-8')
+    os.replace(temporario, caminho)
\ No newline at end of file
@@ -1,7 +1,131 @@
+import datetime
+
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 
+from .cache import memorizar
+from .exportacao import FORMATOS, exportar_bytes, formatos_disponiveis
+from .graficos import figura, reduzir, traco
+from .instrumentacao import marcar
+from .motor_cdi import carregar_serie, projetar_cdi, versao_serie
+from .motor_ir import projetar_ir
+from .motor_juros import projetar_juros_compostos
+
+
+@memorizar()
+def _simular_juros_compostos(valor_inicial, aporte_mensal, taxa_juros, anos, tipo_aporte, taxa_inflacao):
+    """Núcleo numérico da calculadora: evolução mês a mês e marcos importantes"""
+    meses = anos * 12
+    projecao = projetar_juros_compostos(
+        valor_inicial, aporte_mensal, taxa_juros, meses, tipo_aporte, taxa_inflacao
+    )
+    return _tabela_projecao(projecao, meses)
+
+
+@memorizar()
+def _simular_cdi(valor_inicial, aporte_mensal, percentual_cdi, anos, data_inicio, taxa_cdi, tipo_aporte, taxa_inflacao,
+                 versoes_series=None):
+    """Como `_simular_juros_compostos`, mas rendendo `percentual_cdi` do CDI por dia útil.
+
+    Usa as séries locais do CDI e, com inflação, do IPCA onde houver dados e
+    as taxas informadas no restante do período. `versoes_series` (de
+    `versao_serie`) só entra na chave do cache, para recalcular quando as séries mudam.
+    """
+    meses = anos * 12
+    projecao = projetar_cdi(
+        valor_inicial, aporte_mensal, percentual_cdi, meses, data_inicio, taxa_cdi, tipo_aporte, taxa_inflacao,
+        serie_cdi=carregar_serie('CDI'), serie_ipca=carregar_serie('IPCA') if taxa_inflacao else None
+    )
+    df, df_marcos = _tabela_projecao(projecao, meses)
+    df.insert(1, 'Data', pd.to_datetime(projecao['datas']))
+    marcar('tabelas')
+    return df, df_marcos
+
+
+def _tabela_projecao(projecao, meses):
+    """Evolução mês a mês e marcos importantes de uma projeção.
+
+    Chamada logo após a projeção: marca o fim do cálculo e, depois de montar
+    os DataFrames, a fase de tabelas.
+    """
+    marcar('calculo')
+    saldos = projecao['saldo']
+    
+    df = pd.DataFrame({
+        'Mês': range(meses + 1),
+        'Ano': np.arange(meses + 1) / 12,
+        'Saldo': saldos,
+        'Investido': projecao['investido'],
+        'Juros': projecao['juros'],
+        'Saldo Real': projecao['saldo_real']
+    })
+    
+    # Marcos importantes: primeiro mês em que o saldo alcança cada valor
+    marcos = []
+    valores_marco = [50000, 100000, 250000, 500000, 1000000]
+    
+    atingiu = saldos >= np.array(valores_marco)[:, None]
+    meses_marco = np.where(atingiu.any(axis=1), atingiu.argmax(axis=1), 0)
+    
+    for valor_marco, mes_marco in zip(valores_marco, meses_marco):
+        if mes_marco:
+            anos_marco = mes_marco / 12
+            marcos.append({
+                'Meta': f'R$ {valor_marco:,.0f}',
+                'Tempo': f'{anos_marco:.1f} anos'
+            })
+    
+    df_marcos = pd.DataFrame(marcos)
+    marcar('tabelas')
+    return df, df_marcos
+
+
+@memorizar()
+def _simular_ir(simular, argumentos, resgates, tipo_aporte):
+    """Projeção líquida de IR de `simular(*argumentos)`, com cada aporte como um lote e resgates (mês, valor bruto)"""
+    valor_inicial, aporte_mensal, *demais = argumentos
+    # Fator acumulado da aplicação: a mesma projeção para R$ 1 sem aportes
+    fatores = simular(1.0, 0.0, *demais)[0]['Saldo'].to_numpy()
+    meses = len(fatores) - 1
+    
+    aportes = np.zeros(meses + 1)
+    aportes[0] = valor_inicial
+    if tipo_aporte == "Início do mês":
+        aportes[:-1] += aporte_mensal
+        # O aporte feito no início do mês ainda não aparece no saldo daquele mês, como na projeção
+        pendente = np.where(np.arange(meses + 1) < meses, aporte_mensal, 0.0)
+    else:
+        aportes[1:] += aporte_mensal
+        pendente = np.zeros(meses + 1)
+    valores_resgate = np.zeros(meses + 1)
+    for mes, valor in resgates:
+        if 0 < mes <= meses:
+            valores_resgate[mes] += valor
+    
+    ir = projetar_ir(fatores, aportes, valores_resgate)
+    marcar('calculo')
+    df_ir = pd.DataFrame({
+        'Mês': range(meses + 1),
+        'Ano': np.arange(meses + 1) / 12,
+        'Saldo Bruto': ir['saldo'] - pendente,
+        'Valor Aplicado': ir['custo'] - pendente,
+        'IR Devido': ir['ir'],
+        'Saldo Líquido': ir['saldo_liquido'] - pendente,
+        'Resgatado': ir['resgatado'],
+        'IR Retido': ir['ir_resgates'],
+    })
+    marcar('tabelas')
+    return df_ir
+
+
+@memorizar(tamanho_maximo=8)
+def _arquivo_projecao(formato, simular, *argumentos):
+    """Projeção mês a mês de `simular(*argumentos)` exportada em `formato`"""
+    df, _ = simular(*argumentos)
+    return exportar_bytes(df, formato)
+
 
 def calcular_juros_compostos():
     """Calculadora de Juros Compostos"""
@@ -20,105 +144,85 @@ def calcular_juros_compostos():
     with col2:
         st.subheader("Opções Avançadas")
         tipo_aporte = st.radio("Tipo de Aporte", ["Início do mês", "Fim do mês"])
+        modo_rentabilidade = st.radio("Rentabilidade", ["Taxa fixa", "% do CDI"], horizontal=True,
+                                      help="% do CDI capitaliza por dia útil (base 252), com feriados nacionais")
+        if modo_rentabilidade == "% do CDI":
+            percentual_cdi = st.number_input("Percentual do CDI (%)", min_value=0.0, value=100.0, step=5.0)
+            taxa_cdi = st.number_input("CDI Projetado (%/ano)", min_value=0.0, value=taxa_juros, step=0.1,
+                                       help="Usado nos dias após o fim da série histórica local do CDI")
+            data_inicio = st.date_input("Data da Aplicação", value=datetime.date.today(), format="DD/MM/YYYY")
+            serie_cdi = carregar_serie('CDI')
+            if serie_cdi is not None and len(serie_cdi[0]):
+                st.caption(f"Série histórica do CDI até {pd.Timestamp(serie_cdi[0][-1]):%d/%m/%Y}")
         considerar_inflacao = st.checkbox("Considerar inflação")
         if considerar_inflacao:
             taxa_inflacao = st.number_input("Inflação Anual (%)", min_value=0.0, value=4.0, step=0.1)
         else:
             taxa_inflacao = 0.0
     
-    # Cálculos
-    meses = anos * 12
-    taxa_mensal = (1 + taxa_juros/100) ** (1/12) - 1
-    taxa_inflacao_mensal = (1 + taxa_inflacao/100) ** (1/12) - 1
-    
-    # Simulação mês a mês
-    saldos = []
-    investido = []
-    juros_acumulados = []
-    saldos_reais = []
-    
-    saldo = valor_inicial
-    total_investido = valor_inicial
-    
-    for mes in range(meses + 1):
-        if mes > 0:
-            if tipo_aporte == "Início do mês":
-                saldo += aporte_mensal
-                total_investido += aporte_mensal
-                saldo *= (1 + taxa_mensal)
-            else:
-                saldo *= (1 + taxa_mensal)
-                saldo += aporte_mensal
-                total_investido += aporte_mensal
-        
-        saldos.append(saldo)
-        investido.append(total_investido)
-        juros_acumulados.append(saldo - total_investido)
-        
-        # Valor real (descontando inflação)
-        saldo_real = saldo / ((1 + taxa_inflacao_mensal) ** mes)
-        saldos_reais.append(saldo_real)
+    marcar('renderizacao')
     
-    # Criar DataFrame
-    df = pd.DataFrame({
-        'Mês': range(meses + 1),
-        'Ano': [m/12 for m in range(meses + 1)],
-        'Saldo': saldos,
-        'Investido': investido,
-        'Juros': juros_acumulados,
-        'Saldo Real': saldos_reais
-    })
+    # Cálculos
+    if modo_rentabilidade == "% do CDI":
+        simular = _simular_cdi
+        argumentos = (valor_inicial, aporte_mensal, percentual_cdi, anos, data_inicio, taxa_cdi, tipo_aporte, taxa_inflacao,
+                      (versao_serie('CDI'), versao_serie('IPCA')))
+    else:
+        simular = _simular_juros_compostos
+        argumentos = (valor_inicial, aporte_mensal, taxa_juros, anos, tipo_aporte, taxa_inflacao)
+    df, df_marcos = simular(*argumentos)
+    saldo_final = df['Saldo'].iloc[-1]
+    investido_final = df['Investido'].iloc[-1]
+    juros_final = df['Juros'].iloc[-1]
+    marcar('calculo')
     
     # Métricas principais
     st.subheader("📊 Resultados")
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Valor Final", f"R$ {saldos[-1]:,.2f}")
+        st.metric("Valor Final", f"R$ {saldo_final:,.2f}")
     with col2:
-        st.metric("Total Investido", f"R$ {investido[-1]:,.2f}")
+        st.metric("Total Investido", f"R$ {investido_final:,.2f}")
     with col3:
-        st.metric("Juros Ganhos", f"R$ {juros_acumulados[-1]:,.2f}")
+        st.metric("Juros Ganhos", f"R$ {juros_final:,.2f}")
     with col4:
-        rentabilidade = ((saldos[-1] / investido[-1]) - 1) * 100
+        rentabilidade = ((saldo_final / investido_final) - 1) * 100
         st.metric("Rentabilidade", f"{rentabilidade:.2f}%")
     
+    marcar('renderizacao')
+    
     # Gráfico de evolução
-    fig = go.Figure()
+    fig = figura('Evolução do Investimento', 'Anos', 'Valor (R$)', hover_unificado=True)
+    anos_grafico, saldo, investido, saldo_real = reduzir(df['Ano'], df['Saldo'], df['Investido'], df['Saldo Real'])
     
-    fig.add_trace(go.Scatter(
-        x=df['Ano'],
-        y=df['Saldo'],
+    fig.add_trace(traco(
+        anos_grafico,
+        saldo,
         name='Saldo Total',
         fill='tonexty',
         line=dict(color='#1f77b4', width=3)
     ))
     
-    fig.add_trace(go.Scatter(
-        x=df['Ano'],
-        y=df['Investido'],
+    fig.add_trace(traco(
+        anos_grafico,
+        investido,
         name='Total Investido',
         fill='tozeroy',
         line=dict(color='#ff7f0e', width=2)
     ))
     
     if considerar_inflacao:
-        fig.add_trace(go.Scatter(
-            x=df['Ano'],
-            y=df['Saldo Real'],
+        fig.add_trace(traco(
+            anos_grafico,
+            saldo_real,
             name='Saldo Real (ajustado pela inflação)',
             line=dict(color='#2ca02c', width=2, dash='dash')
         ))
-    
-    fig.update_layout(
-        title='Evolução do Investimento',
-        xaxis_title='Anos',
-        yaxis_title='Valor (R$)',
-        hovermode='x unified',
-        height=500
-    )
+    marcar('graficos')
     
     st.plotly_chart(fig, use_container_width=True)
+    marcar('renderizacao')
     
     # Gráfico de Pizza - Composição Final
     col1, col2 = st.columns(2)
@@ -126,29 +230,79 @@ def calcular_juros_compostos():
     with col1:
         fig_pie = go.Figure(data=[go.Pie(
             labels=['Total Investido', 'Juros Ganhos'],
-            values=[investido[-1], juros_acumulados[-1]],
+            values=[investido_final, juros_final],
             hole=0.4,
             marker_colors=['#ff7f0e', '#1f77b4']
         )])
         fig_pie.update_layout(title='Composição do Valor Final', height=400)
+        marcar('graficos')
         st.plotly_chart(fig_pie, use_container_width=True)
     
     with col2:
         # Tabela de marcos importantes
         st.subheader("🎯 Marcos Importantes")
-        marcos = []
-        valores_marco = [50000, 100000, 250000, 500000, 1000000]
-        
-        for valor_marco in valores_marco:
-            mes_marco = next((i for i, v in enumerate(saldos) if v >= valor_marco), None)
-            if mes_marco:
-                anos_marco = mes_marco / 12
-                marcos.append({
-                    'Meta': f'R$ {valor_marco:,.0f}',
-                    'Tempo': f'{anos_marco:.1f} anos'
-                })
-        
-        if marcos:
-            st.dataframe(pd.DataFrame(marcos), hide_index=True, use_container_width=True)
+        if not df_marcos.empty:
+            st.dataframe(df_marcos, hide_index=True, use_container_width=True)
         else:
-            st.info("Ajuste os parâmetros para ver quando atingirá marcos importantes")
\ No newline at end of file
+            st.info("Ajuste os parâmetros para ver quando atingirá marcos importantes")
+    
+    formatos, ajuda = formatos_disponiveis()
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        formato = st.selectbox("Formato", formatos, help=ajuda, key="formato_projecao")
+    with col2:
+        st.download_button(
+            "⬇️ Baixar projeção mês a mês",
+            _arquivo_projecao(formato, simular, *argumentos),
+            file_name=f"projecao_juros_compostos.{formato}", mime=FORMATOS[formato]
+        )
+    marcar('tabelas')
+    
+    # Imposto de renda por lote, pela tabela regressiva
+    st.subheader("🧾 Imposto de Renda")
+    st.markdown("Cada aporte é tributado como um lote próprio pela tabela regressiva (22,5% até 6 meses, "
+                "20% até 1 ano, 17,5% até 2 anos e 15% depois); os resgates consomem primeiro os lotes mais antigos")
+    
+    df_entrada_resgates = st.data_editor(
+        pd.DataFrame({'Mês': pd.Series(dtype='int64'), 'Valor': pd.Series(dtype=float)}),
+        num_rows="dynamic",
+        column_config={
+            'Mês': st.column_config.NumberColumn("Mês do Resgate", min_value=1, max_value=anos * 12, step=1),
+            'Valor': st.column_config.NumberColumn("Valor Bruto (R$)", min_value=0.0, step=1000.0, format="R$ %.2f"),
+        },
+        hide_index=True,
+        use_container_width=True,
+        key="resgates_ir"
+    )
+    resgates = tuple(
+        (int(mes), float(valor))
+        for mes, valor in df_entrada_resgates[['Mês', 'Valor']].dropna().itertuples(index=False)
+    )
+    marcar('renderizacao')
+    
+    df_ir = _simular_ir(simular, argumentos, resgates, tipo_aporte=tipo_aporte)
+    final = df_ir.iloc[-1]
+    marcar('calculo')
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Valor Líquido Final", f"R$ {final['Saldo Líquido']:,.2f}",
+                  help="Saldo final menos o IR devido se tudo fosse resgatado no último mês")
+    with col2:
+        st.metric("IR no Resgate Final", f"R$ {final['IR Devido']:,.2f}")
+    with col3:
+        rendimento = final['Saldo Bruto'] - final['Valor Aplicado']
+        aliquota_efetiva = final['IR Devido'] / rendimento * 100 if rendimento > 0 else 0.0
+        st.metric("Alíquota Efetiva", f"{aliquota_efetiva:.2f}%")
+    with col4:
+        st.metric("IR Retido nos Resgates", f"R$ {df_ir['IR Retido'].sum():,.2f}",
+                  help=f"Sobre R$ {df_ir['Resgatado'].sum():,.2f} resgatados")
+    marcar('renderizacao')
+    
+    fig_ir = figura('Saldo Bruto e Líquido de IR', 'Anos', 'Valor (R$)', hover_unificado=True)
+    anos_ir, bruto, liquido = reduzir(df_ir['Ano'], df_ir['Saldo Bruto'], df_ir['Saldo Líquido'])
+    fig_ir.add_trace(traco(anos_ir, bruto, name='Saldo Bruto', line=dict(color='#1f77b4', width=2)))
+    fig_ir.add_trace(traco(anos_ir, liquido, name='Saldo Líquido', line=dict(color='#2ca02c', width=3)))
+    marcar('graficos')
+    
+    st.plotly_chart(fig_ir, use_container_width=True)
\ No newline at end of file
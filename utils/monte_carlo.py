@@ -0,0 +1,125 @@
+import numpy as np
+
+
+PERCENTIS = (5, 25, 50, 75, 95)
+
+
+def gerar_retornos(rng, n_caminhos, meses, retorno_anual, volatilidade_anual):
+    """Matriz (n_caminhos, meses) de retornos mensais log-normais.
+
+    `retorno_anual` e `volatilidade_anual` em %. O retorno esperado de cada
+    mês é a taxa mensal equivalente a `retorno_anual`.
+    """
+    media = np.log1p(retorno_anual / 100) / 12
+    desvio = volatilidade_anual / 100 / np.sqrt(12)
+    log_retornos = rng.normal(media - desvio ** 2 / 2, desvio, size=(n_caminhos, meses))
+    return np.expm1(log_retornos)
+
+
+def gerar_inflacao(rng, n_caminhos, meses, inflacao_anual, volatilidade_anual):
+    """Matriz (n_caminhos, meses) de inflação mensal (decimal) com distribuição normal"""
+    media = (1 + inflacao_anual / 100) ** (1 / 12) - 1
+    desvio = volatilidade_anual / 100 / np.sqrt(12)
+    return rng.normal(media, desvio, size=(n_caminhos, meses))
+
+
+def evoluir_patrimonio(patrimonio_inicial, retornos, fluxos):
+    """Evolução de `p = p * (1 + r) + fluxo` para todos os caminhos de uma vez.
+
+    Usa a forma fechada com produto acumulado G_k = prod(1 + r):
+    p_k = G_k * (p_0 + soma(fluxo_j / G_j)). Retorna (n_caminhos, meses + 1),
+    com a coluna 0 igual ao patrimônio inicial.
+    """
+    crescimento = np.cumprod(1 + retornos, axis=1)
+    patrimonio = crescimento * (patrimonio_inicial + np.cumsum(fluxos / crescimento, axis=1))
+    inicial = np.broadcast_to(patrimonio_inicial, (retornos.shape[0], 1))
+    return np.concatenate([inicial, patrimonio], axis=1)
+
+
+def _simular_lote(rng, n_caminhos, patrimonio_atual, aporte_mensal, renda_mensal_desejada,
+                  meses_acumulacao, meses_aposentado, taxa_acumulacao, volatilidade_acumulacao,
+                  taxa_aposentadoria, volatilidade_aposentadoria, taxa_inflacao, volatilidade_inflacao):
+    """Simula um lote de caminhos; retorna patrimônio real e mês de ruína"""
+    meses = meses_acumulacao + meses_aposentado
+
+    retornos = np.concatenate([
+        gerar_retornos(rng, n_caminhos, meses_acumulacao, taxa_acumulacao, volatilidade_acumulacao),
+        gerar_retornos(rng, n_caminhos, meses_aposentado, taxa_aposentadoria, volatilidade_aposentadoria),
+    ], axis=1)
+    indice_precos = np.cumprod(1 + gerar_inflacao(rng, n_caminhos, meses, taxa_inflacao, volatilidade_inflacao), axis=1)
+
+    # Aporte e renda em valores de hoje, corrigidos pela inflação de cada caminho
+    fluxos = indice_precos * np.concatenate([
+        np.full(meses_acumulacao, aporte_mensal),
+        np.full(meses_aposentado, -renda_mensal_desejada),
+    ])
+    patrimonio = evoluir_patrimonio(patrimonio_atual, retornos, fluxos)
+
+    # Ruína: primeiro mês da aposentadoria com patrimônio negativo; depois disso fica zerado
+    negativo = patrimonio[:, meses_acumulacao + 1:] < 0
+    arruinado = negativo.any(axis=1)
+    mes_ruina = np.where(arruinado, meses_acumulacao + 1 + negativo.argmax(axis=1), -1)
+    apos_ruina = np.arange(meses + 1) >= np.where(arruinado, mes_ruina, meses + 1)[:, None]
+    patrimonio[apos_ruina] = 0.0
+
+    deflator = np.concatenate([np.ones((n_caminhos, 1)), indice_precos], axis=1)
+    patrimonio_real = patrimonio / deflator
+    return patrimonio_real, mes_ruina
+
+
+def simular_aposentadoria_monte_carlo(patrimonio_atual, aporte_mensal, renda_mensal_desejada,
+                                      idade_atual, idade_aposentadoria, expectativa_vida,
+                                      taxa_acumulacao, volatilidade_acumulacao,
+                                      taxa_aposentadoria, volatilidade_aposentadoria,
+                                      taxa_inflacao, volatilidade_inflacao=1.0,
+                                      n_caminhos=10000, semente=None, tamanho_lote=2000, guardar_caminhos=False):
+    """Simulação estocástica das fases de acumulação e usufruto.
+
+    Cada lote de até `tamanho_lote` caminhos é uma matriz (caminhos x meses)
+    processada de forma vetorizada; só o patrimônio anual de cada caminho é
+    guardado, então a memória fica limitada mesmo com 100 mil caminhos em 70
+    anos. Cada lote usa um gerador filho de `SeedSequence(semente)`, de modo
+    que a mesma semente e o mesmo `tamanho_lote` reproduzem o resultado.
+
+    Taxas e volatilidades em % ao ano. Valores em reais de hoje. Retorna um
+    dicionário com 'probabilidade_sucesso', 'idades' (pontos anuais),
+    'percentis' ({percentil: patrimônio real por idade}) e 'idades_ruina'
+    (idade de esgotamento dos caminhos que falharam). Com `guardar_caminhos`,
+    inclui também 'patrimonio_anual' (caminhos x idades, float32).
+    """
+    meses_acumulacao = int(idade_aposentadoria - idade_atual) * 12
+    meses_aposentado = int(expectativa_vida - idade_aposentadoria) * 12
+    meses = meses_acumulacao + meses_aposentado
+
+    n_lotes = -(-n_caminhos // tamanho_lote)
+    sementes = np.random.SeedSequence(semente).spawn(n_lotes)
+
+    patrimonio_anual = np.empty((n_caminhos, meses // 12 + 1), dtype=np.float32)
+    meses_ruina = np.empty(n_caminhos, dtype=np.int64)
+
+    for lote, semente_lote in enumerate(sementes):
+        inicio = lote * tamanho_lote
+        fim = min(inicio + tamanho_lote, n_caminhos)
+        patrimonio_real, mes_ruina = _simular_lote(
+            np.random.default_rng(semente_lote), fim - inicio,
+            patrimonio_atual, aporte_mensal, renda_mensal_desejada,
+            meses_acumulacao, meses_aposentado,
+            taxa_acumulacao, volatilidade_acumulacao,
+            taxa_aposentadoria, volatilidade_aposentadoria,
+            taxa_inflacao, volatilidade_inflacao
+        )
+        patrimonio_anual[inicio:fim] = patrimonio_real[:, ::12]
+        meses_ruina[inicio:fim] = mes_ruina
+
+    arruinados = meses_ruina >= 0
+    percentis = np.percentile(patrimonio_anual, PERCENTIS, axis=0)
+
+    resultado = {
+        'probabilidade_sucesso': 1 - arruinados.mean(),
+        'idades': idade_atual + np.arange(patrimonio_anual.shape[1]),
+        'percentis': dict(zip(PERCENTIS, percentis)),
+        'idades_ruina': idade_atual + meses_ruina[arruinados] / 12,
+    }
+    if guardar_caminhos:
+        resultado['patrimonio_anual'] = patrimonio_anual
+    return resultado
\ No newline at end of file
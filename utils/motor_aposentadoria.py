@@ -0,0 +1,193 @@
+import numpy as np
+
+from .motor_juros import taxa_mensal_equivalente
+
+
+def valor_futuro(valor_presente, aporte_mensal, taxa_mensal, meses):
+    """Patrimônio após `meses` com aportes no fim do mês (forma fechada, com broadcasting)"""
+    fator = (1 + taxa_mensal) ** meses
+    sem_juros = taxa_mensal == 0
+    serie = np.where(sem_juros, meses, (fator - 1) / np.where(sem_juros, 1.0, taxa_mensal))
+    return valor_presente * fator + aporte_mensal * serie
+
+
+def valor_presente_renda(renda_mensal, taxa_mensal, meses):
+    """Patrimônio necessário para pagar `renda_mensal` por `meses` (anuidade)"""
+    sem_juros = taxa_mensal == 0
+    taxa_segura = np.where(sem_juros, 1.0, taxa_mensal)
+    return np.where(
+        sem_juros,
+        renda_mensal * meses,
+        renda_mensal * ((1 - (1 + taxa_segura) ** (-meses)) / taxa_segura)
+    )
+
+
+def renda_de_patrimonio(patrimonio, taxa_mensal, meses):
+    """Renda mensal que esgota `patrimonio` em exatamente `meses` (inverso da anuidade)"""
+    sem_juros = taxa_mensal == 0
+    taxa_segura = np.where(sem_juros, 1.0, taxa_mensal)
+    fator = (1 + taxa_segura) ** meses
+    return np.where(
+        sem_juros,
+        patrimonio / meses,
+        patrimonio * (taxa_segura * fator) / (fator - 1)
+    )
+
+
+def resumir_aposentadoria(idade_atual, patrimonio_atual, aporte_mensal, idade_aposentadoria,
+                          renda_mensal_desejada, expectativa_vida, taxa_acumulacao, taxa_aposentadoria):
+    """Resultados do planejamento de aposentadoria em forma fechada.
+
+    Mesmas fórmulas de `calcular_aposentadoria`, com todos os parâmetros
+    combinados por broadcasting (taxas em % ao ano). Retorna um dicionário de
+    arrays com 'patrimonio_aposentadoria', 'patrimonio_necessario',
+    'diferenca', 'renda_sustentavel' e 'aporte_necessario'.
+    """
+    meses_acumulacao = (np.asarray(idade_aposentadoria) - np.asarray(idade_atual)) * 12
+    meses_aposentado = (np.asarray(expectativa_vida) - np.asarray(idade_aposentadoria)) * 12
+    taxa_mensal_acum = taxa_mensal_equivalente(taxa_acumulacao)
+    taxa_mensal_apos = taxa_mensal_equivalente(taxa_aposentadoria)
+    patrimonio_atual = np.asarray(patrimonio_atual, dtype=float)
+
+    patrimonio_aposentadoria = valor_futuro(patrimonio_atual, aporte_mensal, taxa_mensal_acum, meses_acumulacao)
+    patrimonio_necessario = valor_presente_renda(renda_mensal_desejada, taxa_mensal_apos, meses_aposentado)
+
+    # Aporte que leva o patrimônio atual até o necessário
+    aporte_necessario = (
+        patrimonio_necessario - valor_futuro(patrimonio_atual, 0.0, taxa_mensal_acum, meses_acumulacao)
+    ) / valor_futuro(0.0, 1.0, taxa_mensal_acum, meses_acumulacao)
+
+    return {
+        'patrimonio_aposentadoria': patrimonio_aposentadoria,
+        'patrimonio_necessario': patrimonio_necessario,
+        'diferenca': patrimonio_aposentadoria - patrimonio_necessario,
+        'renda_sustentavel': renda_de_patrimonio(patrimonio_aposentadoria, taxa_mensal_apos, meses_aposentado),
+        'aporte_necessario': aporte_necessario,
+    }
+
+
+def sensibilidade_aposentadoria(parametros, nome_x, valores_x, nome_y, valores_y):
+    """Superfícies de `resumir_aposentadoria` sobre uma grade de dois parâmetros.
+
+    `parametros` traz todos os argumentos de `resumir_aposentadoria`; os
+    parâmetros `nome_x` e `nome_y` são trocados por `valores_x` (colunas) e
+    `valores_y` (linhas) e a grade inteira sai de uma única chamada por
+    broadcasting. Retorna o mesmo dicionário com arrays
+    (len(valores_y), len(valores_x)); combinações sem fase de acumulação ou
+    de usufruto (idades fora de ordem) ficam com NaN.
+    """
+    if nome_x == nome_y:
+        raise ValueError("Escolha dois parâmetros diferentes para a grade")
+
+    argumentos = dict(parametros)
+    argumentos[nome_x] = np.asarray(valores_x, dtype=float)[None, :]
+    argumentos[nome_y] = np.asarray(valores_y, dtype=float)[:, None]
+    forma = (len(valores_y), len(valores_x))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        resultado = resumir_aposentadoria(**argumentos)
+    valido = np.broadcast_to(
+        (np.asarray(argumentos['idade_aposentadoria']) > np.asarray(argumentos['idade_atual']))
+        & (np.asarray(argumentos['expectativa_vida']) > np.asarray(argumentos['idade_aposentadoria'])),
+        forma
+    )
+    return {chave: np.where(valido, np.broadcast_to(valores, forma), np.nan) for chave, valores in resultado.items()}
+
+
+def idade_minima_aposentadoria(idade_atual, patrimonio_atual, aporte_mensal, renda_mensal_desejada,
+                               expectativa_vida, taxa_acumulacao, taxa_aposentadoria):
+    """Menor idade (em meses inteiros) em que o plano cobre a renda desejada até a expectativa de vida.
+
+    Adiar a aposentadoria aumenta o patrimônio acumulado e encurta o usufruto,
+    então o excedente cresce com a idade e a resposta é encontrada por
+    bissecção inteira sobre o mês de aposentadoria, vetorizada sobre todos os
+    parâmetros. NaN quando nem aposentando um mês antes da expectativa de
+    vida a meta é atingida.
+    """
+    idade_atual, patrimonio_atual, aporte_mensal, renda_mensal_desejada, expectativa_vida, taxa_acumulacao, \
+        taxa_aposentadoria = np.broadcast_arrays(*(np.asarray(valor, dtype=float) for valor in (
+            idade_atual, patrimonio_atual, aporte_mensal, renda_mensal_desejada, expectativa_vida,
+            taxa_acumulacao, taxa_aposentadoria
+        )))
+    taxa_mensal_acum = taxa_mensal_equivalente(taxa_acumulacao)
+    taxa_mensal_apos = taxa_mensal_equivalente(taxa_aposentadoria)
+    meses_totais = np.round((expectativa_vida - idade_atual) * 12).astype(int)
+
+    def excedente(meses):
+        return (
+            valor_futuro(patrimonio_atual, aporte_mensal, taxa_mensal_acum, meses)
+            - valor_presente_renda(renda_mensal_desejada, taxa_mensal_apos, meses_totais - meses)
+        )
+
+    # Invariante: excedente(baixo) < 0 <= excedente(alto)
+    baixo = np.zeros_like(meses_totais)
+    alto = np.maximum(meses_totais - 1, 0)
+    viavel = (meses_totais > 0) & (excedente(alto) >= 0)
+    imediato = excedente(baixo) >= 0
+    while np.any(alto - baixo > 1):
+        meio = (baixo + alto) // 2
+        atingiu = excedente(meio) >= 0
+        alto = np.where(atingiu, meio, alto)
+        baixo = np.where(atingiu, baixo, meio)
+
+    meses = np.where(imediato, 0, alto)
+    return np.where(viavel, idade_atual + meses / 12, np.nan)
+
+
+def taxa_acumulacao_necessaria(idade_atual, patrimonio_atual, aporte_mensal, idade_aposentadoria,
+                               renda_mensal_desejada, expectativa_vida, taxa_aposentadoria,
+                               tolerancia=1e-10):
+    """Rentabilidade anual (%) na acumulação que leva o patrimônio exatamente ao necessário.
+
+    O patrimônio acumulado cresce com a taxa, então a raiz é isolada por
+    bissecção vetorizada em [-50%, 100%] ao ano. NaN quando a meta não é
+    atingível nesse intervalo (por exemplo, sem patrimônio nem aportes).
+    """
+    meses_acumulacao = (np.asarray(idade_aposentadoria) - np.asarray(idade_atual)) * 12
+    meses_aposentado = (np.asarray(expectativa_vida) - np.asarray(idade_aposentadoria)) * 12
+    patrimonio_necessario = valor_presente_renda(
+        renda_mensal_desejada, taxa_mensal_equivalente(taxa_aposentadoria), meses_aposentado
+    )
+    patrimonio_atual = np.asarray(patrimonio_atual, dtype=float)
+
+    def excedente(taxa_anual):
+        return valor_futuro(patrimonio_atual, aporte_mensal, taxa_mensal_equivalente(taxa_anual), meses_acumulacao) \
+            - patrimonio_necessario
+
+    forma = np.broadcast(patrimonio_atual, aporte_mensal, meses_acumulacao, patrimonio_necessario).shape
+    baixo = np.full(forma, -50.0)
+    alto = np.full(forma, 100.0)
+    viavel = (excedente(baixo) <= 0) & (excedente(alto) >= 0)
+    while np.any(alto - baixo > tolerancia):
+        meio = (baixo + alto) / 2
+        atingiu = excedente(meio) >= 0
+        alto = np.where(atingiu, meio, alto)
+        baixo = np.where(atingiu, baixo, meio)
+
+    return np.where(viavel, alto, np.nan)
+
+
+def metas_aposentadoria(idade_atual, patrimonio_atual, aporte_mensal, idade_aposentadoria,
+                        renda_mensal_desejada, expectativa_vida, taxa_acumulacao, taxa_aposentadoria):
+    """Cada variável do plano resolvida para atingir a meta, mantendo as demais fixas.
+
+    Retorna um dicionário de arrays com 'idade_minima' (anos), 'aporte_necessario'
+    (R$/mês), 'taxa_acumulacao_necessaria' (% ao ano) e 'renda_maxima' (R$/mês).
+    Aporte e renda têm forma fechada; idade e taxa usam bissecção vetorizada.
+    """
+    resumo = resumir_aposentadoria(
+        idade_atual, patrimonio_atual, aporte_mensal, idade_aposentadoria,
+        renda_mensal_desejada, expectativa_vida, taxa_acumulacao, taxa_aposentadoria
+    )
+    return {
+        'idade_minima': idade_minima_aposentadoria(
+            idade_atual, patrimonio_atual, aporte_mensal, renda_mensal_desejada,
+            expectativa_vida, taxa_acumulacao, taxa_aposentadoria
+        ),
+        'aporte_necessario': resumo['aporte_necessario'],
+        'taxa_acumulacao_necessaria': taxa_acumulacao_necessaria(
+            idade_atual, patrimonio_atual, aporte_mensal, idade_aposentadoria,
+            renda_mensal_desejada, expectativa_vida, taxa_aposentadoria
+        ),
+        'renda_maxima': resumo['renda_sustentavel'],
+    }
\ No newline at end of file
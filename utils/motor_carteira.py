@@ -0,0 +1,206 @@
+import numpy as np
+
+from .monte_carlo import PERCENTIS
+
+
+REBALANCEAMENTO_NENHUM = "Sem rebalanceamento"
+REBALANCEAMENTO_CALENDARIO = "Calendário"
+REBALANCEAMENTO_LIMITE = "Limite de desvio"
+REBALANCEAMENTOS = (REBALANCEAMENTO_NENHUM, REBALANCEAMENTO_CALENDARIO, REBALANCEAMENTO_LIMITE)
+
+
+def correlacao_minima(n_ativos):
+    """Menor correlação única entre todos os pares que ainda forma uma matriz válida: -1 / (n_ativos - 1)"""
+    return -1.0 / (n_ativos - 1) if n_ativos > 1 else -1.0
+
+
+def matriz_correlacao(correlacao, n_ativos):
+    """Matriz (n_ativos, n_ativos) a partir de uma matriz ou de uma correlação única entre todos os pares.
+
+    Levanta ValueError se o resultado não for uma matriz de correlação
+    (simétrica, com diagonal 1 e positiva semidefinida).
+    """
+    correlacao = np.asarray(correlacao, dtype=float)
+    if correlacao.ndim == 0:
+        if not correlacao_minima(n_ativos) <= correlacao <= 1:
+            raise ValueError(f"Com {n_ativos} classes a correlação entre todos os pares precisa ficar entre "
+                             f"{correlacao_minima(n_ativos):.2f} e 1")
+        return np.full((n_ativos, n_ativos), float(correlacao)) + (1 - correlacao) * np.eye(n_ativos)
+    if correlacao.shape != (n_ativos, n_ativos):
+        raise ValueError(f"A matriz de correlação deve ter formato ({n_ativos}, {n_ativos})")
+    if not np.allclose(correlacao, correlacao.T) or not np.allclose(np.diag(correlacao), 1.0):
+        raise ValueError("A matriz de correlação deve ser simétrica e ter 1 na diagonal")
+    if np.linalg.eigvalsh(correlacao).min() < -1e-10:
+        raise ValueError("As correlações informadas são incompatíveis entre si (a matriz não é positiva semidefinida)")
+    return correlacao
+
+
+def _fator_correlacao(correlacao):
+    """Fator F com F @ F.T = `correlacao`: Cholesky ou, se a matriz for singular (ex.: correlação 1), autovetores"""
+    try:
+        return np.linalg.cholesky(correlacao)
+    except np.linalg.LinAlgError:
+        autovalores, autovetores = np.linalg.eigh(correlacao)
+        return autovetores * np.sqrt(np.maximum(autovalores, 0.0))
+
+
+def gerar_retornos_ativos(rng, n_caminhos, meses, retornos_anuais, volatilidades_anuais, correlacao=0.0):
+    """Tensor (n_caminhos, meses, n_ativos) de retornos mensais log-normais correlacionados.
+
+    Cada ativo tem a mesma distribuição de `gerar_retornos` com o seu
+    `retornos_anuais` e `volatilidades_anuais` (em %); os choques dos ativos
+    num mesmo mês são correlacionados pela decomposição de Cholesky de
+    `correlacao` (matriz ou valor único para todos os pares, validada por
+    `matriz_correlacao`).
+    """
+    retornos_anuais = np.asarray(retornos_anuais, dtype=float)
+    volatilidades_anuais = np.asarray(volatilidades_anuais, dtype=float)
+    n_ativos = len(retornos_anuais)
+    media = np.log1p(retornos_anuais / 100) / 12
+    desvio = volatilidades_anuais / 100 / np.sqrt(12)
+    fator = _fator_correlacao(matriz_correlacao(correlacao, n_ativos))
+    choques = rng.standard_normal((n_caminhos, meses, n_ativos)) @ fator.T
+    return np.expm1(media - desvio ** 2 / 2 + desvio * choques)
+
+
+def distribuir_aportes(saldos, aportes, pesos_alvo, direcionar=False):
+    """Parte do aporte de cada caminho que vai para cada ativo, com formato de `saldos` (caminhos, ativos).
+
+    Sem `direcionar`, o aporte segue os pesos-alvo. Com `direcionar`, vai para
+    os ativos abaixo do alvo, na proporção do que falta a cada um para o peso
+    alvo da carteira já com o aporte; como essas faltas somam pelo menos o
+    aporte, nenhum ativo acima do alvo recebe nada. Retiradas (aportes
+    negativos) sempre seguem os pesos-alvo.
+    """
+    aportes = np.asarray(aportes, dtype=float)[..., None]
+    if not direcionar:
+        return aportes * pesos_alvo
+    faltas = pesos_alvo * (saldos.sum(axis=-1, keepdims=True) + aportes) - saldos
+    np.maximum(faltas, 0.0, out=faltas)
+    soma_faltas = faltas.sum(axis=-1, keepdims=True)
+    direcionado = (aportes > 0) & (soma_faltas > 0)
+    proporcao = np.where(direcionado, faltas / np.where(direcionado, soma_faltas, 1.0), pesos_alvo)
+    return aportes * proporcao
+
+
+def evoluir_carteira(saldos_iniciais, retornos, aportes, pesos_alvo, rebalanceamento=REBALANCEAMENTO_NENHUM,
+                     periodo_meses=12, limite_desvio=5.0, direcionar_aportes=False, guardar_ativos=False):
+    """Evolução mês a mês de uma carteira de vários ativos em todos os caminhos de uma vez.
+
+    `retornos` tem formato (n_caminhos, meses, n_ativos); `saldos_iniciais`
+    (n_ativos,) ou (n_caminhos, n_ativos); `aportes` é um valor, um array
+    (meses,) ou (n_caminhos, meses), aplicado no fim de cada mês; `pesos_alvo`
+    soma 1. A cada mês os saldos rendem, o aporte é distribuído
+    (`distribuir_aportes`) e a carteira volta aos pesos-alvo conforme
+    `rebalanceamento`: a cada `periodo_meses` meses (calendário) ou quando o
+    peso de algum ativo se afasta mais de `limite_desvio` p.p. do alvo.
+
+    O laço percorre só os meses; cada passo é uma operação sobre a matriz
+    (caminhos, ativos), então o custo cresce com o número de meses como o da
+    projeção com taxa única. Retorna um dicionário com 'patrimonio'
+    (n_caminhos, meses + 1), 'saldos_finais' (n_caminhos, n_ativos) e
+    'rebalanceamentos' (quantos em cada caminho); com `guardar_ativos`,
+    também 'saldos' (n_caminhos, meses + 1, n_ativos).
+    """
+    if rebalanceamento not in REBALANCEAMENTOS:
+        raise ValueError(f"Rebalanceamento desconhecido: '{rebalanceamento}'. Use um de: {', '.join(REBALANCEAMENTOS)}")
+    retornos = np.asarray(retornos, dtype=float)
+    n_caminhos, meses, n_ativos = retornos.shape
+    # Um bloco contíguo (caminhos, ativos) por mês
+    fatores = np.ascontiguousarray(np.moveaxis(retornos, 1, 0)) + 1
+    pesos_alvo = np.asarray(pesos_alvo, dtype=float)
+    aportes = np.broadcast_to(np.asarray(aportes, dtype=float), (n_caminhos, meses))
+    saldos = np.array(np.broadcast_to(np.asarray(saldos_iniciais, dtype=float), (n_caminhos, n_ativos)))
+
+    patrimonio = np.empty((n_caminhos, meses + 1))
+    patrimonio[:, 0] = saldos.sum(axis=1)
+    if guardar_ativos:
+        historico = np.empty((n_caminhos, meses + 1, n_ativos))
+        historico[:, 0] = saldos
+    rebalanceamentos = np.zeros(n_caminhos, dtype=np.int64)
+    limite = limite_desvio / 100
+
+    for mes in range(meses):
+        saldos *= fatores[mes]
+        saldos += distribuir_aportes(saldos, aportes[:, mes], pesos_alvo, direcionar_aportes)
+        total = saldos.sum(axis=1, keepdims=True)
+
+        if rebalanceamento == REBALANCEAMENTO_CALENDARIO and (mes + 1) % periodo_meses == 0:
+            saldos = total * pesos_alvo
+            rebalanceamentos += 1
+        elif rebalanceamento == REBALANCEAMENTO_LIMITE:
+            # |peso - alvo| > limite, sem dividir pelo total
+            fora = np.abs(saldos - total * pesos_alvo).max(axis=1) > limite * total[:, 0]
+            if fora.any():
+                saldos[fora] = total[fora] * pesos_alvo
+                rebalanceamentos += fora
+
+        patrimonio[:, mes + 1] = total[:, 0]
+        if guardar_ativos:
+            historico[:, mes + 1] = saldos
+
+    resultado = {'patrimonio': patrimonio, 'saldos_finais': saldos, 'rebalanceamentos': rebalanceamentos}
+    if guardar_ativos:
+        resultado['saldos'] = historico
+    return resultado
+
+
+def meses_ate_metas(patrimonio, metas):
+    """Primeiro mês k em que `patrimonio[:, k]` alcança `metas[k]` (NaN se nunca); `metas` tem formato (meses + 1,)"""
+    alcancou = patrimonio >= metas
+    return np.where(alcancou.any(axis=1), alcancou.argmax(axis=1), np.nan)
+
+
+def simular_carteira(patrimonio_atual, aporte_mensal, pesos_alvo, retornos_anuais, volatilidades_anuais, meses,
+                     correlacao=0.0, rebalanceamento=REBALANCEAMENTO_NENHUM, periodo_meses=12, limite_desvio=5.0,
+                     direcionar_aportes=False, metas=None, n_caminhos=10000, semente=None, tamanho_lote=2000):
+    """Simulação estocástica de uma carteira de vários ativos com aportes e rebalanceamento.
+
+    Os caminhos de retorno vêm de `gerar_retornos_ativos` e são processados
+    em lotes de até `tamanho_lote` caminhos por `evoluir_carteira`, cada lote
+    com um gerador filho de `SeedSequence(semente)`, como em
+    `simular_aposentadoria_monte_carlo`. O patrimônio atual começa nos
+    pesos-alvo (que são normalizados para somar 1). Com `metas` (meta de cada
+    mês, formato (meses + 1,)) calcula o mês em que cada caminho a alcança.
+
+    Retorna um dicionário com 'anos' (pontos anuais), 'percentis'
+    ({percentil: patrimônio por ano}), 'pesos_finais' (média entre os
+    caminhos), 'rebalanceamentos' (por caminho) e, com `metas`, 'meses_meta'
+    (por caminho, NaN onde a meta não é alcançada).
+    """
+    pesos_alvo = np.asarray(pesos_alvo, dtype=float)
+    pesos_alvo = pesos_alvo / pesos_alvo.sum()
+    meses = int(meses)
+
+    n_lotes = -(-n_caminhos // tamanho_lote)
+    sementes = np.random.SeedSequence(semente).spawn(n_lotes)
+
+    patrimonio_anual = np.empty((n_caminhos, meses // 12 + 1), dtype=np.float32)
+    pesos_finais = np.zeros(len(pesos_alvo))
+    rebalanceamentos = np.empty(n_caminhos, dtype=np.int64)
+    meses_meta = np.empty(n_caminhos)
+
+    for lote, semente_lote in enumerate(sementes):
+        inicio = lote * tamanho_lote
+        fim = min(inicio + tamanho_lote, n_caminhos)
+        retornos = gerar_retornos_ativos(np.random.default_rng(semente_lote), fim - inicio, meses,
+                                         retornos_anuais, volatilidades_anuais, correlacao)
+        evolucao = evoluir_carteira(patrimonio_atual * pesos_alvo, retornos, aporte_mensal, pesos_alvo,
+                                    rebalanceamento, periodo_meses, limite_desvio, direcionar_aportes)
+        patrimonio_anual[inicio:fim] = evolucao['patrimonio'][:, ::12]
+        saldos = evolucao['saldos_finais']
+        pesos_finais += np.divide(saldos, saldos.sum(axis=1, keepdims=True), out=np.zeros_like(saldos),
+                                  where=saldos.sum(axis=1, keepdims=True) > 0).sum(axis=0)
+        rebalanceamentos[inicio:fim] = evolucao['rebalanceamentos']
+        if metas is not None:
+            meses_meta[inicio:fim] = meses_ate_metas(evolucao['patrimonio'], metas)
+
+    resultado = {
+        'anos': np.arange(patrimonio_anual.shape[1]),
+        'percentis': dict(zip(PERCENTIS, np.percentile(patrimonio_anual, PERCENTIS, axis=0))),
+        'pesos_finais': pesos_finais / n_caminhos,
+        'rebalanceamentos': rebalanceamentos,
+    }
+    if metas is not None:
+        resultado['meses_meta'] = meses_meta
+    return resultado
\ No newline at end of file
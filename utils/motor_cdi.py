@@ -0,0 +1,204 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from .calendario import DIAS_UTEIS_ANO, DIRETORIO_DADOS, calendario_periodo, converter_datas, dias_uteis, somar_meses
+from .cache import memorizar
+from .motor_juros import TIPOS_APORTE
+
+
+# Séries locais em DIRETORIO_DADOS: CSV com data e taxa, ou o CSV exportado pelo SGS do Banco Central
+SERIES = {
+    'CDI': 'cdi.csv',      # % ao ano, base 252 (SGS 4389)
+    'SELIC': 'selic.csv',  # % ao ano, base 252 (SGS 1178)
+    'IPCA': 'ipca.csv',    # % ao mês (SGS 433)
+    'TR': 'tr.csv',        # % ao mês (SGS 7811)
+}
+
+
+def _caminho_serie(nome_ou_caminho):
+    """Arquivo de uma das chaves de `SERIES` ou o próprio caminho informado"""
+    return DIRETORIO_DADOS / SERIES[nome_ou_caminho] if nome_ou_caminho in SERIES else nome_ou_caminho
+
+
+def versao_serie(nome_ou_caminho):
+    """Instante da última modificação (ns) do arquivo da série, ou None se ele não existir.
+
+    Funções em cache que leem séries recebem a versão como argumento, para
+    que a edição do arquivo também invalide os resultados delas.
+    """
+    try:
+        return os.stat(_caminho_serie(nome_ou_caminho)).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def carregar_serie(nome_ou_caminho):
+    """Datas (datetime64[D]) e taxas (%) de uma série local, ordenadas por data.
+
+    `nome_ou_caminho` é uma das chaves de `SERIES` ou o caminho de um CSV com
+    a data na primeira coluna e a taxa na segunda. Aceita datas 'AAAA-MM-DD'
+    ou 'DD/MM/AAAA' e, no formato do SGS (separador ';'), vírgula decimal.
+    Retorna None se o arquivo não existir. A leitura fica em cache enquanto o
+    arquivo não muda, e os arrays devolvidos são somente leitura.
+    """
+    modificacao = versao_serie(nome_ou_caminho)
+    if modificacao is None:
+        return None
+    return _ler_serie(str(_caminho_serie(nome_ou_caminho)), modificacao)
+
+
+@memorizar(tamanho_maximo=8)
+def _ler_serie(caminho, modificacao):
+    """Leitura de `carregar_serie`; `modificacao` (mtime do arquivo) entra só na chave do cache"""
+    try:
+        with open(caminho, encoding='utf-8-sig') as arquivo:
+            primeira_linha = arquivo.readline()
+    except FileNotFoundError:
+        return None
+    sgs = ';' in primeira_linha
+    df = pd.read_csv(caminho, sep=';' if sgs else ',', header=None, usecols=[0, 1], dtype=str, encoding='utf-8-sig')
+    datas = converter_datas(df[0])
+    taxas = pd.to_numeric(df[1].str.strip().str.replace(',', '.') if sgs else df[1], errors='coerce').to_numpy()
+    valido = ~np.isnat(datas) & ~np.isnan(taxas)
+    datas, taxas = datas[valido], taxas[valido]
+    ordem = np.argsort(datas, kind='stable')
+    datas, taxas = datas[ordem], taxas[ordem]
+    datas.setflags(write=False)
+    taxas.setflags(write=False)
+    return datas, taxas
+
+
+def taxa_diaria(taxa_anual, percentual=100.0):
+    """Taxa diária (decimal) de uma taxa anual base 252, aplicado o percentual do indexador (110 = 110% do CDI)"""
+    diaria = (1 + np.asarray(taxa_anual, dtype=float) / 100) ** (1 / DIAS_UTEIS_ANO) - 1
+    return diaria * np.asarray(percentual, dtype=float) / 100
+
+
+def taxas_do_periodo(datas, serie, taxa_projetada, mensal=False):
+    """Taxa (%) vigente em cada data: a última observação da série até a data, ou `taxa_projetada` depois dela.
+
+    Para séries mensais (`mensal=True`, como o IPCA), vale a taxa do mês da
+    data; meses sem observação usam a projeção.
+    """
+    taxas = np.full(len(datas), float(taxa_projetada))
+    if serie is None or len(serie[0]) == 0:
+        return taxas
+    datas_serie, taxas_serie = serie
+    if mensal:
+        meses_serie = datas_serie.astype('datetime64[M]')
+        posicao = np.searchsorted(meses_serie, datas.astype('datetime64[M]'))
+        posicao = np.minimum(posicao, len(meses_serie) - 1)
+        observado = meses_serie[posicao] == datas.astype('datetime64[M]')
+    else:
+        posicao = np.searchsorted(datas_serie, datas, side='right') - 1
+        observado = (posicao >= 0) & (datas <= datas_serie[-1])
+        posicao = np.maximum(posicao, 0)
+    return np.where(observado, taxas_serie[posicao], taxas)
+
+
+def curva_acumulada(inicio, fim, taxa_projetada, percentual=100.0, serie=None, calendario_uteis=None):
+    """Fatores acumulados dia útil a dia útil de um indexador diário (CDI, SELIC) e seus percentuais.
+
+    Retorna um dicionário com 'datas' (os n dias úteis de [inicio, fim)) e
+    'acumulado', o produto prefixado dos fatores diários com formato
+    (*percentual.shape, n + 1): acumulado[..., k] é o fator do início até
+    antes de datas[k]. Com ele, o rendimento de qualquer intervalo é uma
+    divisão (ver `fator_periodo`), sem percorrer os dias de novo.
+    """
+    datas = dias_uteis(inicio, fim, calendario_uteis)
+    taxas = taxas_do_periodo(datas, serie, taxa_projetada)
+    diarias = taxa_diaria(taxas, np.asarray(percentual, dtype=float)[..., None])
+    # Log-soma em vez de produto acumulado: mesma precisão e sem estouro em horizontes longos
+    acumulado = np.exp(np.cumsum(np.log1p(diarias), axis=-1))
+    acumulado = np.concatenate([np.ones(acumulado.shape[:-1] + (1,)), acumulado], axis=-1)
+    return {'datas': datas, 'acumulado': acumulado}
+
+
+def curva_mensal(inicio, fim, taxa_projetada_anual, serie=None, calendario_uteis=None):
+    """Fatores acumulados de um índice mensal (IPCA) distribuídos pelos dias úteis de cada mês.
+
+    A variação do mês é rateada igualmente entre os seus dias úteis (pro rata
+    dia útil, como nos títulos indexados ao IPCA). Meses sem observação usam
+    `taxa_projetada_anual` (% ao ano). Mesmo formato de `curva_acumulada`.
+    """
+    inicio, fim = np.datetime64(inicio, 'D'), np.datetime64(fim, 'D')
+    if calendario_uteis is None:
+        calendario_uteis = calendario_periodo(inicio, fim)
+    datas = dias_uteis(inicio, fim, calendario_uteis)
+    taxa_projetada_mensal = ((1 + taxa_projetada_anual / 100) ** (1 / 12) - 1) * 100
+    taxas_mes = taxas_do_periodo(datas, serie, taxa_projetada_mensal, mensal=True)
+
+    # Dias úteis do mês inteiro, mesmo nos meses cortados pelo início ou pelo fim do intervalo
+    meses, indice = np.unique(datas.astype('datetime64[M]'), return_inverse=True)
+    uteis_no_mes = np.busday_count(meses.astype('datetime64[D]'), (meses + 1).astype('datetime64[D]'),
+                                   busdaycal=calendario_uteis)
+    diarias = (1 + taxas_mes / 100) ** (1 / uteis_no_mes[indice]) - 1
+    acumulado = np.concatenate([[1.0], np.exp(np.cumsum(np.log1p(diarias)))])
+    return {'datas': datas, 'acumulado': acumulado}
+
+
+def fator_periodo(curva, inicio, fim):
+    """Fator acumulado da curva entre as datas `inicio` e `fim` (arrays com broadcasting).
+
+    O dinheiro aplicado em `inicio` rende de lá (ou do dia útil seguinte) até o
+    dia útil anterior a `fim`. Cada consulta é uma busca binária e uma
+    divisão, então milhões de janelas custam o mesmo que percorrer a curva uma vez.
+    """
+    datas = curva['datas']
+    i = np.searchsorted(datas, np.asarray(inicio, dtype='datetime64[D]'))
+    j = np.searchsorted(datas, np.asarray(fim, dtype='datetime64[D]'))
+    acumulado = curva['acumulado']
+    return acumulado[..., np.maximum(i, j)] / acumulado[..., i]
+
+
+def projetar_cdi(valor_inicial, aporte_mensal, percentual_cdi, meses, data_inicio, taxa_cdi_projetada,
+                 tipo_aporte="Início do mês", taxa_inflacao=0.0, serie_cdi=None, serie_ipca=None):
+    """Projeção mês a mês de uma aplicação a um percentual do CDI, capitalizada por dia útil.
+
+    Mesmas saídas de `projetar_juros_compostos` ('saldo', 'investido',
+    'juros', 'saldo_real', com o mês no último eixo), mais 'datas' (o dia
+    de cada mês da projeção) e 'dias_uteis' (dias úteis decorridos até cada data). `valor_inicial`,
+    `aporte_mensal` e `percentual_cdi` aceitam arrays combinados por
+    broadcasting. O CDI de cada dia vem de `serie_cdi` (datas, % a.a.) até a
+    última observação e de `taxa_cdi_projetada` depois; a inflação do saldo
+    real vem de `serie_ipca` (% a.m.) ou de `taxa_inflacao` (% a.a.).
+    """
+    meses = int(meses)
+    valor_inicial, aporte_mensal, percentual_cdi = np.broadcast_arrays(
+        np.asarray(valor_inicial, dtype=float),
+        np.asarray(aporte_mensal, dtype=float),
+        np.asarray(percentual_cdi, dtype=float),
+    )
+    if tipo_aporte not in TIPOS_APORTE:
+        raise ValueError(f"Tipo de aporte desconhecido: '{tipo_aporte}'. Use um de: {', '.join(TIPOS_APORTE)}")
+
+    datas = somar_meses(data_inicio, np.arange(meses + 1))
+    calendario_uteis = calendario_periodo(datas[0], datas[-1])
+    curva = curva_acumulada(datas[0], datas[-1], taxa_cdi_projetada, percentual_cdi, serie_cdi, calendario_uteis)
+    inflacao = curva_mensal(datas[0], datas[-1], taxa_inflacao, serie_ipca, calendario_uteis)
+
+    # Fator acumulado até cada data da projeção; o dinheiro aplicado na data j vale F(k) / F(j) na data k
+    k = np.searchsorted(curva['datas'], datas)
+    acumulado = curva['acumulado'][..., k]
+
+    # Saldo(k) = F(k) * (V0 / F(0) + A * soma dos 1 / F(j) dos aportes já feitos): uma soma prefixada
+    # Início do mês: aportes nas datas 0..k-1; fim do mês: nas datas 1..k
+    descontados = np.cumsum(1 / acumulado, axis=-1)
+    if tipo_aporte == "Início do mês":
+        descontados = descontados - 1 / acumulado
+    else:
+        descontados = descontados - 1 / acumulado[..., :1]
+    saldo = acumulado * (valor_inicial[..., None] / acumulado[..., :1] + aporte_mensal[..., None] * descontados)
+    investido = valor_inicial[..., None] + aporte_mensal[..., None] * np.arange(meses + 1)
+    saldo_real = saldo / inflacao['acumulado'][np.searchsorted(inflacao['datas'], datas)]
+
+    return {
+        'saldo': saldo,
+        'investido': investido,
+        'juros': saldo - investido,
+        'saldo_real': saldo_real,
+        'datas': datas,
+        'dias_uteis': k,
+    }
\ No newline at end of file
@@ -0,0 +1,116 @@
+import numpy as np
+
+from .motor_emprestimos import SISTEMA_PRICE, _normalizar_carteira, _parcela_price
+
+
+ESCALA_TAXA = 10 ** 10      # taxa mensal em inteiros: 10 casas decimais
+_ESCALA_PARTE = 10 ** 5     # a taxa é multiplicada em duas metades de 5 dígitos para não estourar o int64
+
+ARREDONDAR_MEIO_PARA_CIMA = "meio para cima"
+ARREDONDAR_MEIO_PAR = "meio para o par"
+TRUNCAR = "truncar"
+MODOS_ARREDONDAMENTO = (ARREDONDAR_MEIO_PARA_CIMA, ARREDONDAR_MEIO_PAR, TRUNCAR)
+
+
+def _arredondar_quociente(quociente, resto, divisor, modo):
+    """Aplica `modo` a uma divisão inteira não negativa já feita (quociente e resto)"""
+    if modo == ARREDONDAR_MEIO_PARA_CIMA:
+        return quociente + (2 * resto >= divisor)
+    if modo == ARREDONDAR_MEIO_PAR:
+        return quociente + ((2 * resto > divisor) | ((2 * resto == divisor) & (quociente % 2 == 1)))
+    if modo == TRUNCAR:
+        return quociente
+    raise ValueError(f"Modo de arredondamento desconhecido: '{modo}'. Use um de: {', '.join(MODOS_ARREDONDAMENTO)}")
+
+
+def para_centavos(valor, modo=ARREDONDAR_MEIO_PARA_CIMA):
+    """Converte valores em reais (float) para centavos int64, arredondando conforme `modo`"""
+    # Arredondar antes em 6 casas elimina o erro de representação (0.285 * 100 = 28.499999...)
+    centavos = np.round(np.asarray(valor, dtype=float) * 100, 6)
+    inteiros = np.floor(centavos)
+    milionesimos = np.rint((centavos - inteiros) * 10 ** 6).astype(np.int64)
+    return _arredondar_quociente(inteiros.astype(np.int64), milionesimos, 10 ** 6, modo)
+
+
+def juros_centavos(saldo, taxa, modo=ARREDONDAR_MEIO_PARA_CIMA):
+    """Juros exatos `saldo * taxa / ESCALA_TAXA` em centavos, com `saldo` em centavos e `taxa` escalada.
+
+    O produto direto estouraria o int64 para saldos acima de ~R$ 9 milhões, então
+    a taxa é separada em duas metades de 5 dígitos e a divisão é recomposta em
+    inteiros; o resultado é exato para saldos de até ~R$ 900 bilhões.
+    """
+    taxa_alta, taxa_baixa = np.divmod(taxa, _ESCALA_PARTE)
+    quociente_alto, resto_alto = np.divmod(saldo * taxa_alta, _ESCALA_PARTE)
+    quociente, resto = np.divmod(resto_alto * _ESCALA_PARTE + saldo * taxa_baixa, ESCALA_TAXA)
+    return _arredondar_quociente(quociente_alto + quociente, resto, ESCALA_TAXA, modo)
+
+
+def amortizar_carteira_centavos(valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema=SISTEMA_PRICE,
+                                arredondamento=ARREDONDAR_MEIO_PARA_CIMA):
+    """Tabelas PRICE/SAC de N empréstimos em centavos exatos (int64).
+
+    Mesmos parâmetros de `amortizar_carteira`. O valor financiado é convertido
+    para centavos e a taxa mensal para um inteiro com 10 casas decimais; a
+    cada parcela os juros são arredondados para o centavo com `arredondamento`
+    e o saldo é atualizado em aritmética inteira, sem deriva. A parcela PRICE e
+    a amortização SAC são arredondadas uma única vez, e a parcela final quita
+    exatamente o saldo que restar: a diferença entre a amortização dela e a
+    regular fica explícita em 'Resíduo'. Se o arredondamento para cima fizer
+    a amortização regular alcançar o saldo antes do prazo (taxas altas em
+    prazos longos), o contrato é quitado nessa parcela. Contratos sem valor
+    financiado têm o prazo inteiro de parcelas zeradas, como em `amortizar_carteira`.
+
+    Retorna um dicionário com 'Valor Parcela', 'Juros', 'Amortização' e
+    'Saldo Devedor' como arrays int64 (N, maior prazo em meses) em centavos,
+    além de 'num_parcelas' (parcelas efetivamente pagas) e 'Resíduo' (N,).
+    Parcelas além da quitação de cada contrato ficam zeradas.
+    """
+    valor_financiado, taxa_mensal, num_parcelas, sac = _normalizar_carteira(
+        valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema
+    )
+    if np.any(num_parcelas < 1):
+        raise ValueError("O prazo deve ter pelo menos uma parcela")
+    principal = para_centavos(valor_financiado, arredondamento)
+    taxa = np.rint(taxa_mensal * ESCALA_TAXA).astype(np.int64)
+    n_contratos = principal.shape[0]
+    max_parcelas = int(num_parcelas.max()) if n_contratos else 0
+
+    # Parcela PRICE calculada sobre o principal e a taxa já em centavos/escala, arredondada uma vez
+    parcela_price = para_centavos(
+        _parcela_price(principal / 100, taxa / ESCALA_TAXA, num_parcelas), arredondamento
+    )
+    amortizacao_sac = _arredondar_quociente(*np.divmod(principal, num_parcelas), num_parcelas, arredondamento)
+
+    parcelas = np.zeros((n_contratos, max_parcelas), dtype=np.int64)
+    juros = np.zeros((n_contratos, max_parcelas), dtype=np.int64)
+    amortizacoes = np.zeros((n_contratos, max_parcelas), dtype=np.int64)
+    saldos = np.zeros((n_contratos, max_parcelas), dtype=np.int64)
+    residuo = np.zeros(n_contratos, dtype=np.int64)
+    pagas = np.zeros(n_contratos, dtype=np.int64)
+
+    saldo_devedor = principal.copy()
+    sem_principal = principal == 0
+    for i in range(max_parcelas):
+        ativo = (i < num_parcelas) & ((saldo_devedor > 0) | sem_principal)
+        juros_i = juros_centavos(saldo_devedor, taxa, arredondamento)
+        regular = np.where(sac, amortizacao_sac, parcela_price - juros_i)
+        # Parcela final: amortiza exatamente o saldo restante
+        quita = ativo & ((i == num_parcelas - 1) | (regular >= saldo_devedor))
+        amortizacao_i = np.where(quita, saldo_devedor, regular)
+        residuo = np.where(quita, saldo_devedor - regular, residuo)
+        saldo_devedor = np.where(ativo, saldo_devedor - amortizacao_i, saldo_devedor)
+        pagas += ativo
+
+        parcelas[:, i] = np.where(ativo, amortizacao_i + juros_i, 0)
+        juros[:, i] = np.where(ativo, juros_i, 0)
+        amortizacoes[:, i] = np.where(ativo, amortizacao_i, 0)
+        saldos[:, i] = np.where(ativo, saldo_devedor, 0)
+
+    return {
+        'Valor Parcela': parcelas,
+        'Juros': juros,
+        'Amortização': amortizacoes,
+        'Saldo Devedor': saldos,
+        'num_parcelas': pagas,
+        'Resíduo': residuo,
+    }
\ No newline at end of file
@@ -0,0 +1,131 @@
+import numpy as np
+
+from .motor_emprestimos import SISTEMA_PRICE, amortizar_carteira
+
+
+IOF_DIARIO = 0.0082     # % ao dia sobre o principal amortizado (pessoa física)
+IOF_ADICIONAL = 0.38    # % sobre o valor financiado
+IOF_DIAS_MAXIMOS = 365
+
+
+def taxa_interna_retorno(valor_liberado, pagamentos, chute=0.01, tolerancia=1e-12, max_iteracoes=100):
+    """Taxa interna de retorno mensal (decimal) de N operações de uma vez.
+
+    `valor_liberado` (N,) é o que o cliente recebe no mês 0 e `pagamentos`
+    (N, meses) o que ele paga nos meses 1..meses (zeros após o prazo). Newton
+    com salvaguarda: cada operação mantém um intervalo [baixo, alto] que
+    contém a raiz e, quando o passo de Newton sai dele, usa a bissecção.
+    Operações sem raiz em (-50%, 100%) ao mês ficam com NaN. `chute` é a taxa
+    inicial (escalar ou (N,)), tipicamente a taxa nominal do contrato.
+    """
+    valor_liberado = np.atleast_1d(np.asarray(valor_liberado, dtype=float))
+    pagamentos = np.atleast_2d(np.asarray(pagamentos, dtype=float))
+    meses = np.arange(1, pagamentos.shape[1] + 1)
+
+    def valor_presente(taxa, linhas):
+        desconto = (1 + taxa)[:, None] ** -meses
+        vpl = (pagamentos[linhas] * desconto).sum(axis=1) - valor_liberado[linhas]
+        derivada = -(pagamentos[linhas] * meses * desconto).sum(axis=1) / (1 + taxa)
+        return vpl, derivada
+
+    todas = np.arange(valor_liberado.shape[0])
+    baixo = np.full(valor_liberado.shape, -0.5)
+    alto = np.full(valor_liberado.shape, 1.0)
+    # O VPL cai com a taxa: só há raiz se ele troca de sinal no intervalo
+    sem_raiz = (valor_presente(baixo, todas)[0] < 0) | (valor_presente(alto, todas)[0] > 0)
+
+    taxa = np.clip(np.broadcast_to(np.asarray(chute, dtype=float), valor_liberado.shape), -0.49, 0.99).copy()
+    ativas = todas[~sem_raiz]
+    for _ in range(max_iteracoes):
+        if not ativas.size:
+            break
+        atual = taxa[ativas]
+        vpl, derivada = valor_presente(atual, ativas)
+        baixo[ativas] = np.where(vpl > 0, atual, baixo[ativas])
+        alto[ativas] = np.where(vpl > 0, alto[ativas], atual)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            nova = atual - vpl / derivada
+        fora = ~((nova >= baixo[ativas]) & (nova <= alto[ativas]))
+        nova = np.where(fora, (baixo[ativas] + alto[ativas]) / 2, nova)
+
+        taxa[ativas] = nova
+        # Só as operações que ainda não convergiram seguem para a próxima iteração
+        ativas = ativas[np.abs(nova - atual) > tolerancia * (1 + np.abs(atual))]
+
+    return np.where(sem_raiz, np.nan, taxa)
+
+
+def custo_efetivo_total(valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema=SISTEMA_PRICE,
+                        tac=0.0, iof=True, seguro_mip=0.0, seguro_dfi=0.0, tarifa_mensal=0.0,
+                        financiar_tarifas=True):
+    """Custo Efetivo Total de N ofertas de empréstimo em uma única chamada.
+
+    Os parâmetros são colunas combinadas por broadcasting. Além dos juros,
+    entram no fluxo:
+      - `tac`: tarifa de abertura de crédito (R$);
+      - `iof`: IOF de pessoa física (0,0082% ao dia sobre cada amortização,
+        até 365 dias, mais 0,38% do valor financiado); False para isentos,
+        como o financiamento habitacional;
+      - `seguro_mip`: seguro de morte e invalidez (% ao mês sobre o saldo devedor);
+      - `seguro_dfi`: seguro de danos físicos ao imóvel (% ao mês sobre
+        `valor_emprestimo`, o valor do bem);
+      - `tarifa_mensal`: tarifa de administração cobrada com cada parcela (R$).
+    Com `financiar_tarifas`, TAC e IOF são somados à dívida; caso contrário,
+    são descontados do valor liberado.
+
+    Retorna um dicionário de arrays (N,) com 'CET Mensal' e 'CET Anual' (%),
+    'IOF', 'Valor Liberado', 'Primeira Prestação' (parcela + seguros +
+    tarifa) e 'Total Pago'. Sem valor financiado (entrada igual ao valor ou
+    maior) não há CET: as duas colunas de CET ficam com NaN.
+    """
+    valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema, tac, iof, seguro_mip, seguro_dfi, tarifa_mensal, \
+        financiar_tarifas = (np.ravel(coluna) for coluna in np.broadcast_arrays(
+            np.asarray(valor_emprestimo, dtype=float), np.asarray(entrada, dtype=float),
+            np.asarray(taxa_juros_anual, dtype=float), np.asarray(prazo_anos), np.asarray(sistema, dtype=str),
+            np.asarray(tac, dtype=float), np.asarray(iof, dtype=bool), np.asarray(seguro_mip, dtype=float),
+            np.asarray(seguro_dfi, dtype=float), np.asarray(tarifa_mensal, dtype=float),
+            np.asarray(financiar_tarifas, dtype=bool)
+        ))
+    valor_financiado = valor_emprestimo - entrada
+
+    # IOF calculado sobre a tabela sem tarifas
+    tabela = amortizar_carteira(valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema)
+    dias = np.minimum(30 * np.arange(1, tabela['Amortização'].shape[1] + 1), IOF_DIAS_MAXIMOS)
+    valor_iof = np.where(
+        iof,
+        (tabela['Amortização'] * dias).sum(axis=1) * IOF_DIARIO / 100 + valor_financiado * IOF_ADICIONAL / 100,
+        0.0
+    )
+
+    # PRICE e SAC são lineares no principal: financiar as tarifas só escala a tabela
+    tarifas = tac + valor_iof
+    sem_principal = valor_financiado <= 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        escala = np.where(financiar_tarifas & ~sem_principal, (valor_financiado + tarifas) / valor_financiado, 1.0)[:, None]
+    valor_liberado = np.where(financiar_tarifas, valor_financiado, valor_financiado - tarifas)
+
+    parcelas = tabela['Valor Parcela'] * escala
+    saldos_iniciais = np.column_stack([valor_financiado, tabela['Saldo Devedor'][:, :-1]]) * escala
+    ativo = np.arange(parcelas.shape[1]) < tabela['num_parcelas'][:, None]
+    pagamentos = np.where(
+        ativo,
+        parcelas
+        + saldos_iniciais * seguro_mip[:, None] / 100
+        + (valor_emprestimo * seguro_dfi / 100 + tarifa_mensal)[:, None],
+        0.0
+    )
+
+    cet_mensal = np.full(valor_financiado.shape, np.nan)
+    com_principal = ~sem_principal
+    cet_mensal[com_principal] = taxa_interna_retorno(
+        valor_liberado[com_principal], pagamentos[com_principal], chute=taxa_juros_anual[com_principal] / 12 / 100
+    )
+    return {
+        'CET Mensal': cet_mensal * 100,
+        'CET Anual': ((1 + cet_mensal) ** 12 - 1) * 100,
+        'IOF': valor_iof,
+        'Valor Liberado': valor_liberado,
+        'Primeira Prestação': pagamentos[:, 0],
+        'Total Pago': pagamentos.sum(axis=1) + np.where(financiar_tarifas, 0.0, tarifas),
+    }
\ No newline at end of file
@@ -0,0 +1,289 @@
+import math
+
+import numpy as np
+
+
+SISTEMA_PRICE = "PRICE (Parcelas Fixas)"
+SISTEMA_SAC = "SAC (Amortização Constante)"
+# Nomes aceitos (sem diferenciar maiúsculas) -> é SAC
+NOMES_SISTEMA = {
+    SISTEMA_PRICE.upper(): False,
+    "PRICE": False,
+    SISTEMA_SAC.upper(): True,
+    "SAC": True,
+}
+
+
+def _sistemas_sac(sistema):
+    """Máscara de SAC de um array de nomes de sistema; levanta ValueError para nomes desconhecidos"""
+    nomes, posicoes = (sistema.ravel(), 0) if sistema.size == 1 else np.unique(sistema, return_inverse=True)
+    codigos = [NOMES_SISTEMA.get(nome.strip().upper()) for nome in nomes.tolist()]
+    desconhecidos = [nome for nome, codigo in zip(nomes.tolist(), codigos) if codigo is None]
+    if desconhecidos:
+        raise ValueError(f"Sistema de amortização desconhecido: {', '.join(map(repr, desconhecidos))}. "
+                         f"Use PRICE ou SAC")
+    return np.array(codigos, dtype=bool)[posicoes].reshape(sistema.shape)
+
+
+def _normalizar_carteira(valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema):
+    """Converte as colunas da carteira em arrays 1-D do mesmo tamanho"""
+    valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sac = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(valor_emprestimo, dtype=float)),
+        np.atleast_1d(np.asarray(entrada, dtype=float)),
+        np.atleast_1d(np.asarray(taxa_juros_anual, dtype=float)),
+        np.atleast_1d(np.asarray(prazo_anos)),
+        # Classificado antes do broadcasting: um nome único não vira N comparações de texto
+        np.atleast_1d(_sistemas_sac(np.asarray(sistema, dtype=str))),
+    )
+    valor_financiado = valor_emprestimo - entrada
+    taxa_mensal = taxa_juros_anual / 12 / 100
+    num_parcelas = (prazo_anos * 12).astype(int)
+    return valor_financiado.ravel(), taxa_mensal.ravel(), num_parcelas.ravel(), sac.ravel()
+
+
+def _parcela_price(valor_financiado, taxa_mensal, num_parcelas):
+    """Parcela fixa do sistema PRICE"""
+    # (1 + t)^n - 1 por expm1/log1p, preciso mesmo com taxas muito pequenas
+    fator_menos_um = np.expm1(num_parcelas * np.log1p(taxa_mensal))
+    fator = fator_menos_um + 1
+    com_juros = taxa_mensal > 0
+    divisor = np.where(com_juros, fator_menos_um, 1.0)
+    return np.where(
+        com_juros,
+        valor_financiado * (taxa_mensal * fator) / divisor,
+        valor_financiado / num_parcelas
+    )
+
+
+def amortizar_carteira(valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema=SISTEMA_PRICE):
+    """Tabelas PRICE/SAC completas de N empréstimos em uma única chamada.
+
+    Os parâmetros são colunas (escalares ou arrays combinados por broadcasting).
+    A iteração é feita parcela a parcela com todos os contratos em paralelo,
+    repetindo as mesmas operações de `calcular_emprestimo`, de modo que os
+    valores batem com a tabela individual a menos do arredondamento de ponto
+    flutuante. `sistema` aceita os rótulos da interface ou "PRICE"/"SAC", sem
+    diferenciar maiúsculas; outros nomes levantam ValueError.
+
+    Retorna um dicionário com 'Valor Parcela', 'Juros', 'Amortização' e
+    'Saldo Devedor' como arrays (N, maior prazo em meses), além de
+    'num_parcelas' (N,). Parcelas além do prazo de cada contrato ficam zeradas.
+    """
+    valor_financiado, taxa_mensal, num_parcelas, sac = _normalizar_carteira(
+        valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema
+    )
+    n_contratos = valor_financiado.shape[0]
+    max_parcelas = int(num_parcelas.max()) if n_contratos else 0
+
+    parcela_price = _parcela_price(valor_financiado, taxa_mensal, num_parcelas)
+    amortizacao_sac = valor_financiado / num_parcelas
+
+    parcelas = np.zeros((n_contratos, max_parcelas))
+    juros = np.zeros((n_contratos, max_parcelas))
+    amortizacoes = np.zeros((n_contratos, max_parcelas))
+    saldos = np.zeros((n_contratos, max_parcelas))
+
+    saldo_devedor = valor_financiado.copy()
+    for i in range(max_parcelas):
+        ativo = i < num_parcelas
+        juros_i = saldo_devedor * taxa_mensal
+        parcela_i = np.where(sac, amortizacao_sac + juros_i, parcela_price)
+        amortizacao_i = np.where(sac, amortizacao_sac, parcela_price - juros_i)
+        saldo_devedor = np.where(ativo, saldo_devedor - amortizacao_i, saldo_devedor)
+
+        parcelas[:, i] = np.where(ativo, parcela_i, 0.0)
+        juros[:, i] = np.where(ativo, juros_i, 0.0)
+        amortizacoes[:, i] = np.where(ativo, amortizacao_i, 0.0)
+        saldos[:, i] = np.where(ativo, np.maximum(0, saldo_devedor), 0.0)
+
+    return {
+        'Valor Parcela': parcelas,
+        'Juros': juros,
+        'Amortização': amortizacoes,
+        'Saldo Devedor': saldos,
+        'num_parcelas': num_parcelas,
+    }
+
+
+def resumir_carteira(valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema=SISTEMA_PRICE):
+    """Totais de N empréstimos em forma fechada, sem montar as tabelas.
+
+    Retorna um dicionário de arrays (N,) com 'Primeira Parcela',
+    'Última Parcela', 'Total Pago' e 'Total Juros'.
+    """
+    valor_financiado, taxa_mensal, num_parcelas, sac = _normalizar_carteira(
+        valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema
+    )
+
+    parcela_price = _parcela_price(valor_financiado, taxa_mensal, num_parcelas)
+    amortizacao_sac = valor_financiado / num_parcelas
+
+    # SAC: juros sobre saldo que cai linearmente -> soma aritmética
+    juros_sac = valor_financiado * taxa_mensal * (num_parcelas + 1) / 2
+    juros_price = parcela_price * num_parcelas - valor_financiado
+    total_juros = np.where(sac, juros_sac, juros_price)
+
+    return {
+        'Primeira Parcela': np.where(sac, amortizacao_sac + valor_financiado * taxa_mensal, parcela_price),
+        'Última Parcela': np.where(sac, amortizacao_sac * (1 + taxa_mensal), parcela_price),
+        'Total Pago': valor_financiado + total_juros,
+        'Total Juros': total_juros,
+    }
+
+
+def grade_carteira(valor_emprestimo, entrada, taxas_juros_anuais, prazos_anos, sistemas=(SISTEMA_PRICE, SISTEMA_SAC)):
+    """Totais de uma grade taxa × prazo × sistema para um mesmo valor financiado.
+
+    Os eixos são combinados por broadcasting e resolvidos numa única chamada
+    de `resumir_carteira`. Retorna o mesmo dicionário, com arrays de formato
+    (len(taxas_juros_anuais), len(prazos_anos), len(sistemas)).
+    """
+    taxas = np.asarray(taxas_juros_anuais, dtype=float)[:, None, None]
+    prazos = np.asarray(prazos_anos)[None, :, None]
+    sistemas = np.asarray(sistemas, dtype=str)[None, None, :]
+    forma = np.broadcast_shapes(taxas.shape, prazos.shape, sistemas.shape)
+    resumo = resumir_carteira(valor_emprestimo, entrada, taxas, prazos, sistemas)
+    return {chave: valores.reshape(forma) for chave, valores in resumo.items()}
+
+
+REDUZIR_PRAZO = "Reduzir prazo"
+REDUZIR_PARCELA = "Reduzir parcela"
+
+
+def _trecho(saldo, taxa_mensal, parcelas, parcela_price=None, amortizacao_sac=None, quitar=False):
+    """`parcelas` parcelas regulares a partir de `saldo`, em forma fechada.
+
+    PRICE quando `parcela_price` é informada, SAC quando `amortizacao_sac` é.
+    Com `quitar`, a última parcela liquida exatamente o saldo que restar.
+    """
+    passos = np.arange(1, parcelas + 1)
+    if amortizacao_sac is not None:
+        saldos = saldo - amortizacao_sac * passos
+    elif taxa_mensal > 0:
+        fator = (1 + taxa_mensal) ** passos
+        saldos = saldo * fator - parcela_price * (fator - 1) / taxa_mensal
+    else:
+        saldos = saldo - parcela_price * passos
+    anteriores = np.concatenate(([saldo], saldos[:-1]))
+    juros = anteriores * taxa_mensal
+
+    if amortizacao_sac is not None:
+        amortizacoes = np.full(parcelas, amortizacao_sac)
+    else:
+        amortizacoes = parcela_price - juros
+    if quitar:
+        amortizacoes[-1] = anteriores[-1]
+        saldos[-1] = 0.0
+
+    return {
+        'Valor Parcela': amortizacoes + juros,
+        'Juros': juros,
+        'Amortização': amortizacoes,
+        'Amortização Extra': np.zeros(parcelas),
+        'Saldo Devedor': np.maximum(0, saldos),
+    }
+
+
+def _prazo_para_quitar(saldo, taxa_mensal, parcela_price=None, amortizacao_sac=None):
+    """Parcelas necessárias para quitar `saldo` mantendo a parcela (PRICE) ou a amortização (SAC)"""
+    if amortizacao_sac is not None:
+        meses = saldo / amortizacao_sac
+    elif taxa_mensal > 0:
+        meses = -math.log(1 - saldo * taxa_mensal / parcela_price) / math.log(1 + taxa_mensal)
+    else:
+        meses = saldo / parcela_price
+    # Tolerância: um prazo exato não deve ganhar uma parcela residual de centavos
+    return max(1, math.ceil(meses - 1e-6))
+
+
+def amortizar_com_eventos(valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema=SISTEMA_PRICE, eventos=()):
+    """Tabela PRICE/SAC de um empréstimo com amortizações extraordinárias.
+
+    `eventos` é uma sequência de (mês, valor, modo): o valor é abatido do
+    saldo logo após a parcela do mês indicado e `modo` escolhe entre
+    `REDUZIR_PRAZO` (mantém a parcela/amortização e encurta o prazo) e
+    `REDUZIR_PARCELA` (mantém o prazo e recalcula a parcela/amortização).
+    Entre eventos a tabela é regular e cada trecho é gerado em forma fechada,
+    então um evento só recalcula a cauda posterior a ele.
+
+    Retorna um dicionário com 'Valor Parcela', 'Juros', 'Amortização',
+    'Amortização Extra' e 'Saldo Devedor' (uma posição por parcela paga),
+    além de 'num_parcelas', 'Total Pago' e 'Total Juros'.
+    """
+    valor_financiado, taxa_mensal, num_parcelas, sac = _normalizar_carteira(
+        valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema
+    )
+    parcela_price = None if sac[0] else float(_parcela_price(valor_financiado, taxa_mensal, num_parcelas)[0])
+    valor_financiado, taxa_mensal, restantes = float(valor_financiado[0]), float(taxa_mensal[0]), int(num_parcelas[0])
+    amortizacao_sac = valor_financiado / restantes if sac[0] else None
+
+    trechos = []
+    saldo, mes = valor_financiado, 0
+    for mes_evento, valor, modo in sorted(eventos, key=lambda evento: evento[0]):
+        mes_evento = int(mes_evento)
+        if mes_evento < 1:
+            raise ValueError("As amortizações extras começam a partir da parcela 1")
+        if modo not in (REDUZIR_PRAZO, REDUZIR_PARCELA):
+            raise ValueError(f"Modo de amortização desconhecido: '{modo}'")
+        if mes_evento >= mes + restantes or valor <= 0:
+            continue
+
+        if mes_evento > mes:
+            trechos.append(_trecho(saldo, taxa_mensal, mes_evento - mes, parcela_price, amortizacao_sac))
+            saldo = float(trechos[-1]['Saldo Devedor'][-1])
+            restantes -= mes_evento - mes
+            mes = mes_evento
+
+        extra = min(float(valor), saldo)
+        saldo -= extra
+        trechos[-1]['Amortização Extra'][-1] += extra
+        trechos[-1]['Saldo Devedor'][-1] = saldo
+        if saldo <= 1e-9:
+            restantes = 0
+            break
+
+        if modo == REDUZIR_PRAZO:
+            restantes = min(restantes, _prazo_para_quitar(saldo, taxa_mensal, parcela_price, amortizacao_sac))
+        elif sac[0]:
+            amortizacao_sac = saldo / restantes
+        else:
+            parcela_price = float(_parcela_price(np.array([saldo]), np.array([taxa_mensal]), np.array([restantes]))[0])
+
+    if restantes:
+        trechos.append(_trecho(saldo, taxa_mensal, restantes, parcela_price, amortizacao_sac, quitar=True))
+
+    tabela = {coluna: np.concatenate([trecho[coluna] for trecho in trechos]) for coluna in trechos[0]}
+    tabela['num_parcelas'] = len(tabela['Valor Parcela'])
+    tabela['Total Juros'] = float(tabela['Juros'].sum())
+    tabela['Total Pago'] = float(tabela['Valor Parcela'].sum() + tabela['Amortização Extra'].sum())
+    return tabela
+
+
+def comparar_estrategias(valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema=SISTEMA_PRICE, estrategias=None):
+    """Resumo lado a lado de várias estratégias de amortização extra.
+
+    `estrategias` mapeia um nome para a sequência de eventos aceita por
+    `amortizar_com_eventos`; a tabela sem eventos entra sempre como
+    referência. Retorna um dicionário de listas com 'Estratégia',
+    'Parcelas', 'Primeira Parcela', 'Parcela Final', 'Total Extra',
+    'Total Pago', 'Total Juros' e 'Economia de Juros'.
+    """
+    estrategias = {"Sem amortização extra": (), **(estrategias or {})}
+    resumo = {coluna: [] for coluna in (
+        'Estratégia', 'Parcelas', 'Primeira Parcela', 'Parcela Final',
+        'Total Extra', 'Total Pago', 'Total Juros', 'Economia de Juros'
+    )}
+
+    juros_base = None
+    for nome, eventos in estrategias.items():
+        tabela = amortizar_com_eventos(valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema, eventos)
+        juros_base = tabela['Total Juros'] if juros_base is None else juros_base
+        resumo['Estratégia'].append(nome)
+        resumo['Parcelas'].append(tabela['num_parcelas'])
+        resumo['Primeira Parcela'].append(float(tabela['Valor Parcela'][0]))
+        resumo['Parcela Final'].append(float(tabela['Valor Parcela'][-1]))
+        resumo['Total Extra'].append(float(tabela['Amortização Extra'].sum()))
+        resumo['Total Pago'].append(tabela['Total Pago'])
+        resumo['Total Juros'].append(tabela['Total Juros'])
+        resumo['Economia de Juros'].append(juros_base - tabela['Total Juros'])
+    return resumo
\ No newline at end of file
@@ -0,0 +1,114 @@
+import numpy as np
+
+
+MAX_MESES = 50 * 12  # Limite de 50 anos
+
+
+def projetar_patrimonio(patrimonio_atual, aporte_mensal, taxa_mensal, meses):
+    """Patrimônio ao fim de cada mês k (k = 0..meses) com aportes no fim do mês.
+
+    Forma fechada de `p = p * (1 + i) + aporte`, com broadcasting dos
+    parâmetros; o último eixo do resultado é o mês.
+    """
+    k = np.arange(int(meses) + 1, dtype=float)
+    return _patrimonio_no_mes(
+        np.asarray(patrimonio_atual, dtype=float)[..., None],
+        np.asarray(aporte_mensal, dtype=float)[..., None],
+        np.asarray(taxa_mensal, dtype=float)[..., None],
+        k
+    )
+
+
+def _patrimonio_no_mes(patrimonio_atual, aporte_mensal, taxa_mensal, k):
+    """Patrimônio após k meses (k pode ser array), em forma fechada"""
+    fator = (1 + taxa_mensal) ** k
+    sem_juros = taxa_mensal == 0
+    serie = np.where(sem_juros, k, (fator - 1) / np.where(sem_juros, 1.0, taxa_mensal))
+    return patrimonio_atual * fator + aporte_mensal * serie
+
+
+def _meses_sem_limite(patrimonio_atual, aporte_mensal, taxa_mensal, meta):
+    """Primeiro mês k >= 0 com patrimônio >= meta, ou inf se nunca ocorrer"""
+    com_juros = taxa_mensal > 0
+    taxa_segura = np.where(com_juros, taxa_mensal, 1.0)
+
+    # Com juros: P_k = (P0 + C/i)(1 + i)^k - C/i  =>  k = log(B/A) / log(1 + i)
+    a = patrimonio_atual + aporte_mensal / taxa_segura
+    b = meta + aporte_mensal / taxa_segura
+    with np.errstate(divide='ignore', invalid='ignore'):
+        razao = np.where((a > 0) & (b > 0), b / np.where(a > 0, a, 1.0), np.nan)
+        k_juros = np.ceil(np.log(razao) / np.log1p(taxa_segura))
+        k_juros = np.where(a > 0, k_juros, np.inf)
+
+        # Sem juros: crescimento linear
+        k_linear = np.where(
+            aporte_mensal > 0,
+            np.ceil((meta - patrimonio_atual) / np.where(aporte_mensal > 0, aporte_mensal, 1.0)),
+            np.inf
+        )
+
+    k = np.where(com_juros, k_juros, k_linear)
+    k = np.where(np.isnan(k), np.inf, np.maximum(k, 1))
+    k = np.where(patrimonio_atual >= meta, 0, k)
+
+    # Corrige o arredondamento do logaritmo na fronteira (+/- 1 mês)
+    finito = np.isfinite(k) & (k > 0)
+    k_f = np.where(finito, k, 1.0)
+    anterior = _patrimonio_no_mes(patrimonio_atual, aporte_mensal, taxa_mensal, k_f - 1)
+    atual = _patrimonio_no_mes(patrimonio_atual, aporte_mensal, taxa_mensal, k_f)
+    k = np.where(finito & (k_f > 1) & (anterior >= meta), k - 1, k)
+    k = np.where(finito & (atual < meta), k + 1, k)
+    return k
+
+
+def meses_ate_meta(patrimonio_atual, aporte_mensal, taxa_mensal, meta, max_meses=MAX_MESES):
+    """Meses até o patrimônio alcançar `meta`, sem simulação mês a mês.
+
+    Resolve a equação da série de pagamentos em logaritmos. Todos os
+    parâmetros são combinados por broadcasting, então uma única chamada
+    resolve vários níveis de meta e vários aportes. Retorna um array de
+    floats com NaN onde a meta não é alcançada em até `max_meses`.
+    """
+    patrimonio_atual, aporte_mensal, taxa_mensal, meta = np.broadcast_arrays(
+        np.asarray(patrimonio_atual, dtype=float),
+        np.asarray(aporte_mensal, dtype=float),
+        np.asarray(taxa_mensal, dtype=float),
+        np.asarray(meta, dtype=float),
+    )
+    k = _meses_sem_limite(patrimonio_atual, aporte_mensal, taxa_mensal, meta)
+    return np.where(k <= max_meses, k, np.nan)
+
+
+def meses_ate_meta_corrigida(patrimonio_atual, aporte_mensal, taxa_mensal, meta, taxa_inflacao,
+                             max_meses=MAX_MESES):
+    """Meses até a meta quando ela é corrigida pela inflação a cada 12 meses.
+
+    A meta vale `meta * (1 + inflação) ** a` durante o ano `a` da simulação
+    (a mesma regra de `calcular_fire`). Dentro de cada ano a meta é fixa, então
+    o problema vira um `meses_ate_meta` por ano, resolvido de uma vez para
+    todos os anos; a resposta é o primeiro ano em que há cruzamento.
+    `taxa_inflacao` é anual, em %. Retorna NaN onde a meta não é alcançada.
+    """
+    patrimonio_atual, aporte_mensal, taxa_mensal, meta, taxa_inflacao = np.broadcast_arrays(
+        np.asarray(patrimonio_atual, dtype=float),
+        np.asarray(aporte_mensal, dtype=float),
+        np.asarray(taxa_mensal, dtype=float),
+        np.asarray(meta, dtype=float),
+        np.asarray(taxa_inflacao, dtype=float),
+    )
+    anos = np.arange((max_meses + 11) // 12, dtype=float)
+    metas_ano = meta[..., None] * (1 + taxa_inflacao[..., None] / 100) ** anos
+
+    k = _meses_sem_limite(
+        patrimonio_atual[..., None], aporte_mensal[..., None], taxa_mensal[..., None], metas_ano
+    )
+    # O ano a cobre os meses 12a+1 .. 12a+12 (a meta é conferida após cada aporte)
+    inicio_ano = 12 * anos + 1
+    fim_ano = np.minimum(12 * anos + 12, max_meses)
+    k_ano = np.maximum(k, inicio_ano)
+    cruza = k_ano <= fim_ano
+
+    primeiro = np.where(cruza.any(axis=-1), cruza.argmax(axis=-1), -1)
+    k_cruzamento = np.take_along_axis(k_ano, np.maximum(primeiro, 0)[..., None], axis=-1)[..., 0]
+    resultado = np.where(primeiro >= 0, k_cruzamento, np.nan)
+    return np.where(patrimonio_atual >= meta, 0.0, resultado)
\ No newline at end of file
@@ -0,0 +1,131 @@
+import numpy as np
+
+from .monte_carlo import PERCENTIS
+from .motor_emprestimos import SISTEMA_PRICE, amortizar_carteira
+
+
+INDEXADOR_TR = "TR"
+INDEXADOR_IPCA = "IPCA"
+INDEXADORES = (INDEXADOR_TR, INDEXADOR_IPCA)
+COLUNAS_TABELA = ('Valor Parcela', 'Juros', 'Amortização', 'Saldo Devedor')
+
+
+def gerar_indices(rng, n_cenarios, meses, media_anual, volatilidade_anual, reversao_anual=0.5,
+                  inicial_anual=None, piso_anual=None):
+    """Matriz (n_cenarios, meses) de variações mensais (decimal) de um indexador com reversão à média.
+
+    A taxa anualizada segue um AR(1) mensal (Ornstein-Uhlenbeck discreto) em
+    torno de `media_anual`, partindo de `inicial_anual` (padrão: a média);
+    `volatilidade_anual` é o desvio-padrão de longo prazo dessa taxa e
+    `reversao_anual` a velocidade com que ela volta à média. Com `piso_anual`
+    a taxa não fica abaixo do piso (a TR não é negativa). Tudo em % ao ano.
+    """
+    persistencia = np.exp(-reversao_anual / 12)
+    choque = volatilidade_anual * np.sqrt(1 - persistencia ** 2)
+    desvios = rng.normal(0.0, choque, size=(n_cenarios, meses))
+
+    taxas = np.empty((n_cenarios, meses))
+    desvio = np.full(n_cenarios, (media_anual if inicial_anual is None else inicial_anual) - media_anual)
+    for mes in range(meses):
+        desvio = persistencia * desvio + desvios[:, mes]
+        taxas[:, mes] = desvio
+    taxas += media_anual
+    if piso_anual is not None:
+        taxas = np.maximum(taxas, piso_anual)
+    return (1 + taxas / 100) ** (1 / 12) - 1
+
+
+def variacoes_mensais(serie):
+    """Variações mensais (decimal) de uma série de `carregar_serie` em % ao mês, uma por mês (a primeira do mês)"""
+    datas, taxas = serie
+    _, primeiras = np.unique(datas.astype('datetime64[M]'), return_index=True)
+    return taxas[primeiras] / 100
+
+
+def reamostrar_indices(rng, variacoes, n_cenarios, meses, bloco=12):
+    """Matriz (n_cenarios, meses) montada com blocos de `bloco` meses consecutivos sorteados do histórico.
+
+    Os blocos preservam a persistência de curto prazo do indexador (meses de
+    inflação alta vêm juntos) sem supor uma distribuição.
+    """
+    variacoes = np.asarray(variacoes, dtype=float)
+    bloco = min(bloco, len(variacoes))
+    if bloco < 1:
+        raise ValueError("A série histórica do indexador está vazia")
+    n_blocos = -(-meses // bloco)
+    inicios = rng.integers(0, len(variacoes) - bloco + 1, size=(n_cenarios, n_blocos))
+    posicoes = (inicios[:, :, None] + np.arange(bloco)).reshape(n_cenarios, -1)[:, :meses]
+    return variacoes[posicoes]
+
+
+def amortizar_indexado(valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema=SISTEMA_PRICE, indices=None):
+    """Tabelas de um financiamento corrigido por indexador em cada cenário de `indices`.
+
+    Todo mês o saldo devedor é corrigido pela variação do indexador e os
+    juros (`taxa_juros_anual`, acima do indexador) incidem sobre o saldo
+    corrigido; a parcela PRICE e a amortização SAC são recalculadas sobre o
+    saldo corrigido e o prazo restante. Com isso cada valor da tabela é o da
+    tabela sem correção multiplicado pelo índice acumulado até o mês, e os
+    cenários saem de um único produto por broadcasting, sem repetir a
+    amortização por cenário.
+
+    `indices` tem formato (n_cenarios, meses), com pelo menos o prazo em meses.
+    Retorna um dicionário com 'Valor Parcela', 'Juros', 'Amortização',
+    'Saldo Devedor' e 'Correção Monetária' (n_cenarios, parcelas) e
+    'indice_acumulado' (n_cenarios, parcelas).
+    """
+    tabela = amortizar_carteira(valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema)
+    num_parcelas = int(tabela['num_parcelas'][0])
+    indices = np.atleast_2d(np.asarray(indices, dtype=float))
+    if indices.shape[1] < num_parcelas:
+        raise ValueError(f"São necessários {num_parcelas} meses do indexador; recebidos {indices.shape[1]}")
+
+    acumulado = np.cumprod(1 + indices[:, :num_parcelas], axis=1)
+    resultado = {coluna: tabela[coluna][0, :num_parcelas] * acumulado for coluna in COLUNAS_TABELA}
+
+    # Correção do mês: saldo anterior sem correção vezes a variação do índice acumulado no mês
+    saldo_anterior = tabela['Saldo Devedor'][0, :num_parcelas] + tabela['Amortização'][0, :num_parcelas]
+    acumulado_anterior = np.concatenate([np.ones((len(acumulado), 1)), acumulado[:, :-1]], axis=1)
+    resultado['Correção Monetária'] = saldo_anterior * (acumulado - acumulado_anterior)
+    resultado['indice_acumulado'] = acumulado
+    return resultado
+
+
+def faixas_indexado(valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema=SISTEMA_PRICE, indices=None,
+                    percentis=PERCENTIS):
+    """Percentis entre os cenários de `indices` das parcelas, do saldo e dos totais do financiamento indexado.
+
+    Mesmos parâmetros de `amortizar_indexado`, sem montar as tabelas de cada
+    cenário: como cada valor é o da tabela sem correção vezes o índice
+    acumulado (positivo), o percentil de uma parcela é a parcela sem correção
+    vezes o percentil do índice, e os totais por cenário são produtos de
+    matriz por vetor.
+
+    Retorna {'Valor Parcela': {p: array por parcela}, 'Saldo Devedor': {...},
+    'Total Pago': {p: valor}, 'Total Juros': {...}, 'Maior Parcela': {...},
+    'Correção Total': {...}}.
+    """
+    tabela = amortizar_carteira(valor_emprestimo, entrada, taxa_juros_anual, prazo_anos, sistema)
+    num_parcelas = int(tabela['num_parcelas'][0])
+    indices = np.atleast_2d(np.asarray(indices, dtype=float))
+    if indices.shape[1] < num_parcelas:
+        raise ValueError(f"São necessários {num_parcelas} meses do indexador; recebidos {indices.shape[1]}")
+    acumulado = np.cumprod(1 + indices[:, :num_parcelas], axis=1)
+    parcelas, juros, saldos = (
+        tabela[coluna][0, :num_parcelas] for coluna in ('Valor Parcela', 'Juros', 'Saldo Devedor')
+    )
+    saldo_anterior = saldos + tabela['Amortização'][0, :num_parcelas]
+
+    percentis_indice = np.percentile(acumulado, percentis, axis=0)
+    totais = {
+        'Total Pago': acumulado @ parcelas,
+        'Total Juros': acumulado @ juros,
+        'Maior Parcela': (acumulado * parcelas).max(axis=1),
+        # Soma de saldo_anterior * (acumulado - acumulado_anterior), reagrupada por mês
+        'Correção Total': acumulado @ (saldo_anterior - np.append(saldo_anterior[1:], 0.0)) - saldo_anterior[0],
+    }
+    return {
+        'Valor Parcela': dict(zip(percentis, percentis_indice * parcelas)),
+        'Saldo Devedor': dict(zip(percentis, percentis_indice * saldos)),
+        **{nome: dict(zip(percentis, np.percentile(valores, percentis))) for nome, valores in totais.items()},
+    }
\ No newline at end of file
@@ -0,0 +1,90 @@
+import numpy as np
+
+
+# (prazo mínimo em meses, alíquota %): tabela regressiva de renda fixa (até 180 dias, até 360, até 720, acima)
+FAIXAS_IR = ((0, 22.5), (6, 20.0), (12, 17.5), (24, 15.0))
+
+
+def aliquota_ir(meses, faixas=FAIXAS_IR):
+    """Alíquota (%) da tabela regressiva para aplicações com `meses` meses"""
+    prazos = np.array([prazo for prazo, _ in faixas])
+    aliquotas = np.array([aliquota for _, aliquota in faixas])
+    return aliquotas[np.searchsorted(prazos, np.asarray(meses), side='right') - 1]
+
+
+def _custo_ate(posicao, cotas_acumuladas, custo_acumulado, fatores):
+    """Custo de aquisição das primeiras `posicao` cotas, consumidas na ordem dos lotes (FIFO)"""
+    lote = np.searchsorted(cotas_acumuladas, posicao, side='right') - 1
+    lote = np.clip(lote, 0, len(fatores) - 1)
+    # Dentro do lote, cada cota custou o fator da data da compra
+    return custo_acumulado[lote] + (posicao - cotas_acumuladas[lote]) * fatores[lote]
+
+
+def projetar_ir(fatores, aportes, resgates=None, faixas=FAIXAS_IR):
+    """Saldo líquido de IR mês a mês com cada aporte tributado como um lote próprio.
+
+    `fatores` é o fator acumulado da aplicação em cada mês (1 no mês 0),
+    `aportes` o valor aplicado em cada mês e `resgates` o valor bruto
+    resgatado em cada mês, todos com formato (meses + 1,). No mês t os
+    resgates saem primeiro, dos lotes mais antigos (FIFO) e só dos aplicados
+    antes de t, limitados ao saldo; depois o aporte do mês vira um novo lote.
+
+    Cada lote é representado por cotas (valor aplicado / fator da data), então
+    as somas prefixadas de cotas e de custo descrevem a carteira inteira e os
+    resgates FIFO são um corte na soma de cotas. O IR de cada mês é somado
+    por faixa da tabela regressiva (os lotes de uma faixa são contíguos), em
+    O(meses × faixas) em vez de O(meses²). Supõe rendimentos não negativos em
+    cada faixa (o prejuízo de um lote não compensa o ganho de outro).
+
+    Retorna um dicionário de arrays (meses + 1,): 'saldo' (bruto após as
+    movimentações do mês), 'custo' (valor aplicado ainda investido), 'ir'
+    (devido se tudo fosse resgatado), 'saldo_liquido', 'resgatado' (bruto
+    efetivamente resgatado no mês) e 'ir_resgates' (retido nesses resgates).
+    """
+    fatores = np.asarray(fatores, dtype=float)
+    aportes = np.broadcast_to(np.asarray(aportes, dtype=float), fatores.shape)
+    resgates = np.zeros(fatores.shape) if resgates is None else np.broadcast_to(np.asarray(resgates, dtype=float), fatores.shape)
+    n = len(fatores)
+    meses = np.arange(n)
+
+    # cotas_acumuladas[j] = cotas dos lotes 0..j-1; custo_acumulado[j] = valor aplicado neles
+    cotas_acumuladas = np.concatenate([[0.0], np.cumsum(aportes / fatores)])
+    custo_acumulado = np.concatenate([[0.0], np.cumsum(aportes)])
+
+    # Cotas resgatadas acumuladas, limitadas em cada mês às cotas dos lotes anteriores:
+    # C(t) = min(C(t-1) + d(t), M(t)) tem a forma fechada D(t) + min(0, min_s<=t M(s) - D(s))
+    pedidas = np.cumsum(resgates / fatores)
+    disponiveis = cotas_acumuladas[:-1]
+    resgatadas = pedidas + np.minimum(0.0, np.minimum.accumulate(disponiveis - pedidas))
+    resgatadas = np.maximum(resgatadas, 0.0)
+    resgatadas_antes = np.concatenate([[0.0], resgatadas[:-1]])
+
+    # Lotes de cada faixa no mês t: idade t - j entre o prazo da faixa e o da seguinte
+    prazos = np.array([prazo for prazo, _ in faixas] + [n + 1])
+    aliquotas = np.array([aliquota for _, aliquota in faixas]) / 100
+    inicio_faixa = np.clip(meses[:, None] - prazos[None, 1:] + 1, 0, n)
+    fim_faixa = np.clip(meses[:, None] - prazos[None, :-1] + 1, 0, n)
+    cotas_inicio = cotas_acumuladas[inicio_faixa]
+    cotas_fim = cotas_acumuladas[fim_faixa]
+
+    def tributar(de, ate):
+        """Cotas, custo e IR do intervalo de cotas [de, ate] de cada mês, somados por faixa"""
+        de = np.clip(de[:, None], cotas_inicio, cotas_fim)
+        ate = np.clip(ate[:, None], cotas_inicio, cotas_fim)
+        cotas = ate - de
+        custo = (_custo_ate(ate, cotas_acumuladas, custo_acumulado, fatores)
+                 - _custo_ate(de, cotas_acumuladas, custo_acumulado, fatores))
+        ganho = np.maximum(fatores[:, None] * cotas - custo, 0.0)
+        return cotas.sum(axis=1), custo.sum(axis=1), (ganho * aliquotas).sum(axis=1)
+
+    cotas, custo, ir = tributar(resgatadas, cotas_acumuladas[1:])
+    cotas_resgatadas, _, ir_resgates = tributar(resgatadas_antes, resgatadas)
+    saldo = fatores * cotas
+    return {
+        'saldo': saldo,
+        'custo': custo,
+        'ir': ir,
+        'saldo_liquido': saldo - ir,
+        'resgatado': fatores * cotas_resgatadas,
+        'ir_resgates': ir_resgates,
+    }
\ No newline at end of file
@@ -0,0 +1,80 @@
+import numpy as np
+
+
+TIPOS_APORTE = ("Início do mês", "Fim do mês")
+
+
+def taxa_mensal_equivalente(taxa_anual):
+    """Converte taxa anual (%) na taxa mensal equivalente (decimal)"""
+    return (1 + np.asarray(taxa_anual, dtype=float) / 100) ** (1 / 12) - 1
+
+
+def projetar_juros_compostos(valor_inicial, aporte_mensal, taxa_juros, meses,
+                             tipo_aporte="Início do mês", taxa_inflacao=0.0):
+    """Projeção mês a mês de juros compostos, sem dependência do Streamlit.
+
+    `valor_inicial`, `aporte_mensal`, `taxa_juros` e `taxa_inflacao` (% ao ano)
+    aceitam escalares ou arrays e são combinados por broadcasting, de modo que
+    uma única chamada projeta N carteiras. `tipo_aporte` pode ser uma string ou
+    um array de strings com o mesmo formato dos demais parâmetros. `meses` é o
+    horizonte comum a todas as carteiras.
+
+    Retorna um dicionário com os arrays 'saldo', 'investido', 'juros' e
+    'saldo_real', todos com formato (*broadcast, meses + 1), onde o último eixo
+    é o mês (0 a `meses`).
+    """
+    meses = int(meses)
+    valor_inicial, aporte_mensal, taxa_mensal, taxa_inflacao_mensal = np.broadcast_arrays(
+        np.asarray(valor_inicial, dtype=float),
+        np.asarray(aporte_mensal, dtype=float),
+        taxa_mensal_equivalente(taxa_juros),
+        taxa_mensal_equivalente(taxa_inflacao),
+    )
+    inicio = np.broadcast_to(np.asarray(tipo_aporte) == "Início do mês", valor_inicial.shape)
+
+    # Eixo dos meses no final para broadcasting com os parâmetros
+    k = np.arange(meses + 1, dtype=float)
+    return _evoluir(
+        valor_inicial[..., None], aporte_mensal[..., None], taxa_mensal[..., None],
+        taxa_inflacao_mensal[..., None], inicio[..., None], k
+    )
+
+
+def resumir_juros_compostos(valor_inicial, aporte_mensal, taxa_juros, meses,
+                            tipo_aporte="Início do mês", taxa_inflacao=0.0):
+    """Valores ao fim do horizonte, sem montar a evolução mês a mês.
+
+    Igual a `projetar_juros_compostos`, mas `meses` também pode ser um array
+    (um horizonte por carteira) e cada array retornado tem o formato do
+    broadcast dos parâmetros.
+    """
+    valor_inicial, aporte_mensal, taxa_mensal, taxa_inflacao_mensal, meses = np.broadcast_arrays(
+        np.asarray(valor_inicial, dtype=float),
+        np.asarray(aporte_mensal, dtype=float),
+        taxa_mensal_equivalente(taxa_juros),
+        taxa_mensal_equivalente(taxa_inflacao),
+        np.asarray(meses, dtype=float),
+    )
+    inicio = np.broadcast_to(np.asarray(tipo_aporte) == "Início do mês", valor_inicial.shape)
+    return _evoluir(valor_inicial, aporte_mensal, taxa_mensal, taxa_inflacao_mensal, inicio, meses)
+
+
+def _evoluir(valor_inicial, aporte_mensal, taxa, taxa_inflacao_mensal, inicio, k):
+    """Saldo, investido, juros e saldo real após k meses (forma fechada)"""
+    fator = (1 + taxa) ** k
+
+    # Soma da série geométrica dos aportes: ((1 + i)^k - 1) / i, ou k quando i = 0
+    sem_juros = taxa == 0
+    serie = np.where(sem_juros, k, (fator - 1) / np.where(sem_juros, 1.0, taxa))
+    serie = np.where(inicio, serie * (1 + taxa), serie)
+
+    saldo = valor_inicial * fator + aporte_mensal * serie
+    investido = valor_inicial + aporte_mensal * k
+    saldo_real = saldo / (1 + taxa_inflacao_mensal) ** k
+
+    return {
+        'saldo': saldo,
+        'investido': investido,
+        'juros': saldo - investido,
+        'saldo_real': saldo_real,
+    }
\ No newline at end of file
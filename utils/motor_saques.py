@@ -0,0 +1,221 @@
+import numpy as np
+
+from .monte_carlo import PERCENTIS, gerar_inflacao, gerar_retornos
+
+
+PARAMETROS_SAQUE = {
+    'taxa_percentual': None,   # % do patrimônio sacado por ano; padrão: a taxa inicial (saque inicial / patrimônio)
+    'retorno_vpw': 3.0,        # retorno real (% a.a.) usado na tabela do VPW
+    'limite_gk': 20.0,         # guardrails de Guyton-Klinger: desvio (%) da taxa de saque em relação à inicial
+    'ajuste_gk': 10.0,         # corte/aumento (%) do saque quando a taxa cruza um guardrail
+    'anos_sem_corte_gk': 15,   # nos últimos anos a regra de preservação do capital não corta o saque
+}
+
+
+# Cada política recebe o estado de todos os caminhos no início de um ano e devolve o saque anual (nominal)
+# de cada caminho. O estado traz, com formato (n_caminhos,): 'patrimonio', 'saque_anterior',
+# 'indice_precos' (acumulado desde o início), 'inflacao_anterior' e 'retorno_anterior' (do ano anterior,
+# em decimal); e os escalares 'ano', 'anos_restantes', 'saque_inicial' e 'taxa_inicial'.
+
+def saque_nominal_constante(estado, parametros):
+    """O mesmo valor nominal todos os anos, como no cálculo determinístico"""
+    return np.full(estado['patrimonio'].shape, estado['saque_inicial'])
+
+
+def saque_real_constante(estado, parametros):
+    """O saque inicial corrigido pela inflação acumulada de cada caminho (regra dos 4%)"""
+    return estado['saque_inicial'] * estado['indice_precos']
+
+
+def saque_percentual(estado, parametros):
+    """Um percentual fixo do patrimônio do início do ano"""
+    taxa = parametros['taxa_percentual']
+    taxa = estado['taxa_inicial'] if taxa is None else taxa / 100
+    return taxa * estado['patrimonio']
+
+
+def saque_vpw(estado, parametros):
+    """Variable Percentage Withdrawal: a parcela que zeraria o patrimônio nos anos restantes ao retorno real da tabela
+
+    Parcela antecipada (sacada no início de cada ano, como na tabela original),
+    então no último ano o saque é o patrimônio inteiro, que `aplicar_politica`
+    liquida sem esgotar o caminho antes do fim.
+    """
+    retorno = parametros['retorno_vpw'] / 100
+    anos = estado['anos_restantes']
+    taxa = 1 / anos if retorno == 0 else retorno / (1 - (1 + retorno) ** -anos) / (1 + retorno)
+    return taxa * estado['patrimonio']
+
+
+def saque_guyton_klinger(estado, parametros):
+    """Saque real com os guardrails de Guyton-Klinger.
+
+    O saque do ano anterior é corrigido pela inflação, exceto depois de um ano
+    de retorno negativo com a taxa de saque acima da inicial. Se a taxa
+    resultante passa `limite_gk`% acima da inicial, o saque é cortado em
+    `ajuste_gk`% (fora dos últimos `anos_sem_corte_gk` anos); se fica
+    `limite_gk`% abaixo, é aumentado na mesma proporção.
+    """
+    if estado['ano'] == 0:
+        return np.full(estado['patrimonio'].shape, estado['saque_inicial'])
+    patrimonio, anterior = estado['patrimonio'], estado['saque_anterior']
+    taxa_inicial = estado['taxa_inicial']
+    limite, ajuste = parametros['limite_gk'] / 100, parametros['ajuste_gk'] / 100
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        congelado = (estado['retorno_anterior'] < 0) & (anterior / patrimonio > taxa_inicial)
+        saque = np.where(congelado, anterior, anterior * (1 + estado['inflacao_anterior']))
+        taxa = saque / patrimonio
+    if estado['anos_restantes'] > parametros['anos_sem_corte_gk']:
+        saque = np.where(taxa > taxa_inicial * (1 + limite), saque * (1 - ajuste), saque)
+    return np.where(taxa < taxa_inicial * (1 - limite), saque * (1 + ajuste), saque)
+
+
+POLITICAS_SAQUE = {
+    "Renda nominal constante": saque_nominal_constante,
+    "Renda real constante": saque_real_constante,
+    "Percentual do patrimônio": saque_percentual,
+    "VPW": saque_vpw,
+    "Guyton-Klinger": saque_guyton_klinger,
+}
+
+
+def _anos_de_caminhos(retornos, inflacao):
+    """Fatores de cada ano: crescimento e descontos acumulados mês a mês (n, anos, 12) e índice de preços anual (n, anos + 1)"""
+    n_caminhos, meses = retornos.shape
+    anos = meses // 12
+    crescimento = np.cumprod(1 + retornos.reshape(n_caminhos, anos, 12), axis=2)
+    descontos = np.cumsum(1 / crescimento, axis=2)
+    precos = np.cumprod(1 + inflacao, axis=1)[:, 11::12]
+    indice_precos = np.concatenate([np.ones((n_caminhos, 1)), precos], axis=1)
+    return crescimento, descontos, indice_precos
+
+
+def aplicar_politica(politica, patrimonio_inicial, saque_inicial, crescimento, descontos, indice_precos,
+                     parametros=None):
+    """Patrimônio e saques ano a ano de uma política em todos os caminhos de uma vez.
+
+    A política define o saque anual no início de cada ano e ele é pago em
+    doze parcelas iguais no fim de cada mês. Com parcela fixa dentro do ano o
+    patrimônio do mês m é `G_m * (P - w * D_m)` (G: crescimento acumulado no
+    ano, D: soma de 1 / G), então cada ano custa uma operação por caminho e o
+    laço percorre só os anos, com o estado de cada caminho (patrimônio, saque
+    anterior, retorno e inflação do ano) em arrays. O caminho se esgota no
+    primeiro mês em que a parcela não cabe no patrimônio: saca o que resta e
+    daí em diante fica zerado e sem saques. Um saque igual ao patrimônio
+    inteiro (o último ano do VPW) é uma liquidação: cada mês saca o saldo
+    dividido pelos meses restantes, o que zera o caminho no fim do ano sem
+    contar como esgotamento.
+
+    `politica` é uma das chaves de `POLITICAS_SAQUE` ou uma função com a mesma
+    assinatura. Retorna 'patrimonio' (n_caminhos, anos + 1) e 'saques'
+    (n_caminhos, anos), nominais, e 'mes_ruina' (-1 nos caminhos que não se esgotaram).
+    """
+    funcao = POLITICAS_SAQUE[politica] if isinstance(politica, str) else politica
+    parametros = {**PARAMETROS_SAQUE, **(parametros or {})}
+    n_caminhos, anos, _ = crescimento.shape
+
+    patrimonio = np.empty((n_caminhos, anos + 1))
+    saques = np.zeros((n_caminhos, anos))
+    patrimonio[:, 0] = patrimonio_inicial
+    mes_ruina = np.full(n_caminhos, -1)
+    estado = {
+        'saque_inicial': float(saque_inicial),
+        'taxa_inicial': saque_inicial / patrimonio_inicial if patrimonio_inicial > 0 else np.inf,
+        'saque_anterior': np.full(n_caminhos, float(saque_inicial)),
+        'inflacao_anterior': np.zeros(n_caminhos),
+        'retorno_anterior': np.zeros(n_caminhos),
+    }
+
+    for ano in range(anos):
+        atual = patrimonio[:, ano]
+        ativo = atual > 0
+        estado.update(ano=ano, anos_restantes=anos - ano, patrimonio=atual, indice_precos=indice_precos[:, ano])
+        saque = np.where(ativo, np.maximum(funcao(estado, parametros), 0.0), 0.0)
+        parcela = saque / 12
+
+        # Esgota no mês m se w * D_m > P; D cresce com m, então o ano todo se decide pelo último mês
+        restante = atual - parcela * descontos[:, ano, -1]
+        esgotou = ativo & (restante < 0)
+        patrimonio[:, ano + 1] = np.where(esgotou, 0.0, crescimento[:, ano, -1] * restante)
+        saques[:, ano] = saque
+        # Liquidação: o saque do mês j é P * G_j / 12, qualquer que seja o retorno do ano
+        liquida = ativo & np.isclose(saque, atual, rtol=1e-9, atol=0.0)
+        if liquida.any():
+            esgotou &= ~liquida
+            patrimonio[liquida, ano + 1] = 0.0
+            saques[liquida, ano] = atual[liquida] * crescimento[liquida, ano].sum(axis=1) / 12
+        if esgotou.any():
+            # Só nos caminhos que se esgotaram: parcelas pagas antes da primeira que não coube, mais o que restava
+            linhas = np.flatnonzero(esgotou)
+            meses_pagos = (parcela[linhas, None] * descontos[linhas, ano] > atual[linhas, None]).argmax(axis=1)
+            pagos_antes = np.where(meses_pagos > 0, descontos[linhas, ano, np.maximum(meses_pagos - 1, 0)], 0.0)
+            resto = crescimento[linhas, ano, meses_pagos] * (atual[linhas] - parcela[linhas] * pagos_antes)
+            mes_ruina[linhas] = 12 * ano + meses_pagos + 1
+            saques[linhas, ano] = parcela[linhas] * meses_pagos + resto
+        estado['saque_anterior'] = saque
+        estado['retorno_anterior'] = crescimento[:, ano, -1] - 1
+        estado['inflacao_anterior'] = indice_precos[:, ano + 1] / indice_precos[:, ano] - 1
+
+    return {'patrimonio': patrimonio, 'saques': saques, 'mes_ruina': mes_ruina}
+
+
+def comparar_politicas_saque(patrimonio_inicial, renda_mensal, anos, retorno_anual, volatilidade_anual,
+                             inflacao_anual, volatilidade_inflacao=1.0, politicas=tuple(POLITICAS_SAQUE),
+                             parametros=None, n_caminhos=10000, semente=None, tamanho_lote=10000):
+    """Compara políticas de saque na fase de usufruto sobre os mesmos caminhos de retorno e inflação.
+
+    Todas as políticas partem de `patrimonio_inicial` e de um saque inicial de
+    12 × `renda_mensal` e enfrentam os mesmos caminhos (retornos log-normais
+    e inflação normal, como em `simular_aposentadoria_monte_carlo`), então as
+    diferenças vêm só da regra de saque. Os caminhos são gerados uma vez por
+    lote de até `tamanho_lote`, cada lote com um gerador filho de
+    `SeedSequence(semente)`, e reduzidos a fatores anuais compartilhados pelas políticas.
+
+    Um caminho que se esgota só no último mês (a última parcela sai
+    incompleta) conta como sucesso.
+    Valores reais (da data de início). Retorna {política: resultado}, com
+    'probabilidade_sucesso', 'anos', 'patrimonio' e 'saque_mensal'
+    ({percentil: valor real por ano}), 'saque_total' e 'menor_saque_mensal'
+    ({percentil: valor real}) e 'anos_ruina' (anos até o esgotamento nos caminhos que falharam).
+    """
+    anos = int(anos)
+    meses = anos * 12
+    saque_inicial = 12 * renda_mensal
+    n_lotes = -(-n_caminhos // tamanho_lote)
+    sementes = np.random.SeedSequence(semente).spawn(n_lotes)
+
+    patrimonio_real = {politica: np.empty((n_caminhos, anos + 1), dtype=np.float32) for politica in politicas}
+    saques_reais = {politica: np.empty((n_caminhos, anos), dtype=np.float32) for politica in politicas}
+    meses_ruina = {politica: np.empty(n_caminhos, dtype=np.int64) for politica in politicas}
+
+    for lote, semente_lote in enumerate(sementes):
+        inicio = lote * tamanho_lote
+        fim = min(inicio + tamanho_lote, n_caminhos)
+        rng = np.random.default_rng(semente_lote)
+        retornos = gerar_retornos(rng, fim - inicio, meses, retorno_anual, volatilidade_anual)
+        inflacao = gerar_inflacao(rng, fim - inicio, meses, inflacao_anual, volatilidade_inflacao)
+        crescimento, descontos, indice_precos = _anos_de_caminhos(retornos, inflacao)
+
+        for politica in politicas:
+            resultado = aplicar_politica(politica, patrimonio_inicial, saque_inicial, crescimento, descontos,
+                                         indice_precos, parametros)
+            patrimonio_real[politica][inicio:fim] = resultado['patrimonio'] / indice_precos
+            # Saques do ano a preços do início do ano
+            saques_reais[politica][inicio:fim] = resultado['saques'] / indice_precos[:, :-1]
+            meses_ruina[politica][inicio:fim] = resultado['mes_ruina']
+
+    comparacao = {}
+    for politica in politicas:
+        arruinados = (meses_ruina[politica] >= 0) & (meses_ruina[politica] < meses)
+        saque_mensal = saques_reais[politica] / 12
+        comparacao[politica] = {
+            'probabilidade_sucesso': 1 - arruinados.mean(),
+            'anos': np.arange(anos + 1),
+            'patrimonio': dict(zip(PERCENTIS, np.percentile(patrimonio_real[politica], PERCENTIS, axis=0))),
+            'saque_mensal': dict(zip(PERCENTIS, np.percentile(saque_mensal, PERCENTIS, axis=0))),
+            'saque_total': dict(zip(PERCENTIS, np.percentile(saques_reais[politica].sum(axis=1), PERCENTIS))),
+            'menor_saque_mensal': dict(zip(PERCENTIS, np.percentile(saque_mensal.min(axis=1), PERCENTIS))),
+            'anos_ruina': meses_ruina[politica][arruinados] / 12,
+        }
+    return comparacao
\ No newline at end of file
@@ -0,0 +1,86 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .monte_carlo import gerar_retornos
+
+
+CAMINHOS_POR_LOTE = 5000
+
+
+def _bootstrap_retornos(rng, n_caminhos, meses, retornos_historicos, tamanho_bloco):
+    """Reamostra blocos contíguos (circulares) da série histórica de retornos mensais"""
+    historico = np.asarray(retornos_historicos, dtype=float)
+    n_blocos = -(-meses // tamanho_bloco)
+    inicios = rng.integers(0, historico.size, size=(n_caminhos, n_blocos, 1))
+    indices = (inicios + np.arange(tamanho_bloco)) % historico.size
+    return historico[indices.reshape(n_caminhos, -1)[:, :meses]]
+
+
+def _taxas_criticas(semente, n_caminhos, meses, retorno_anual, volatilidade_anual,
+                    retornos_historicos=None, tamanho_bloco=12):
+    """Maior taxa de saque anual (%) que cada caminho sustenta pelo horizonte.
+
+    Com saque mensal fixo W (em termos reais) e patrimônio inicial 1,
+    p_k = G_k * (1 - W * soma(1 / G_j)); o caminho sobrevive enquanto
+    W <= 1 / max_k soma(1 / G_j), então a taxa crítica sai em forma fechada.
+    """
+    rng = np.random.default_rng(semente)
+    if retornos_historicos is None:
+        retornos = gerar_retornos(rng, n_caminhos, meses, retorno_anual, volatilidade_anual)
+    else:
+        retornos = _bootstrap_retornos(rng, n_caminhos, meses, retornos_historicos, tamanho_bloco)
+
+    descontos = np.cumsum(1 / np.cumprod(1 + retornos, axis=1), axis=1)
+    return 12 * 100 / descontos.max(axis=1)
+
+
+def buscar_taxa_saque_segura(anos, probabilidade_sucesso=0.95, retorno_anual=4.0, volatilidade_anual=12.0,
+                             retornos_historicos=None, tamanho_bloco=12, n_caminhos=20000,
+                             semente=None, n_processos=None):
+    """Maior taxa de saque anual sustentável com a probabilidade de sucesso pedida.
+
+    Os caminhos de retorno real são simulados (log-normais com `retorno_anual`
+    e `volatilidade_anual`, em %) ou reamostrados em blocos de
+    `retornos_historicos` (retornos reais mensais, em decimal). Cada lote de
+    caminhos recebe uma semente filha de `SeedSequence(semente)` e os lotes
+    são distribuídos entre `n_processos` processos (padrão: todos os núcleos),
+    então o resultado não depende do número de processos.
+
+    Cada caminho é gerado uma única vez e reduzido à sua taxa crítica; a busca
+    pela taxa é feita sobre essas taxas ordenadas, sem voltar a simular.
+    Retorna um dicionário com 'taxa_segura' (% ao ano), 'taxas' e 'sucesso'
+    (curva de probabilidade de sucesso por taxa).
+    """
+    meses = int(anos * 12)
+    n_lotes = -(-n_caminhos // CAMINHOS_POR_LOTE)
+    tamanhos = [min(CAMINHOS_POR_LOTE, n_caminhos - i * CAMINHOS_POR_LOTE) for i in range(n_lotes)]
+    sementes = np.random.SeedSequence(semente).spawn(n_lotes)
+    argumentos = (
+        sementes, tamanhos, [meses] * n_lotes, [retorno_anual] * n_lotes,
+        [volatilidade_anual] * n_lotes, [retornos_historicos] * n_lotes, [tamanho_bloco] * n_lotes
+    )
+
+    n_processos = min(n_processos or os.cpu_count() or 1, n_lotes)
+    if n_processos > 1:
+        with ProcessPoolExecutor(max_workers=n_processos) as executor:
+            lotes = list(executor.map(_taxas_criticas, *argumentos))
+    else:
+        lotes = list(map(_taxas_criticas, *argumentos))
+
+    criticas = np.sort(np.concatenate(lotes))
+
+    # Sucesso(taxa) = fração de caminhos com taxa crítica >= taxa; a maior taxa
+    # com sucesso >= probabilidade é uma estatística de ordem das críticas
+    necessarios = int(np.ceil(probabilidade_sucesso * criticas.size))
+    taxa_segura = criticas[criticas.size - max(necessarios, 1)]
+
+    taxas = np.linspace(0, max(2 * taxa_segura, 1.0), 101)
+    sucesso = 1 - np.searchsorted(criticas, taxas, side='left') / criticas.size
+
+    return {
+        'taxa_segura': taxa_segura,
+        'taxas': taxas,
+        'sucesso': sucesso,
+    }
\ No newline at end of file